@@ -0,0 +1,216 @@
+import os
+import random
+import zipfile
+from typing import Dict, Iterable, List, Optional
+from xml.sax.saxutils import escape
+
+
+FORMATS = (".pdf", ".docx", ".xlsx", ".pptx")
+
+_WORDS = (
+    "revenue quarter budget forecast customer contract invoice supplier margin growth "
+    "meeting agenda review report summary project milestone risk owner status delivery "
+    "policy compliance audit control process update schedule resource estimate target "
+    "market product service region team account analysis result decision action item"
+).split()
+
+# Fixed timestamp for zip entries, so that the same seed produces byte-identical files
+_ZIP_DATE = (2024, 1, 1, 0, 0, 0)
+
+
+def make_paragraphs(count: int, rng: random.Random) -> List[str]:
+    """
+    Returns count pseudo-random paragraphs of 3-6 sentences each.
+    """
+    paragraphs = []
+    for _ in range(count):
+        sentences = []
+        for _ in range(rng.randint(3, 6)):
+            words = rng.choices(_WORDS, k=rng.randint(8, 18))
+            sentences.append(" ".join(words).capitalize() + ".")
+        paragraphs.append(" ".join(sentences))
+    return paragraphs
+
+
+def _write_zip(path: str, members: Dict[str, str]) -> None:
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, content in members.items():
+            info = zipfile.ZipInfo(name, date_time=_ZIP_DATE)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            zf.writestr(info, content)
+
+
+def write_docx(path: str, paragraphs: List[str]) -> None:
+    """
+    Writes a minimal WordprocessingML document with one heading every 10 paragraphs.
+    """
+    body = []
+    for i, text in enumerate(paragraphs):
+        if i % 10 == 0:
+            body.append(
+                '<w:p><w:pPr><w:pStyle w:val="Heading1"/></w:pPr>'
+                f"<w:r><w:t>Section {i // 10 + 1}</w:t></w:r></w:p>"
+            )
+        body.append(f'<w:p><w:r><w:t xml:space="preserve">{escape(text)}</w:t></w:r></w:p>')
+    _write_zip(path, {
+        "[Content_Types].xml": (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/word/document.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+            "</Types>"
+        ),
+        "_rels/.rels": (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" '
+            'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+            'Target="word/document.xml"/>'
+            "</Relationships>"
+        ),
+        "word/document.xml": (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+            f"<w:body>{''.join(body)}</w:body></w:document>"
+        ),
+    })
+
+
+def write_xlsx(path: str, paragraphs: List[str], rng: random.Random, rows_per_sheet: int = 200) -> None:
+    """
+    Writes a workbook with one row per paragraph (id, region, amount, note), split over
+    sheets of rows_per_sheet rows. Requires openpyxl, which MarkItDown also needs to read xlsx.
+    """
+    from openpyxl import Workbook
+
+    wb = Workbook()
+    wb.remove(wb.active)
+    for sheet_index, start in enumerate(range(0, max(len(paragraphs), 1), rows_per_sheet)):
+        ws = wb.create_sheet(f"Sheet{sheet_index + 1}")
+        ws.append(["id", "region", "amount", "note"])
+        for row_id, text in enumerate(paragraphs[start:start + rows_per_sheet], start=start + 1):
+            ws.append([row_id, rng.choice(_WORDS), round(rng.uniform(0, 10000), 2), text])
+    wb.save(path)
+
+
+def write_pptx(path: str, paragraphs: List[str], paragraphs_per_slide: int = 3) -> None:
+    """
+    Writes a presentation with a title and paragraphs_per_slide text paragraphs per slide.
+    Requires python-pptx, which MarkItDown also needs to read pptx.
+    """
+    from pptx import Presentation
+
+    prs = Presentation()
+    layout = prs.slide_layouts[1]
+    for slide_index, start in enumerate(range(0, max(len(paragraphs), 1), paragraphs_per_slide)):
+        slide = prs.slides.add_slide(layout)
+        slide.shapes.title.text = f"Slide {slide_index + 1}"
+        body = slide.placeholders[1].text_frame
+        for i, text in enumerate(paragraphs[start:start + paragraphs_per_slide]):
+            paragraph = body.paragraphs[0] if i == 0 else body.add_paragraph()
+            paragraph.text = text
+    prs.save(path)
+
+
+def _wrap(text: str, width: int) -> List[str]:
+    lines, line = [], ""
+    for word in text.split():
+        if line and len(line) + 1 + len(word) > width:
+            lines.append(line)
+            line = word
+        else:
+            line = f"{line} {word}" if line else word
+    if line:
+        lines.append(line)
+    return lines
+
+
+def write_pdf(path: str, paragraphs: List[str], lines_per_page: int = 50) -> None:
+    """
+    Writes a text-only PDF (Helvetica, Letter size) with no dependencies.
+    """
+    lines: List[str] = []
+    for text in paragraphs:
+        lines.extend(_wrap(text, 90))
+        lines.append("")
+    pages = [lines[i:i + lines_per_page] for i in range(0, max(len(lines), 1), lines_per_page)]
+
+    # Objects: 1 catalog, 2 page tree, 3 font, then a (page, content) pair per page
+    objects: List[bytes] = [b"", b"", b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_ids = []
+    for page_lines in pages:
+        commands = ["BT", "/F1 10 Tf", "14 TL", "50 750 Td"]
+        for line in page_lines:
+            line = line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+            commands.append(f"({line}) Tj T*")
+        commands.append("ET")
+        stream = "\n".join(commands).encode("latin-1", "replace")
+        page_ids.append(len(objects) + 1)
+        content_id = len(objects) + 2
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {content_id} 0 R "
+            "/Resources << /Font << /F1 3 0 R >> >> >>".encode("ascii")
+        )
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+    objects[0] = b"<< /Type /Catalog /Pages 2 0 R >>"
+    kids = " ".join(f"{page_id} 0 R" for page_id in page_ids)
+    objects[1] = f"<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>".encode("ascii")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, obj)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    with open(path, "wb") as f:
+        f.write(bytes(out))
+
+
+def generate_corpus(
+    dst_folder: str,
+    count: int = 10,
+    paragraphs: int = 100,
+    formats: Optional[Iterable[str]] = None,
+    seed: int = 0,
+) -> List[str]:
+    """
+    Generates a synthetic corpus of office documents. The same arguments always produce the same text.
+
+    Args:
+        dst_folder (str): folder to write to, created if missing
+        count (int): number of files per format
+        paragraphs (int): number of text paragraphs per file, which controls the file size
+        formats (list): extensions to generate, a subset of FORMATS (default: all)
+        seed (int): seed of the text generator
+    Returns:
+        Paths of the generated files.
+    """
+    formats = list(formats) if formats is not None else list(FORMATS)
+    for ext in formats:
+        if ext not in FORMATS:
+            raise ValueError(f"Unsupported format '{ext}', expected one of {FORMATS}")
+    os.makedirs(dst_folder, exist_ok=True)
+
+    paths = []
+    for ext in formats:
+        for i in range(count):
+            # One generator per file, so a file's content does not depend on which formats are generated
+            rng = random.Random(f"{seed}-{ext}-{i}")
+            texts = make_paragraphs(paragraphs, rng)
+            path = os.path.join(dst_folder, f"doc_{i:04d}{ext}")
+            if ext == ".pdf":
+                write_pdf(path, texts)
+            elif ext == ".docx":
+                write_docx(path, texts)
+            elif ext == ".xlsx":
+                write_xlsx(path, texts, rng)
+            else:
+                write_pptx(path, texts)
+            paths.append(path)
+    return paths
@@ -0,0 +1,112 @@
+import hashlib
+import re
+from typing import List, Literal, Optional, Union
+
+import numpy as np
+from chonkie import BaseEmbeddings, LateChunker
+from chonkie.chunker.base import BaseChunker
+
+
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+
+
+class HashingEmbeddings(BaseEmbeddings):
+    """
+    Tiny offline stand-in for an embedding model: each token is hashed into one of `dimension`
+    buckets and a text is the normalized bag of its buckets. Deterministic, needs no download,
+    and costs roughly as much as tokenizing the text, so benchmarks of the "semantic", "sdpm"
+    and "late" chunkers measure the chunking logic rather than the model.
+
+    Args:
+        dimension (int): size of the vectors
+    """
+
+    def __init__(self, dimension: int = 64):
+        super().__init__()
+        self._dimension = dimension
+
+    def _tokens(self, text: str) -> List[str]:
+        return _TOKEN_RE.findall(text.lower())
+
+    def embed(self, text: str) -> np.ndarray:
+        vector = np.zeros(self._dimension, dtype=np.float32)
+        for token in self._tokens(text):
+            digest = hashlib.blake2b(token.encode("utf-8"), digest_size=4).digest()
+            vector[int.from_bytes(digest, "little") % self._dimension] += 1.0
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def embed_batch(self, texts: List[str]) -> List[np.ndarray]:
+        return [self.embed(text) for text in texts]
+
+    def embed_as_tokens(self, text: str) -> np.ndarray:
+        # One vector per token of the "word" tokenizer, so that late chunking can split them by token counts
+        if text == "":
+            return np.zeros((0, self._dimension), dtype=np.float32)
+        return np.stack([self.embed(word) for word in text.split(" ")])
+
+    def get_tokenizer_or_token_counter(self) -> str:
+        return "word"
+
+    def count_tokens(self, text: str) -> int:
+        return len(self._tokens(text))
+
+    def count_tokens_batch(self, texts: List[str]) -> List[int]:
+        return [self.count_tokens(text) for text in texts]
+
+    def similarity(self, u: np.ndarray, v: np.ndarray) -> float:
+        return float(np.dot(u, v))
+
+    @property
+    def dimension(self) -> int:
+        return self._dimension
+
+    def __repr__(self) -> str:
+        return f"HashingEmbeddings(dimension={self._dimension})"
+
+
+class HashingLateChunker(LateChunker):
+    """
+    chonkie's LateChunker running on HashingEmbeddings. LateChunker only accepts
+    SentenceTransformerEmbeddings, so this sets up the same state without that check;
+    splitting, token embedding and pooling are inherited unchanged.
+
+    Args:
+        embedding_model (BaseEmbeddings): model with embed_as_tokens (default: HashingEmbeddings())
+        other arguments as in LateChunker
+    """
+
+    def __init__(
+        self,
+        embedding_model: Optional[BaseEmbeddings] = None,
+        mode: str = "sentence",
+        chunk_size: int = 512,
+        min_sentences_per_chunk: int = 1,
+        min_characters_per_sentence: int = 12,
+        approximate: bool = True,
+        delim: Union[str, List[str]] = [".", "!", "?", "\n"],
+        include_delim: Union[Literal["prev", "next"], None] = "prev",
+    ):
+        if embedding_model is None:
+            embedding_model = HashingEmbeddings()
+        if not hasattr(embedding_model, "embed_as_tokens"):
+            raise ValueError("embedding_model must provide embed_as_tokens, e.g. HashingEmbeddings.")
+        if mode not in ["token", "sentence"]:
+            raise ValueError("Mode must be one of the following: ['token', 'sentence']")
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be a positive non-zero value!")
+        self.mode = mode
+        self.chunk_size = chunk_size
+        self.min_sentences_per_chunk = min_sentences_per_chunk
+        self.min_characters_per_sentence = min_characters_per_sentence
+        self.approximate = approximate
+        self.delim = delim
+        self.include_delim = include_delim
+        self.sep = "🦛"
+        self.embedding_model = embedding_model
+        BaseChunker.__init__(self, embedding_model.get_tokenizer_or_token_counter())
+        self._use_multiprocessing = False
+
+    def _mean_pool(self, embeddings: np.ndarray) -> np.ndarray:
+        # LateChunker's own _mean_pool uses the numpy it imports in its __init__
+        return np.mean(embeddings, axis=0)
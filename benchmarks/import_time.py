@@ -0,0 +1,74 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+
+# Modules that take hundreds of milliseconds to import and are only needed once files are parsed or chunked
+HEAVY_MODULES = ("chonkie", "markitdown", "tiktoken", "numpy", "pandas", "openai", "torch", "transformers", "pyarrow", "tqdm")
+
+# Imports the CLI and builds a Converter for the token chunker, without converting anything.
+# Prints the seconds this took and the heavy modules it loaded.
+_STARTUP_CODE = """
+import json, sys, time
+started = time.perf_counter()
+import officechunker.cli
+from officechunker.converter import Converter
+Converter(sys.argv[1], dst_folder=sys.argv[2], chunker_config="token")
+elapsed = time.perf_counter() - started
+heavy = sorted(name for name in json.loads(sys.argv[3]) if name in sys.modules)
+print(json.dumps({"seconds": elapsed, "heavy_modules": heavy}))
+"""
+
+
+def measure_startup(src_folder: str, dst_folder: str, repeat: int) -> Dict[str, Any]:
+    """
+    Runs the startup code in repeat fresh interpreters and returns the median seconds and the heavy modules loaded.
+    """
+    times: List[float] = []
+    heavy: List[str] = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", _STARTUP_CODE, src_folder, dst_folder, json.dumps(HEAVY_MODULES)],
+            check=True, capture_output=True, text=True, env=os.environ.copy(),
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        times.append(result["seconds"])
+        heavy = sorted(set(heavy) | set(result["heavy_modules"]))
+    return {"median": statistics.median(times), "min": min(times), "runs": len(times), "heavy_modules": heavy}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Check that importing the OfficeChunker CLI and creating a token-chunker Converter stays fast."
+    )
+    parser.add_argument("--budget", type=float, default=0.5, help="Maximum median startup time in seconds (default: 0.5).")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters to time (default: 5).")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        src_folder = os.path.join(tmp, "src")
+        os.makedirs(src_folder)
+        started = time.perf_counter()
+        result = measure_startup(src_folder, os.path.join(tmp, "out"), args.repeat)
+        wall = time.perf_counter() - started
+
+    print(json.dumps({**result, "budget": args.budget, "wall": wall}, indent=2))
+    failures = []
+    if result["heavy_modules"]:
+        failures.append(f"heavy modules imported at startup: {', '.join(result['heavy_modules'])}")
+    if result["median"] > args.budget:
+        failures.append(f"median startup {result['median']:.3f}s exceeds budget {args.budget:.3f}s")
+    if failures:
+        for failure in failures:
+            print(f"REGRESSION: {failure}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
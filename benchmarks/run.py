@@ -0,0 +1,324 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks.corpus import FORMATS, generate_corpus
+
+
+def time_runs(func: Callable[[], Any], repeat: int) -> Dict[str, Any]:
+    """
+    Calls func repeat times and returns the min/median/mean wall time in seconds, plus its last result.
+    """
+    times = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - started)
+    return {
+        "min": min(times),
+        "median": statistics.median(times),
+        "mean": statistics.mean(times),
+        "runs": len(times),
+        "result": result,
+    }
+
+
+def offline_chunker_params(chunker_type: str) -> Optional[Dict[str, Any]]:
+    """
+    Parameter overrides that let a chunker run without downloading a tokenizer or model,
+    or None if the chunker cannot run offline. "late" also needs the classes of offline_chunkers().
+    """
+    if chunker_type == "token":
+        from chonkie.tokenizer import WordTokenizer
+        return {"tokenizer": WordTokenizer()}
+    if chunker_type in ("word", "sentence", "recursive", "structural"):
+        return {"tokenizer_or_token_counter": "word"}
+    if chunker_type in ("semantic", "sdpm", "late"):
+        from benchmarks.fake_embeddings import HashingEmbeddings
+        return {"embedding_model": HashingEmbeddings()}
+    return None
+
+
+# Stand-ins for chunker classes that only accept downloaded models
+OFFLINE_CHUNKER_CLASSES = {
+    # chonkie's LateChunker only accepts sentence-transformers models
+    "late": "benchmarks.fake_embeddings:HashingLateChunker",
+}
+
+
+@contextlib.contextmanager
+def offline_chunkers():
+    """
+    Registers OFFLINE_CHUNKER_CLASSES in CHONKER_MAP while the block runs, and restores the original classes after it.
+    """
+    from officechunker.chunkers import CHONKER_MAP
+
+    original = {chunker_type: CHONKER_MAP[chunker_type] for chunker_type in OFFLINE_CHUNKER_CLASSES}
+    CHONKER_MAP.update(OFFLINE_CHUNKER_CLASSES)
+    try:
+        yield
+    finally:
+        CHONKER_MAP.update(original)
+
+
+# Chunker configuration of the offline convert suite. Converter validates parameter types against
+# DEFAULT_PARAMS, so only string-valued overrides can be used here.
+OFFLINE_CONVERT_CONFIG = {
+    ".pdf": {"type": "recursive", "params": {"tokenizer_or_token_counter": "word"}},
+    ".docx": {"type": "sentence", "params": {"tokenizer_or_token_counter": "word"}},
+    ".xlsx": {"type": "word", "params": {"tokenizer_or_token_counter": "word"}},
+    ".pptx": {"type": "recursive", "params": {"tokenizer_or_token_counter": "word"}},
+}
+
+
+def _files_by_ext(paths: List[str]) -> Dict[str, List[str]]:
+    by_ext: Dict[str, List[str]] = {}
+    for path in paths:
+        by_ext.setdefault(os.path.splitext(path)[1].lower(), []).append(path)
+    return by_ext
+
+
+def bench_parse(paths: List[str], repeat: int) -> Dict[str, Dict[str, Any]]:
+    """
+    Times parse_to_md over all files of each extension.
+    """
+    from officechunker.process import parse_to_md
+
+    results = {}
+    for ext, ext_paths in sorted(_files_by_ext(paths).items()):
+        timing = time_runs(lambda: [parse_to_md(p) for p in ext_paths], repeat)
+        markdowns = timing.pop("result")
+        timing.update(
+            files=len(ext_paths),
+            bytes_in=sum(os.path.getsize(p) for p in ext_paths),
+            chars_out=sum(len(md) for md in markdowns),
+            files_per_second=len(ext_paths) / timing["median"] if timing["median"] > 0 else 0.0,
+        )
+        results[f"parse/{ext}"] = timing
+    return results
+
+
+def bench_chunk(markdowns: List[str], repeat: int, offline: bool) -> Dict[str, Dict[str, Any]]:
+    """
+    Builds each chunker of CHONKER_MAP with its DEFAULT_PARAMS (plus offline overrides and stand-in classes
+    if requested) and times chunking every markdown document.
+    """
+    from officechunker.chunkers import CHONKER_MAP, create_chunker
+
+    results = {}
+    chars = sum(len(md) for md in markdowns)
+    with offline_chunkers() if offline else contextlib.nullcontext():
+        for chunker_type in CHONKER_MAP:
+            name = f"chunk/{chunker_type}"
+            params: Optional[Dict[str, Any]] = {}
+            if offline:
+                params = offline_chunker_params(chunker_type)
+                if params is None:
+                    results[name] = {"skipped": "no offline stand-in for this chunker"}
+                    continue
+            try:
+                started = time.perf_counter()
+                chunker = create_chunker(chunker_type, **params)
+                build_seconds = time.perf_counter() - started
+                timing = time_runs(lambda: [chunker(md) for md in markdowns], repeat)
+            except Exception as e:
+                results[name] = {"error": f"{type(e).__name__}: {e}"}
+                continue
+            chunks = timing.pop("result")
+            timing.update(
+                build_seconds=build_seconds,
+                documents=len(markdowns),
+                chars_in=chars,
+                chunks=sum(len(c) for c in chunks),
+                chars_per_second=chars / timing["median"] if timing["median"] > 0 else 0.0,
+            )
+            results[name] = timing
+    return results
+
+
+def bench_convert(
+    corpus: str,
+    workers: List[int],
+    executors: List[str],
+    repeat: int,
+    offline: bool,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Times full Converter.convert() runs for every executor type and worker count.
+    """
+    from officechunker.converter import Converter
+    from officechunker.metrics import MetricsHook
+
+    class ReportCollector(MetricsHook):
+        def __init__(self):
+            self.report: Dict[str, Any] = {}
+
+        def on_run_end(self, report: Dict[str, Any]) -> None:
+            self.report = report
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="officechunker-bench-") as dst:
+        for executor in executors:
+            for max_workers in workers:
+                name = f"convert/{executor}/{max_workers}"
+                collector = ReportCollector()
+                converter = Converter(
+                    src_folder=corpus,
+                    dst_folder=os.path.join(dst, "out"),
+                    chunker_config=OFFLINE_CONVERT_CONFIG if offline else None,
+                    executor=executor,
+                    max_workers=max_workers,
+                    metrics_hooks=[collector],
+                )
+                try:
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        timing = time_runs(converter.convert, repeat)
+                except Exception as e:
+                    results[name] = {"error": f"{type(e).__name__}: {e}"}
+                    continue
+                timing.pop("result")
+                report = collector.report
+                timing.update(
+                    files=report.get("files", 0),
+                    errors=report.get("errors", 0),
+                    bytes_in=report.get("bytes_in", 0),
+                    chunks=report.get("chunks", 0),
+                    files_per_second=report.get("files", 0) / timing["median"] if timing["median"] > 0 else 0.0,
+                    peak_rss=report.get("peak_rss", {}),
+                    # Per-extension stage percentiles of the last run
+                    stages={ext: data["stages"] for ext, data in report.get("by_extension", {}).items()},
+                )
+                results[name] = timing
+    return results
+
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]], tolerance: float) -> Dict[str, Dict[str, Any]]:
+    """
+    Compares median times of measurements present in both runs.
+    A measurement regressed if it is more than `tolerance` (e.g. 0.1 = 10%) slower than the baseline.
+    """
+    comparison = {}
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None or "median" not in current or "median" not in previous or previous["median"] <= 0:
+            continue
+        ratio = current["median"] / previous["median"]
+        comparison[name] = {
+            "baseline": previous["median"],
+            "current": current["median"],
+            "ratio": ratio,
+            "status": "regressed" if ratio > 1 + tolerance else "improved" if ratio < 1 - tolerance else "unchanged",
+        }
+    return comparison
+
+
+def environment() -> Dict[str, Any]:
+    from importlib import metadata
+
+    versions = {}
+    for package in ("officechunker", "chonkie", "markitdown", "tiktoken"):
+        try:
+            versions[package] = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            versions[package] = None
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "packages": versions,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmarks parsing, every chunker type and full conversions on a synthetic corpus."
+    )
+    parser.add_argument("--suites", nargs="+", choices=["parse", "chunk", "convert"], default=["parse", "chunk", "convert"],
+                        help="Benchmarks to run (default: all).")
+    parser.add_argument("--corpus", type=str, default=None,
+                        help="Folder of the synthetic corpus. Generated there if it does not exist; a temporary folder is used if not set.")
+    parser.add_argument("--count", type=int, default=5, help="Number of generated files per format.")
+    parser.add_argument("--paragraphs", type=int, default=100, help="Number of text paragraphs per generated file.")
+    parser.add_argument("--formats", nargs="+", choices=list(FORMATS), default=list(FORMATS), help="Formats to generate.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the generated text.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement; the median is compared.")
+    parser.add_argument("--workers", type=int, nargs="+", default=None,
+                        help="Worker counts of the convert suite (default: 1 and the number of CPUs).")
+    parser.add_argument("--executors", nargs="+", choices=["thread", "process"], default=["thread", "process"],
+                        help="Executor types of the convert suite.")
+    parser.add_argument("--offline", action="store_true",
+                        help="Use word tokenizers and a hashing embedding model instead of downloaded tokenizers and models.")
+    parser.add_argument("--output", type=str, default=None, help="Write the results as JSON to this path.")
+    parser.add_argument("--baseline", type=str, default=None, help="Results JSON of an earlier run to compare against.")
+    parser.add_argument("--tolerance", type=float, default=0.1,
+                        help="Relative slowdown against the baseline that counts as a regression (default: 0.1).")
+    args = parser.parse_args(argv)
+
+    if args.repeat < 1 or args.count < 1 or args.paragraphs < 1:
+        parser.error("--repeat, --count and --paragraphs must be positive integers.")
+    workers = args.workers if args.workers is not None else sorted({1, os.cpu_count() or 1})
+
+    with contextlib.ExitStack() as stack:
+        corpus = args.corpus
+        if corpus is None:
+            corpus = stack.enter_context(tempfile.TemporaryDirectory(prefix="officechunker-corpus-"))
+        if not os.path.isdir(corpus) or not os.listdir(corpus):
+            print(f"Generating corpus in {corpus}...", file=sys.stderr)
+            generate_corpus(corpus, count=args.count, paragraphs=args.paragraphs, formats=args.formats, seed=args.seed)
+        paths = sorted(
+            os.path.join(root, name) for root, _, names in os.walk(corpus) for name in names
+            if os.path.splitext(name)[1].lower() in FORMATS
+        )
+
+        measurements: Dict[str, Dict[str, Any]] = {}
+        if "parse" in args.suites:
+            measurements.update(bench_parse(paths, args.repeat))
+        if "chunk" in args.suites:
+            from officechunker.process import parse_to_md
+            measurements.update(bench_chunk([parse_to_md(p) for p in paths], args.repeat, args.offline))
+        if "convert" in args.suites:
+            measurements.update(bench_convert(corpus, workers, args.executors, args.repeat, args.offline))
+
+    results: Dict[str, Any] = {
+        "environment": environment(),
+        "config": {
+            "count": args.count, "paragraphs": args.paragraphs, "formats": args.formats, "seed": args.seed,
+            "repeat": args.repeat, "offline": args.offline, "corpus_files": len(paths),
+        },
+        "measurements": measurements,
+    }
+
+    regressed = False
+    if args.baseline is not None:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        results["comparison"] = compare(measurements, baseline.get("measurements", {}), args.tolerance)
+        regressed = any(c["status"] == "regressed" for c in results["comparison"].values())
+
+    for name, data in measurements.items():
+        if "median" in data:
+            line = f"{name:<24} median {data['median']:.4f}s  min {data['min']:.4f}s"
+            change = results.get("comparison", {}).get(name)
+            if change is not None:
+                line += f"  x{change['ratio']:.2f} vs baseline ({change['status']})"
+        else:
+            line = f"{name:<24} {data.get('error') or data.get('skipped')}"
+        print(line)
+
+    if args.output is not None:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+    return 1 if regressed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,23 @@
+from officechunker.converter import Converter
+
+def test_iter_chunks():
+    print("Test: Streaming chunks in memory (no destination folder)")
+    try:
+        converter = Converter(
+            src_folder="./test_dataset_1",
+            chunker_config="token"
+        )
+        with open("./test_dataset_1/sample.docx", "rb") as f:
+            docx_bytes = f.read()
+        sources = [
+            "./test_dataset_1/sample.pdf",
+            ("sample.docx", docx_bytes),
+        ]
+        for source, chunk_index, chunk in converter.iter_chunks(sources):
+            print(source, chunk_index, chunk["token_count"], chunk["text"][:40])
+        print(" Streaming Test Passed: Chunks yielded without writing files.")
+    except Exception as e:
+        print(f" Streaming Test Failed: {e}")
+
+if __name__ == "__main__":
+    test_iter_chunks()
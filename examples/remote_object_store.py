@@ -0,0 +1,34 @@
+import os
+import shutil
+import tempfile
+
+from officechunker.converter import Converter
+from officechunker.file_handlers import HttpFileConnector
+from officechunker.object_store import ObjectStoreServer
+
+def test_remote_object_store():
+    print("Test: Converting files from an S3-style object store")
+    try:
+        # Serve a local copy of the test dataset as bucket "docs"
+        root = tempfile.mkdtemp()
+        shutil.copytree("./test_dataset_1", os.path.join(root, "docs", "test_dataset_1"))
+        with ObjectStoreServer(root) as server:
+            connector = HttpFileConnector(server.url, "docs")
+            converter = Converter(
+                src_folder="test_dataset_1",
+                dst_folder="./test_dataset_1_remote_md",
+                chunker_config="token",
+                file_handler=connector,
+                prefetch=4,
+                upload_folder="test_dataset_1_md",
+            )
+            converter.convert()
+            print(" Uploaded outputs:", len(connector.list_files("test_dataset_1_md")))
+            connector.close()
+        shutil.rmtree(root)
+        print(" Remote Test Passed: Files converted from the object store.")
+    except Exception as e:
+        print(f" Remote Test Failed: {e}")
+
+if __name__ == "__main__":
+    test_remote_object_store()
@@ -1,27 +1,57 @@
-import tiktoken
-from typing import Any
-from chonkie import (
-    TokenChunker,
-    WordChunker,
-    SentenceChunker,
-    RecursiveChunker,
-    SemanticChunker,
-    SemanticChunker,
-    SDPMChunker,
-    LateChunker,
-)
-
-from chonkie import RecursiveRules
-
-CHONKER_MAP = {
-    "token": TokenChunker,
-    "word": WordChunker,
-    "sentence": SentenceChunker,
-    "recursive": RecursiveChunker,
-    "semantic": SemanticChunker,
-    "sdpm": SDPMChunker,
-    "late": LateChunker
-}
+import importlib
+import threading
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Tuple, Union
+
+from officechunker.utils import get_rss_bytes
+
+
+class _LazyChunkerMap(MutableMapping):
+    """
+    Maps chunker types to chunker classes, given either as classes or as "module:attribute" strings
+    that are imported the first time the type is looked up. Membership tests and iteration never import.
+    """
+
+    def __init__(self, entries: Dict[str, Union[type, str]]):
+        self._entries = dict(entries)
+
+    def __getitem__(self, chunker_type: str) -> type:
+        value = self._entries[chunker_type]
+        if isinstance(value, str):
+            module_name, _, attribute = value.partition(":")
+            value = getattr(importlib.import_module(module_name), attribute)
+            self._entries[chunker_type] = value
+        return value
+
+    def __setitem__(self, chunker_type: str, value: Union[type, str]) -> None:
+        self._entries[chunker_type] = value
+
+    def __delitem__(self, chunker_type: str) -> None:
+        del self._entries[chunker_type]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, chunker_type: object) -> bool:
+        return chunker_type in self._entries
+
+
+# Importing chonkie loads every chunker and embedding backend, which takes seconds,
+# so classes are only imported when a chunker of their type is first created.
+CHONKER_MAP = _LazyChunkerMap({
+    "token": "chonkie:TokenChunker",
+    "word": "chonkie:WordChunker",
+    "sentence": "chonkie:SentenceChunker",
+    "recursive": "chonkie:RecursiveChunker",
+    "semantic": "chonkie:SemanticChunker",
+    "sdpm": "chonkie:SDPMChunker",
+    "late": "chonkie:LateChunker",
+    "structural": "officechunker.structural:StructuralChunker",
+})
 
 
 DEFAULT_PARAMS = {
@@ -82,6 +112,13 @@ DEFAULT_PARAMS = {
         "min_sentences_per_chunk": 1,
         "min_characters_per_sentence": 12,
     },
+    "structural": {
+        "tokenizer_or_token_counter": "gpt2",
+        "chunk_size": 512,
+        "max_heading_level": 2,
+        "repeat_headers": True,
+        "return_type": "chunks",
+    },
 }
 
 def create_chunker(chunker_type : str = "token", **chunker_kwargs: Any):
@@ -104,11 +141,193 @@ def create_chunker(chunker_type : str = "token", **chunker_kwargs: Any):
     if chunker_type == "token":
         tokenizer_val = params.get("tokenizer", "gpt2")
         if isinstance(tokenizer_val,str) :
+            import tiktoken
             params["tokenizer"] = tiktoken.get_encoding(tokenizer_val)
             
     # RecursiveChunker: if rules is none use RecursiveRules
     if chunker_type == "recursive" and (("rules" not in params) or (params["rules"] is None)):
+        from chonkie import RecursiveRules
         params["rules"] = RecursiveRules()
 
     chunker_class = CHONKER_MAP[chunker_type]
-    return chunker_class(**params)
\ No newline at end of file
+    return chunker_class(**params)
+
+
+def _freeze(value: Any) -> Hashable:
+    """
+    Converts a parameter value into a hashable form usable as part of a cache key.
+    """
+    if isinstance(value, dict):
+        return tuple(sorted((str(k), _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set)):
+        items = [_freeze(v) for v in value]
+        return tuple(sorted(items, key=repr)) if isinstance(value, set) else tuple(items)
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return repr(value)
+
+
+def chunker_cache_key(chunker_type: str, chunker_kwargs: Dict[str, Any]) -> Tuple[str, Hashable]:
+    """
+    Builds the registry key for a chunker: its type plus its parameters merged with DEFAULT_PARAMS,
+    so that omitted defaults and explicitly passed defaults map to the same instance.
+    """
+    params = DEFAULT_PARAMS.get(chunker_type, {}).copy()
+    params.update(chunker_kwargs)
+    return chunker_type, _freeze(params)
+
+
+class ChunkerRegistry:
+    """
+    Memoizes chunker instances by (chunker_type, normalized params).
+
+    Building "semantic", "sdpm" and "late" chunkers loads an embedding model, so reusing
+    the instance across files avoids reloading the model for every document.
+
+    Args:
+        max_size (int): Maximum number of cached chunkers, least recently used are evicted first (default: unlimited)
+        max_memory (int): Approximate memory cap in bytes for cached chunkers, measured as the
+                          growth of the process RSS while each chunker was built (default: unlimited)
+    """
+
+    def __init__(self, max_size: Optional[int] = None, max_memory: Optional[int] = None):
+        self._entries: "OrderedDict[Tuple[str, Hashable], Tuple[Any, int]]" = OrderedDict()
+        self._lock = threading.RLock()
+        self.configure(max_size=max_size, max_memory=max_memory)
+
+    def configure(self, max_size: Optional[int] = None, max_memory: Optional[int] = None) -> None:
+        if max_size is not None and max_size < 1:
+            raise ValueError("max_size must be a positive integer.")
+        if max_memory is not None and max_memory < 1:
+            raise ValueError("max_memory must be a positive integer.")
+        with self._lock:
+            self.max_size = max_size
+            self.max_memory = max_memory
+            self._evict()
+
+    @property
+    def memory_usage(self) -> int:
+        """Estimated memory held by the cached chunkers, in bytes."""
+        return sum(size for _, size in self._entries.values())
+
+    def get(self, chunker_type: str = "token", **chunker_kwargs: Any):
+        """
+        Returns the cached chunker for the given type and params, creating it on a miss.
+        """
+        key = chunker_cache_key(chunker_type, chunker_kwargs)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry[0]
+
+            from officechunker.embeddings import wrap_chunker_embeddings
+
+            rss_before = get_rss_bytes()
+            chunker = wrap_chunker_embeddings(create_chunker(chunker_type, **chunker_kwargs))
+            size = max(get_rss_bytes() - rss_before, 0)
+
+            self._entries[key] = (chunker, size)
+            self._evict()
+            return chunker
+
+    def _evict(self) -> None:
+        # The most recently used entry is never evicted, even if it alone exceeds max_memory.
+        while len(self._entries) > 1 and (
+            (self.max_size is not None and len(self._entries) > self.max_size)
+            or (self.max_memory is not None and self.memory_usage > self.max_memory)
+        ):
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Tuple[str, Dict[str, Any]]) -> bool:
+        chunker_type, chunker_kwargs = key
+        return chunker_cache_key(chunker_type, chunker_kwargs) in self._entries
+
+
+# Process-wide registry used by the Converter workers
+CHUNKER_REGISTRY = ChunkerRegistry()
+
+
+def get_chunker(chunker_type: str = "token", **chunker_kwargs: Any):
+    """
+    Returns a cached Chunker Instance from CHUNKER_REGISTRY, creating it on first use.
+
+    Args:
+        chunker_type (string)
+        **chunker_kwargs: Any
+    """
+    return CHUNKER_REGISTRY.get(chunker_type, **chunker_kwargs)
+
+
+def configure_chunker_registry(max_size: Optional[int] = None, max_memory: Optional[int] = None) -> None:
+    """
+    Sets the LRU size and memory cap of CHUNKER_REGISTRY.
+    """
+    CHUNKER_REGISTRY.configure(max_size=max_size, max_memory=max_memory)
+
+
+class TargetTokenCounter:
+    """
+    Counts the tokens of chunk texts with a second tokenizer, e.g. the one of the embedding model that
+    consumes the chunks, so that consumers can enforce its limits without re-tokenizing every chunk.
+    The tokenizer is loaded on first use, so that a bad name is reported by the files that need it;
+    a failed load is not retried for every file.
+
+    Args:
+        tokenizer (str): any name accepted by chonkie's Tokenizer: "character", "word",
+                         a tiktoken encoding or a Hugging Face tokenizer (default: disabled)
+    """
+
+    def __init__(self, tokenizer: Optional[str] = None):
+        self._lock = threading.Lock()
+        self.tokenizer_name: Optional[str] = None
+        self._tokenizer = None
+        self._error: Optional[Exception] = None
+        self.configure(tokenizer)
+
+    def configure(self, tokenizer: Optional[str] = None) -> None:
+        with self._lock:
+            if tokenizer != self.tokenizer_name:
+                self._tokenizer = None
+                self._error = None
+            self.tokenizer_name = tokenizer
+
+    def count(self, texts: List[str]) -> Optional[List[int]]:
+        """
+        Returns the token count of each text, or None if no target tokenizer is configured.
+        """
+        if self.tokenizer_name is None:
+            return None
+        with self._lock:
+            if self._error is not None:
+                raise self._error
+            if self._tokenizer is None:
+                from chonkie.tokenizer import Tokenizer
+
+                try:
+                    self._tokenizer = Tokenizer(self.tokenizer_name)
+                except Exception as e:
+                    self._error = e
+                    raise
+            tokenizer = self._tokenizer
+        return [int(count) for count in tokenizer.count_tokens_batch(texts)] if texts else []
+
+
+# Process-wide target tokenizer used by the Converter workers
+TARGET_TOKEN_COUNTER = TargetTokenCounter()
+
+
+def configure_target_tokenizer(tokenizer: Optional[str] = None) -> None:
+    """
+    Sets the tokenizer of TARGET_TOKEN_COUNTER; None disables target token counts.
+    """
+    TARGET_TOKEN_COUNTER.configure(tokenizer)
@@ -10,11 +10,36 @@ import os
 import json
 import argparse
 
-from officechunker.converter import Converter
+from officechunker.converter import DEFAULT_SCHEDULE_WINDOW, Converter
+from officechunker.file_handlers import HttpFileConnector
+
+def positive_int(value: str) -> int:
+    """
+    argparse type of options that must be a positive integer.
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {number}")
+    return number
 
 def main():
+    # 'officechunker watch <src_folder> ...' keeps converting changes; 'officechunker <src_folder> ...' converts once.
+    # A source folder named 'watch' is given as './watch', which is not taken for the subcommand.
+    argv = sys.argv[1:]
+    watch = bool(argv) and argv[0] == "watch"
+    if watch:
+        argv = argv[1:]
     parser = argparse.ArgumentParser(
-        description="CLI for converting files using the OfficeChunker Converter."
+        prog="officechunker watch" if watch else None,
+        description=(
+            "Watch a folder and convert files as they are created or modified using the OfficeChunker Converter."
+            if watch else "CLI for converting files using the OfficeChunker Converter."
+        ),
+        epilog=None if watch else "Run 'officechunker watch <src_folder> ...' to keep converting changes. "
+                                  "To convert a source folder named 'watch', give it as './watch'."
     )
     parser.add_argument(
         "src_folder",
@@ -41,8 +66,217 @@ def main():
         action="store_true",
         help="Use this option to delete temporary markdown (.md) files after conversion."
     )
+    parser.add_argument(
+        "--copy_source",
+        action="store_true",
+        help="Copy the whole source folder into the destination folder before converting (previous behavior). By default, files are read in place and only outputs are written."
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Keep the destination folder and only convert new or changed files, using the manifest stored there. Outputs of removed source files are deleted."
+    )
+    parser.add_argument(
+        "--output_format", "--output-format",
+        dest="output_format",
+        choices=["md", "jsonl", "parquet"],
+        default="md",
+        help="How chunks are written: one .md file per chunk (default), or a single chunks.jsonl / chunks.parquet file in the destination folder."
+    )
+    parser.add_argument(
+        "--chunk_metadata",
+        choices=["front_matter", "sidecar"],
+        default=None,
+        help="With --output_format md, also write each chunk's source, index, token count and offsets: as YAML front matter in the chunk file, or in a <file name>_chunks.jsonl sidecar per source."
+    )
+    parser.add_argument(
+        "--target_tokenizer",
+        type=str,
+        default=None,
+        help="Also count every chunk's tokens with this tokenizer (e.g. 'cl100k_base' or a Hugging Face tokenizer name), stored as target_token_count."
+    )
+    parser.add_argument(
+        "--embedding_batch_size",
+        type=int,
+        default=None,
+        help="Embed sentences of all files being chunked at once in shared batches of this size (semantic/sdpm chunkers)."
+    )
+    parser.add_argument(
+        "--embedding_cache",
+        type=str,
+        default=None,
+        help="Directory of an on-disk sentence embedding cache shared across files and runs (semantic/sdpm chunkers)."
+    )
+    parser.add_argument(
+        "--embedding_cache_namespace",
+        type=str,
+        default=None,
+        help="Name of the embedding model in the embedding cache. Needed only for models that expose no model name."
+    )
+    parser.add_argument(
+        "--parse_cache",
+        type=str,
+        default=None,
+        help="Directory of an on-disk cache of parsed markdown shared across runs, so that rerunning with another chunker config skips parsing unchanged files."
+    )
+    parser.add_argument(
+        "--parse_cache_max_size",
+        type=positive_int,
+        default=None,
+        help="Size limit of the parse cache in MiB; the least recently used entries are evicted beyond it (default: unlimited)."
+    )
+    parser.add_argument(
+        "--schedule_window",
+        type=int,
+        default=DEFAULT_SCHEDULE_WINDOW,
+        help=f"Number of listed files buffered to start the largest ones first (default: {DEFAULT_SCHEDULE_WINDOW}). 0 lists and orders the whole source folder before converting."
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of worker processes used for parsing and chunking. If not set, files are processed in a thread pool."
+    )
+    parser.add_argument(
+        "--split_min_size",
+        type=int,
+        default=None,
+        help="Parse PDFs and xlsx workbooks of at least this many bytes as page ranges / sheets in parallel, stitched back in order."
+    )
+    parser.add_argument(
+        "--split_min_pages",
+        type=int,
+        default=None,
+        help="Parse PDFs with at least this many pages and workbooks with at least this many sheets in parallel parts."
+    )
+    parser.add_argument(
+        "--split_part_size",
+        type=int,
+        default=None,
+        help="Pages or sheets per part of a split file (default: spread evenly over the workers)."
+    )
+    parser.add_argument(
+        "--stream_xlsx_min_size",
+        type=int,
+        default=None,
+        help="Read xlsx workbooks of at least this many bytes (0 for all) row by row with bounded memory, repeating the table header in each chunk."
+    )
+    parser.add_argument(
+        "--file_timeout",
+        type=float,
+        default=None,
+        help="Seconds a worker may spend on one file. Workers that take longer are killed and replaced, and the file is reported as an error. Requires --workers."
+    )
+    parser.add_argument(
+        "--worker_max_memory",
+        type=int,
+        default=None,
+        help="Memory limit of a worker in MiB. Workers that exceed it while converting a file are killed and replaced, and the file is reported as an error. Requires --workers."
+    )
+    parser.add_argument(
+        "--worker_max_tasks",
+        type=int,
+        default=None,
+        help="Replace each worker with a fresh process after this many tasks to release leaked memory. Requires --workers."
+    )
+    parser.add_argument(
+        "--shard_index", "--shard-index",
+        dest="shard_index",
+        type=int,
+        default=None,
+        help="Index (0-based) of the shard converted by this machine. Files are assigned to shards by a stable hash of their path. Requires --shard_count."
+    )
+    parser.add_argument(
+        "--shard_count", "--shard-count",
+        dest="shard_count",
+        type=int,
+        default=None,
+        help="Number of shards the source folder is split into across machines."
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Keep the destination folder and a checkpoint journal of completed files, so that a restarted run continues where it stopped."
+    )
+    parser.add_argument(
+        "--checkpoint_every",
+        type=int,
+        default=100,
+        help="Number of completed files between two checkpoints of a resumable run (default: 100)."
+    )
+    parser.add_argument(
+        "--dedup_files",
+        action="store_true",
+        help="Hash source files and convert byte-identical copies only once; the other copies are listed in duplicates.jsonl in the destination folder."
+    )
+    parser.add_argument(
+        "--dedup_chunks",
+        choices=["exact", "near"],
+        default=None,
+        help="Drop chunks already written in this run: 'exact' for identical text, 'near' also for near-duplicates found with MinHash."
+    )
+    parser.add_argument(
+        "--dedup_threshold",
+        type=float,
+        default=0.9,
+        help="Minimum estimated Jaccard similarity of two chunks for --dedup_chunks near (default: 0.9)."
+    )
+    parser.add_argument(
+        "--endpoint_url",
+        type=str,
+        default=None,
+        help="Read the source folder from an S3-style object store at this URL (e.g. http://127.0.0.1:9000) instead of the local disk. src_folder is then a key prefix in --bucket."
+    )
+    parser.add_argument(
+        "--bucket",
+        type=str,
+        default=None,
+        help="Bucket of the object store given by --endpoint_url."
+    )
+    parser.add_argument(
+        "--max_connections",
+        type=int,
+        default=8,
+        help="Maximum number of concurrent requests to the object store (default: 8)."
+    )
+    parser.add_argument(
+        "--prefetch",
+        type=int,
+        default=None,
+        help="Number of remote files downloaded ahead of the ones being converted (default: the number of workers)."
+    )
+    parser.add_argument(
+        "--upload_folder",
+        type=str,
+        default=None,
+        help="Also upload the outputs to this folder (key prefix with --endpoint_url) while the run progresses."
+    )
+    parser.add_argument(
+        "--report",
+        type=str,
+        default=None,
+        help="Write a JSON run report (per-stage timings with p50/p90/p99 per file extension, throughput, peak memory) to this path."
+    )
+    if watch:
+        parser.add_argument(
+            "--debounce",
+            type=float,
+            default=2.0,
+            help="Seconds a file must go without changes before it is converted (default: 2)."
+        )
+        parser.add_argument(
+            "--poll_interval",
+            type=float,
+            default=5.0,
+            help="Seconds between two listings of the source folder when polling (default: 5)."
+        )
+        parser.add_argument(
+            "--polling",
+            action="store_true",
+            help="List the source folder every --poll_interval seconds instead of using inotify, e.g. on network file systems."
+        )
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     # Handle chunker_config parameter: parse JSON string if provided, otherwise use as a plain string
     chunker_config = None
@@ -52,14 +286,55 @@ def main():
         except json.JSONDecodeError:
             chunker_config = args.chunker_config
 
+    if (args.endpoint_url is None) != (args.bucket is None):
+        parser.error("--endpoint_url and --bucket must be given together.")
+    file_handler = None
+    if args.endpoint_url is not None:
+        file_handler = HttpFileConnector(args.endpoint_url, args.bucket, max_connections=args.max_connections)
+
     converter = Converter(
         src_folder=args.src_folder,
         dst_folder=args.dst_folder,
         chunker_config=chunker_config,
-        delete_md_files=args.delete_md_files
+        file_handler=file_handler,
+        delete_md_files=args.delete_md_files,
+        copy_source=args.copy_source,
+        # Watching keeps outputs in sync through the manifest of incremental runs
+        incremental=args.incremental or watch,
+        output_format=args.output_format,
+        chunk_metadata=args.chunk_metadata,
+        target_tokenizer=args.target_tokenizer,
+        embedding_batch_size=args.embedding_batch_size,
+        embedding_cache_dir=args.embedding_cache,
+        embedding_cache_namespace=args.embedding_cache_namespace,
+        parse_cache_dir=args.parse_cache,
+        parse_cache_max_size=args.parse_cache_max_size * 2**20 if args.parse_cache_max_size is not None else None,
+        executor="process" if args.workers is not None else "thread",
+        max_workers=args.workers,
+        schedule_window=args.schedule_window or None,
+        split_min_size=args.split_min_size,
+        split_min_pages=args.split_min_pages,
+        split_part_size=args.split_part_size,
+        stream_xlsx_min_size=args.stream_xlsx_min_size,
+        file_timeout=args.file_timeout,
+        worker_max_memory=args.worker_max_memory * 2**20 if args.worker_max_memory is not None else None,
+        worker_max_tasks=args.worker_max_tasks,
+        shard_index=args.shard_index,
+        shard_count=args.shard_count,
+        resume=args.resume,
+        checkpoint_every=args.checkpoint_every,
+        dedup_files=args.dedup_files,
+        dedup_chunks=args.dedup_chunks,
+        dedup_threshold=args.dedup_threshold,
+        prefetch=args.prefetch,
+        upload_folder=args.upload_folder,
+        report_path=args.report
     )
 
-    converter.convert()
+    if watch:
+        converter.watch(debounce=args.debounce, poll_interval=args.poll_interval, polling=args.polling)
+    else:
+        converter.convert()
 
 if __name__ == "__main__":
     main()
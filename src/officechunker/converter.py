@@ -1,10 +1,44 @@
 import os
 import asyncio
-from typing import Optional, List, Tuple, Union, Dict, Any
-from tqdm import tqdm
+import contextlib
+import itertools
+import json
+import multiprocessing
+import shutil
+import signal
+import tempfile
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional, List, Tuple, Union, Dict, Any, AsyncIterator, BinaryIO, ContextManager, Iterable, Iterator
 from officechunker.file_handlers import BaseFileConnector, LocalFileConnector
-from officechunker.chunkers import create_chunker, DEFAULT_PARAMS
-from officechunker.process import parse_to_md
+from officechunker.chunkers import DEFAULT_PARAMS, configure_chunker_registry, configure_target_tokenizer
+from officechunker.dedup import (
+    DEDUP_CHUNK_MODES,
+    DEDUP_STATE_FILE_NAME,
+    DUPLICATES_FILE_NAME,
+    ChunkDeduplicator,
+    DedupState,
+    DuplicateLog,
+)
+from officechunker.journal import JOURNAL_FILE_NAME, CheckpointJournal
+from officechunker.manifest import MANIFEST_FILE_NAME, Manifest, manifest_chunker_config
+from officechunker.metrics import MetricsHook, RunReport, new_file_metrics
+from officechunker.parse_cache import configure_parse_cache
+from officechunker.pool import SupervisedPool
+from officechunker.process import SPLITTABLE_EXTENSIONS, count_parts
+from officechunker.scheduler import ReadAhead, aiterate, largest_first, run_bounded, shard_of
+from officechunker.sinks import CHUNK_METADATA_MODES, SINK_MAP, BaseChunkSink, create_sink
+from officechunker.utils import file_sha256
+from officechunker.watcher import RESCAN, Debouncer, create_watcher
+from officechunker.workers import (
+    convert_file,
+    convert_parts,
+    convert_stream,
+    convert_xlsx_streaming,
+    init_worker,
+    parse_file_part,
+)
 
 
 DEFAULT_EXTENSION_CHUNKER_MAP = {
@@ -14,6 +48,23 @@ DEFAULT_EXTENSION_CHUNKER_MAP = {
     ".pptx": "late"
 
 }
+
+EXECUTOR_TYPES = ("thread", "process")
+
+# Listed files buffered for largest-first ordering by default: enough look-ahead to start big files early,
+# while the first conversions start right away and memory does not grow with the size of the listing
+DEFAULT_SCHEDULE_WINDOW = 2048
+
+# Number of spooled chunk records passed to the sink at once when streaming huge workbooks
+SPOOL_BATCH_SIZE = 1000
+
+# Longest time watch waits for file events before checking whether it was asked to stop
+WATCH_WAKEUP = 1.0
+
+# A source for iter_chunks: a path, raw bytes or a binary file-like object,
+# or a (name, bytes or file-like) pair whose name supplies the file extension.
+ChunkSource = Union[str, os.PathLike, bytes, BinaryIO, Tuple[str, Union[bytes, BinaryIO]]]
+
 class Converter:
     def __init__(
         self,
@@ -24,6 +75,42 @@ class Converter:
         chunker_config: Optional[Union[str, Dict[str, Union[str, Dict[str, Any]]]]] = None,
         delete_md_files: bool = True,
         file_handler: Optional['BaseFileConnector'] = None,
+        executor: str = "thread",
+        max_workers: Optional[int] = None,
+        chunker_cache_size: Optional[int] = None,
+        chunker_cache_memory: Optional[int] = None,
+        max_in_flight: Optional[int] = None,
+        largest_first: bool = True,
+        schedule_window: Optional[int] = DEFAULT_SCHEDULE_WINDOW,
+        copy_source: bool = False,
+        incremental: bool = False,
+        output_format: str = "md",
+        sink_options: Optional[Dict[str, Any]] = None,
+        embedding_batch_size: Optional[int] = None,
+        embedding_cache_dir: Optional[str] = None,
+        embedding_cache_namespace: Optional[str] = None,
+        report_path: Optional[str] = None,
+        metrics_hooks: Optional[List[MetricsHook]] = None,
+        split_min_size: Optional[int] = None,
+        split_min_pages: Optional[int] = None,
+        split_part_size: Optional[int] = None,
+        stream_xlsx_min_size: Optional[int] = None,
+        file_timeout: Optional[float] = None,
+        worker_max_memory: Optional[int] = None,
+        worker_max_tasks: Optional[int] = None,
+        shard_index: Optional[int] = None,
+        shard_count: Optional[int] = None,
+        resume: bool = False,
+        checkpoint_every: int = 100,
+        dedup_files: bool = False,
+        dedup_chunks: Optional[str] = None,
+        dedup_threshold: float = 0.9,
+        prefetch: Optional[int] = None,
+        upload_folder: Optional[str] = None,
+        chunk_metadata: Optional[str] = None,
+        target_tokenizer: Optional[str] = None,
+        parse_cache_dir: Optional[str] = None,
+        parse_cache_max_size: Optional[int] = None,
     ):
         """
         Initializes the Converter.
@@ -40,8 +127,92 @@ class Converter:
                               ...
                           }
                           If not provided, the default DEFAULT_EXTENSION_CHUNKER_MAP is used.
-        - delete_md_files: Whether to delete temporary .md files after conversion.
-        - file_handler: The file handler to use (default: LocalFileConnector).
+        - delete_md_files: Whether to skip keeping the intermediate .md file of each converted document.
+        - file_handler: The file handler to use (default: LocalFileConnector). Sources are listed, sized, hashed,
+                        downloaded and uploaded through its async interface (aiter_files, aget_file_size, adownload, ...).
+        - executor: "thread" to parse and chunk in a thread pool, or "process" to use a pool of
+                    worker processes that each keep their own MarkItDown instance and chunkers.
+        - max_workers: Number of worker threads/processes (default: chosen by concurrent.futures).
+        - chunker_cache_size: Maximum number of chunker instances each worker keeps cached (default: unlimited).
+        - chunker_cache_memory: Approximate memory cap in bytes for cached chunkers per worker (default: unlimited).
+        - max_in_flight: Maximum number of files being converted at once (default: twice the number of workers).
+        - largest_first: Whether to start the biggest files first so that the run does not end waiting on one large file.
+        - schedule_window: Number of listed files buffered for size ordering (default: DEFAULT_SCHEDULE_WINDOW).
+                           Files are ordered within this look-ahead, so memory stays flat on huge trees and conversion
+                           starts while the folder is still being listed. None lists and orders the whole folder first.
+        - copy_source: If True, copy the whole source folder into dst_folder and convert the copies in place,
+                       deleting each copy after conversion. By default, files are read directly from src_folder
+                       and only the outputs are written, into the same directory structure under dst_folder.
+        - incremental: If True, keep dst_folder and a manifest of converted files in it, and only convert files that are
+                       new, changed, or whose chunker configuration changed; outputs of removed files are deleted.
+        - output_format: How chunks are written (see SINK_MAP):
+                         "md" writes one '<file name>_<i>.md' file per chunk (e.g. 'doc.pdf_1.md') next to the source's outputs,
+                         "jsonl" and "parquet" append all chunk records to a single file (or shards) in dst_folder.
+        - sink_options: Extra arguments for the sink, e.g. {"batch_size": 1000, "shard_size": 100000}.
+        - embedding_batch_size: If set, sentences from all files being chunked at once by "semantic"/"sdpm" chunkers
+                                are embedded together in batches of this size. Works best with executor="thread",
+                                where many files share one model.
+        - embedding_cache_dir: If set, sentence embeddings are cached on disk in this directory and reused across
+                               files and runs.
+        - embedding_cache_namespace: Identifies the embedding model in the embedding cache. Derived from the model's
+                                     class, name and dimension by default; required for models that expose no name.
+        - report_path: If set, a JSON report with per-stage timings (p50/p90/p99 per extension), throughput
+                       and peak memory of the run is written to this path.
+        - metrics_hooks: MetricsHook instances that receive every file's metrics and the final report,
+                         e.g. to forward them to an external metrics system.
+        - split_min_size: PDFs and xlsx workbooks of at least this many bytes are split into page ranges / groups
+                          of sheets that are parsed in parallel and stitched back in order before chunking
+                          (default: not split by size). Use with executor="process" to use several cores.
+        - split_min_pages: PDFs with at least this many pages and workbooks with at least this many sheets are split
+                           the same way (default: not split by page count).
+        - split_part_size: Pages or sheets per part of a split file (default: spread evenly over the workers).
+        - stream_xlsx_min_size: xlsx workbooks of at least this many bytes (0 for all) are read row by row and chunked
+                                in batches of rows that fit the chunker's chunk_size, each starting with the sheet's
+                                header row, so memory stays bounded however large the workbook is (default: disabled).
+        - file_timeout: Seconds a worker may spend on one file (or one part of a split file). A worker that takes longer
+                        is killed and replaced, the file is recorded in the error log and the run goes on.
+        - worker_max_memory: Resident memory in bytes a worker may use while converting a file; a worker that exceeds it
+                             is killed and replaced the same way (Linux only).
+        - worker_max_tasks: Replace each worker by a fresh process after this many tasks, releasing leaked memory.
+                            file_timeout, worker_max_memory and worker_max_tasks require executor="process".
+        - shard_index, shard_count: Convert only the files assigned to shard shard_index of shard_count, by a stable hash
+                                    of their path relative to src_folder, so that several machines can split one corpus
+                                    and write into a shared dst_folder. dst_folder is not cleared, and consolidated
+                                    outputs, manifests and journals are kept apart per shard.
+        - resume: If True, keep dst_folder and a checkpoint journal of completed files in it; a restarted run skips the
+                  files completed before it stopped instead of starting over.
+        - checkpoint_every: Number of completed files between two checkpoints of a resumable run.
+        - dedup_files: If True, source files are hashed first and a byte-identical copy of a file already converted
+                       in this run is not parsed again; instead, a reference to the converted copy is written to
+                       'duplicates.jsonl' in dst_folder.
+        - dedup_chunks: "exact" drops chunks whose text (up to whitespace) was already written in this run,
+                        "near" also drops near-duplicates found with MinHash (default: chunks are not deduplicated).
+        - dedup_threshold: Minimum estimated Jaccard similarity of word 5-grams of two chunks for "near" deduplication.
+                           dedup_files and dedup_chunks see one run (or one shard) at a time and cannot be combined
+                           with incremental. A resumed run continues with the state of the files completed before
+                           it was interrupted, kept in '.officechunker_dedup.jsonl' next to the journal.
+        - prefetch: With a remote file_handler (e.g. HttpFileConnector), number of files downloaded ahead of the ones
+                    being converted, so that network latency overlaps parsing (default: the number of workers).
+                    Remote sources are downloaded to a temporary folder and deleted once converted; incremental
+                    runs only download new and changed files, without prefetching.
+        - upload_folder: If set, outputs are also uploaded through file_handler to this folder: per-file outputs as soon
+                         as their source is converted, consolidated outputs and state files at the end of the run.
+                         Files under upload_folder are not listed as sources; it must not contain src_folder.
+        - chunk_metadata: With output_format "md", also write each chunk's source, index, token_count and start/end
+                          offsets: "front_matter" as a YAML block at the top of each chunk file, "sidecar" in a
+                          '<name>_chunks.jsonl' file per source. "jsonl" and "parquet" records always include them.
+                          Token counts come from the tokenizer of the configured chunker, also with return_type="texts".
+                          Offsets are checked against the markdown: text == markdown[start_index:end_index] (after the
+                          headers a "structural" chunk repeats), or both are None if the chunk's text cannot be located.
+        - target_tokenizer: If set, every chunk record also gets "target_token_count", its token count with this tokenizer
+                            (e.g. the embedding model's, such as "cl100k_base" or a Hugging Face tokenizer name), counted in
+                            the same pass as chunking so that consumers do not need to re-tokenize the chunks.
+        - parse_cache_dir: If set, the markdown of every parsed file is cached compressed on disk in this directory,
+                           keyed by the file's content hash and the parser version, so that runs with another
+                           chunker_config (or over copies of the same files) skip parsing. The directory can be shared
+                           by concurrent runs on one host. Workbooks read with stream_xlsx_min_size are not cached.
+        - parse_cache_max_size: Maximum size in bytes of the compressed parse cache; the least recently used entries
+                                are evicted beyond it (default: unlimited).
         """
         self.src_folder = src_folder
         self.dst_folder = (
@@ -50,7 +221,132 @@ class Converter:
             else os.path.join(os.getcwd(), os.path.basename(src_folder) + "_md")
         )
         self.delete_md_files = delete_md_files
+        self.copy_source = copy_source
+        if incremental and copy_source:
+            raise ValueError("incremental conversion reads sources in place and cannot be combined with copy_source.")
+        self.incremental = incremental
+
+        if output_format not in SINK_MAP:
+            raise ValueError(f"output_format must be one of {tuple(SINK_MAP)}, got '{output_format}'")
+        if incremental and not SINK_MAP[output_format].supports_removal:
+            raise ValueError(f"incremental conversion needs per-file outputs and does not support output_format '{output_format}'.")
+        # e.g. pyarrow for "parquet": fail here rather than after the first files are converted
+        SINK_MAP[output_format].check_available()
+        self.output_format = output_format
+        self.sink_options = sink_options if sink_options is not None else {}
+        if chunk_metadata is not None:
+            if chunk_metadata not in CHUNK_METADATA_MODES:
+                raise ValueError(f"chunk_metadata must be one of {CHUNK_METADATA_MODES}, got '{chunk_metadata}'")
+            if output_format != "md":
+                raise ValueError(f"output_format '{output_format}' always includes chunk metadata; chunk_metadata only applies to 'md'.")
+            self.sink_options = {**self.sink_options, "metadata": chunk_metadata}
+        self.target_tokenizer = target_tokenizer
+        self._sink: Optional[BaseChunkSink] = None
+
+        if embedding_batch_size is not None and embedding_batch_size < 1:
+            raise ValueError("embedding_batch_size must be a positive integer.")
+        self.embedding_batch_size = embedding_batch_size
+        self.embedding_cache_dir = embedding_cache_dir
+        self.embedding_cache_namespace = embedding_cache_namespace
+        if parse_cache_max_size is not None and parse_cache_max_size < 1:
+            raise ValueError("parse_cache_max_size must be a positive integer.")
+        if parse_cache_max_size is not None and parse_cache_dir is None:
+            raise ValueError("parse_cache_max_size requires parse_cache_dir.")
+        self.parse_cache_dir = parse_cache_dir
+        self.parse_cache_max_size = parse_cache_max_size
+        self.report_path = report_path
+        self.metrics_hooks = list(metrics_hooks) if metrics_hooks is not None else []
+        self._report: Optional[RunReport] = None
+        self._manifest: Optional[Manifest] = None
+        self._seen_files: set = set()
+        self._skipped_files = 0
         self.file_handler = file_handler if file_handler is not None else LocalFileConnector()
+        if self.file_handler.is_remote and copy_source:
+            raise ValueError("copy_source needs a local file_handler; remote sources are downloaded one by one instead.")
+        # dst_folder is always local, also when sources are remote
+        self._dst_handler = LocalFileConnector() if self.file_handler.is_remote else self.file_handler
+        if prefetch is not None and prefetch < 0:
+            raise ValueError("prefetch must be a non-negative integer.")
+        self.prefetch = prefetch
+        if upload_folder is not None and self.file_handler.is_within(src_folder, upload_folder):
+            # Uploaded outputs are left out of the listing, which would leave no sources
+            raise ValueError("upload_folder must not contain src_folder.")
+        self.upload_folder = upload_folder
+        self._read_ahead: Optional[ReadAhead] = None
+        self._staging_dir: Optional[str] = None
+
+        if executor not in EXECUTOR_TYPES:
+            raise ValueError(f"executor must be one of {EXECUTOR_TYPES}, got '{executor}'")
+        if max_workers is not None and max_workers < 1:
+            raise ValueError("max_workers must be a positive integer.")
+        self.executor = executor
+        self.max_workers = max_workers
+        self.chunker_cache_size = chunker_cache_size
+        self.chunker_cache_memory = chunker_cache_memory
+        self._executor: Optional[Executor] = None
+
+        if max_in_flight is not None and max_in_flight < 1:
+            raise ValueError("max_in_flight must be a positive integer.")
+        if schedule_window is not None and schedule_window < 1:
+            raise ValueError("schedule_window must be a positive integer.")
+        self.max_in_flight = max_in_flight
+        for name, value in (("split_min_size", split_min_size), ("split_min_pages", split_min_pages), ("split_part_size", split_part_size)):
+            if value is not None and value < 1:
+                raise ValueError(f"{name} must be a positive integer.")
+        self.split_min_size = split_min_size
+        self.split_min_pages = split_min_pages
+        self.split_part_size = split_part_size
+        if stream_xlsx_min_size is not None and stream_xlsx_min_size < 0:
+            raise ValueError("stream_xlsx_min_size must be a non-negative integer.")
+        self.stream_xlsx_min_size = stream_xlsx_min_size
+
+        if file_timeout is not None and file_timeout <= 0:
+            raise ValueError("file_timeout must be a positive number.")
+        for name, value in (("worker_max_memory", worker_max_memory), ("worker_max_tasks", worker_max_tasks)):
+            if value is not None and value < 1:
+                raise ValueError(f"{name} must be a positive integer.")
+        if executor != "process" and (file_timeout, worker_max_memory, worker_max_tasks) != (None, None, None):
+            raise ValueError("file_timeout, worker_max_memory and worker_max_tasks require executor='process', "
+                             "since threads cannot be stopped.")
+        self.file_timeout = file_timeout
+
+        if (shard_index is None) != (shard_count is None):
+            raise ValueError("shard_index and shard_count must be given together.")
+        if shard_count is not None and (shard_count < 1 or not 0 <= shard_index < shard_count):
+            raise ValueError("shard_count must be a positive integer and 0 <= shard_index < shard_count.")
+        if copy_source and (resume or shard_count is not None):
+            raise ValueError("resume and sharding read sources in place and cannot be combined with copy_source.")
+        if resume and incremental:
+            raise ValueError("incremental runs already skip converted files and cannot be combined with resume.")
+        if checkpoint_every < 1:
+            raise ValueError("checkpoint_every must be a positive integer.")
+        self.shard_index = shard_index
+        self.shard_count = shard_count
+        self.resume = resume
+        self.checkpoint_every = checkpoint_every
+        self._journal: Optional[CheckpointJournal] = None
+        self._completed: List[str] = []
+        self._resumed_files = 0
+        self._sink_lock = threading.RLock()
+        if dedup_chunks is not None and dedup_chunks not in DEDUP_CHUNK_MODES:
+            raise ValueError(f"dedup_chunks must be one of {DEDUP_CHUNK_MODES}, got '{dedup_chunks}'")
+        if not 0 < dedup_threshold <= 1:
+            raise ValueError("dedup_threshold must be in (0, 1].")
+        if incremental and (dedup_files or dedup_chunks is not None):
+            raise ValueError("incremental runs only convert changed files and cannot be combined with deduplication.")
+        self.dedup_files = dedup_files
+        self.dedup_chunks = dedup_chunks
+        self.dedup_threshold = dedup_threshold
+        self._source_digests: Optional[Dict[str, asyncio.Future]] = None
+        self._duplicate_log: Optional[DuplicateLog] = None
+        self._chunk_deduplicator: Optional[ChunkDeduplicator] = None
+        # Carries the deduplication state of completed files over to resumed runs
+        self._dedup_state: Optional[DedupState] = None
+        self._converted_digests: Dict[str, str] = {}
+        self.worker_max_memory = worker_max_memory
+        self.worker_max_tasks = worker_max_tasks
+        self.largest_first = largest_first
+        self.schedule_window = schedule_window
         
         # Validate and initialize chunker_config
         if chunker_config is None:
@@ -76,6 +372,10 @@ class Converter:
         else:
             raise ValueError("chunker_config must be either None, a string, or a dict mapping extensions to configurations.")
 
+        # Validate chunker parameters once per configured chunker instead of once per file
+        for chunker_type, chunker_params in self._get_chunker_specs():
+            self._validate_chunker_params(chunker_type, chunker_params)
+
     def _validate_chunker_params(self, chunker_type: str, user_params: Dict[str, Any]) -> None:
         """
         Validates user-provided parameters against the default parameters for the given chunker type.
@@ -106,6 +406,207 @@ class Converter:
                 return conf["type"], conf.get("params", {})
         return "token", {}
 
+    def _get_chunker_specs(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        Returns every (chunker_type, params) pair this Converter can use, without duplicates.
+        """
+        specs: List[Tuple[str, Dict[str, Any]]] = []
+        if isinstance(self.chunker_config, str):
+            specs.append(self._get_chunker_config(""))
+        else:
+            for ext in self.chunker_config:
+                specs.append(self._get_chunker_config(ext))
+            # Extensions missing from the mapping fall back to "token"
+            specs.append(("token", {}))
+        unique_specs = []
+        for spec in specs:
+            if spec not in unique_specs:
+                unique_specs.append(spec)
+        return unique_specs
+
+    def _create_executor(self) -> Executor:
+        """
+        Creates the executor that runs parsing and chunking.
+        Process workers are initialized once with MarkItDown and every configured chunker.
+        """
+        embedding_options = {
+            "batch_size": self.embedding_batch_size,
+            "cache_dir": self.embedding_cache_dir,
+            "cache_namespace": self.embedding_cache_namespace,
+        }
+        parse_cache_options = {"cache_dir": self.parse_cache_dir, "max_size": self.parse_cache_max_size}
+        if self.executor == "process":
+            initargs = (
+                self._get_chunker_specs(),
+                self.chunker_cache_size,
+                self.chunker_cache_memory,
+                embedding_options,
+                self.target_tokenizer,
+                parse_cache_options,
+            )
+            if (self.file_timeout, self.worker_max_memory, self.worker_max_tasks) != (None, None, None):
+                # Workers that hang, grow too large or are due for recycling are killed and replaced
+                return SupervisedPool(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=init_worker,
+                    initargs=initargs,
+                    timeout=self.file_timeout,
+                    max_memory=self.worker_max_memory,
+                    max_tasks_per_worker=self.worker_max_tasks,
+                )
+            return ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=init_worker,
+                initargs=initargs,
+            )
+        # Thread workers share this process's chunker registry and embedding settings
+        from officechunker.embeddings import configure_embedding_batching
+
+        configure_chunker_registry(max_size=self.chunker_cache_size, max_memory=self.chunker_cache_memory)
+        configure_target_tokenizer(self.target_tokenizer)
+        configure_embedding_batching(**embedding_options)
+        configure_parse_cache(**parse_cache_options)
+        return ThreadPoolExecutor(max_workers=self.max_workers)
+
+    def _get_max_in_flight(self) -> int:
+        """
+        Returns how many files may be in flight at once. By default, twice the number of workers
+        so that each worker has a file queued while its results are being written.
+        """
+        if self.max_in_flight is not None:
+            return self.max_in_flight
+        return 2 * self._get_worker_count()
+
+    def _get_worker_count(self) -> int:
+        """
+        Returns the number of workers of the executor.
+        """
+        return self.max_workers if self.max_workers is not None else (os.cpu_count() or 1)
+
+    async def _get_file_size(self, file_path: str) -> int:
+        """
+        Returns the size of a file via the file handler, or 0 if it cannot be determined
+        (e.g. a connector that does not report sizes).
+        """
+        try:
+            return await self.file_handler.aget_file_size(file_path)
+        except (OSError, NotImplementedError):
+            return 0
+
+    async def _get_parts(self, file_path: str, ext: str) -> Optional[List[Tuple[int, Optional[int]]]]:
+        """
+        Returns the [start, end) page/sheet ranges a large file is parsed in, or None if it is parsed whole.
+        The last range is open-ended (end is None).
+        """
+        if ext not in SPLITTABLE_EXTENSIONS or (self.split_min_size is None and self.split_min_pages is None):
+            return None
+        loop = asyncio.get_running_loop()
+        large = False
+        if self.split_min_size is not None:
+            large = await loop.run_in_executor(None, os.path.getsize, file_path) >= self.split_min_size
+            if not large and self.split_min_pages is None:
+                return None
+        count = await loop.run_in_executor(self._executor, count_parts, file_path)
+        if self.split_min_pages is not None and count >= self.split_min_pages:
+            large = True
+        if not large:
+            return None
+        part_size = self.split_part_size or -(-count // self._get_worker_count())
+        if count <= part_size:
+            return None
+        starts = list(range(0, count, part_size))
+        return [(start, end) for start, end in zip(starts, starts[1:] + [None])]
+
+    async def _parse_and_chunk(
+        self,
+        file_path: str,
+        ext: str,
+        chunker_type: str,
+        chunker_params: Dict[str, Any],
+        md_file_path: Optional[str] = None,
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Parses and chunks a file in the executor. Large PDFs and workbooks (see split_min_size/split_min_pages)
+        are parsed as page/sheet ranges in parallel, then stitched in order and chunked as one document,
+        so that chunk offsets refer to the stitched markdown.
+        """
+        loop = asyncio.get_running_loop()
+        parts = await self._get_parts(file_path, ext)
+        if parts is None:
+            return await loop.run_in_executor(
+                self._executor, convert_file, file_path, chunker_type, chunker_params, md_file_path
+            )
+        results = await asyncio.gather(*(
+            loop.run_in_executor(self._executor, parse_file_part, file_path, start, end) for start, end in parts
+        ))
+        # Parse time is the sum over parts, i.e. worker time rather than wall time
+        return await loop.run_in_executor(
+            self._executor, convert_parts, [markdown for markdown, _, _ in results], ext,
+            chunker_type, chunker_params, md_file_path, sum(seconds for _, seconds, _ in results),
+            sum(cached for _, _, cached in results),
+        )
+
+    def _get_shard_suffix(self) -> str:
+        """
+        Returns the suffix that keeps this shard's consolidated outputs and state files apart from other shards'.
+        """
+        if self.shard_count is None:
+            return ""
+        return f".shard-{self.shard_index:05d}-of-{self.shard_count:05d}"
+
+    def _get_state_path(self, file_name: str) -> str:
+        """
+        Returns the path of a run state file (manifest, journal) in dst_folder; each shard keeps its own.
+        """
+        stem, ext = os.path.splitext(file_name)
+        return os.path.join(self.dst_folder, f"{stem}{self._get_shard_suffix()}{ext}")
+
+    def _should_convert(self, file_path: str) -> bool:
+        """
+        Whether a listed source file belongs to this shard and was not completed by an earlier, resumed run.
+        """
+        rel_path = os.path.relpath(file_path, self.src_folder)
+        if self.shard_count is not None and shard_of(rel_path, self.shard_count) != self.shard_index:
+            return False
+        if self._journal is not None and rel_path in self._journal:
+            self._resumed_files += 1
+            return False
+        return True
+
+    def _get_output_dir(self, file_path: str) -> str:
+        """
+        Returns the directory that receives the outputs of a file.
+        """
+        if self.copy_source:
+            return os.path.dirname(file_path)
+        return os.path.dirname(self.file_handler.map_path(file_path, self.src_folder, self.dst_folder))
+
+    def _get_base_name(self, file_path: str) -> str:
+        """
+        Returns the name output files of a source start with: its file name with the extension ('doc.pdf_1.md'),
+        in every mode, so that 'doc.pdf' and 'doc.docx' in one directory do not overwrite each other's outputs
+        and toggling incremental does not rename them.
+        """
+        return os.path.basename(file_path)
+
+    def _is_in_dst_folder(self, file_path: str) -> bool:
+        """
+        Whether a source path lies inside dst_folder, e.g. when dst_folder is nested in src_folder.
+        """
+        dst = os.path.abspath(self.dst_folder)
+        return os.path.commonpath([os.path.abspath(file_path), dst]) == dst
+
+    def _is_output_path(self, file_path: str) -> bool:
+        """
+        Whether a listed path holds outputs rather than sources: it lies in dst_folder (local sources only, e.g.
+        dst_folder nested in src_folder) or in upload_folder (e.g. in the same bucket as the sources).
+        """
+        if not self.file_handler.is_remote and self._is_in_dst_folder(file_path):
+            return True
+        return self.upload_folder is not None and self.file_handler.is_within(file_path, self.upload_folder)
+
     def _remove_file(self, file_path: str) -> None:
         """
         Removes the specified file if it exists.
@@ -113,92 +614,609 @@ class Converter:
         if os.path.exists(file_path):
             os.remove(file_path)
 
-    async def _write_chunks(self, base_name: str, chunks: List[str], directory: str) -> None:
+    def _get_source_name(self, file_path: str) -> str:
         """
-        Writes each chunk to a separate markdown file.
+        Returns the path of a source file relative to the folder it was listed from.
+        """
+        root = self.dst_folder if self.copy_source else self.src_folder
+        return os.path.relpath(file_path, root)
+
+    async def _write_chunks(self, file_path: str, base_name: str, records: List[Dict[str, Any]], directory: str) -> List[str]:
+        """
+        Writes the chunk records of a file through the output sink, in a single executor call.
+        Returns the paths of the written files.
         """
         loop = asyncio.get_running_loop()
-        for i, chunk_text in enumerate(chunks):
-            chunk_file_path = os.path.join(directory, f"{base_name}_{i+1}.md")
-            def write_chunk():
-                with open(chunk_file_path, "w", encoding="utf-8") as f:
-                    f.write(chunk_text)
-            await loop.run_in_executor(None, write_chunk)
+        return await loop.run_in_executor(None, self._write_to_sink, file_path, base_name, records, directory)
+
+    def _write_to_sink(self, file_path: str, base_name: str, records: List[Dict[str, Any]], directory: str) -> List[str]:
+        source = self._get_source_name(file_path)
+        with self._sink_guard():
+            output_paths = self._sink.write(source, records, directory, base_name)
+            self._mark_completed(source)
+        return output_paths
+
+    def _sink_guard(self) -> ContextManager:
+        """
+        With a checkpoint journal, a file's writes and its completion are one step with respect to
+        checkpoints, so that a checkpoint never includes part of a file's chunks.
+        """
+        return self._sink_lock if self._journal is not None else contextlib.nullcontext()
+
+    def _mark_completed(self, source: str) -> None:
+        if self._journal is not None:
+            self._completed.append(source)
+
+    def _checkpoint(self) -> None:
+        """
+        Makes the sink's records durable and journals the files completed since the last checkpoint.
+        """
+        with self._sink_lock:
+            sink_state = self._sink.checkpoint()
+            if self._duplicate_log is not None:
+                self._duplicate_log.flush()
+            sources, self._completed = self._completed, []
+            if self._dedup_state is not None:
+                self._dedup_state.write([entry for entry in map(self._pop_dedup_entry, sources) if entry is not None])
+        if sources:
+            self._journal.record(sources, sink_state)
+
+    def _pop_dedup_entry(self, source: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns the deduplication state line of a completed source (see DedupState), or None if it adds nothing,
+        e.g. for a copy of another file.
+        """
+        entry: Dict[str, Any] = {"source": source}
+        digest = self._converted_digests.pop(source, None)
+        if digest is not None:
+            entry["sha256"] = digest
+        if self._chunk_deduplicator is not None:
+            entry.update(self._chunk_deduplicator.pop_state(source))
+        return entry if digest is not None or entry.get("chunks") else None
+
+    def _restore_dedup_state(self) -> None:
+        """
+        Restores the deduplication state of the files completed before the last checkpoint, so that a resumed
+        run does not convert copies of them again.
+        """
+        loop = asyncio.get_running_loop()
+        for entry in self._dedup_state.restore(self._journal.__contains__):
+            if self._source_digests is not None and entry.get("sha256"):
+                converted = loop.create_future()
+                converted.set_result(entry["source"])
+                self._source_digests.setdefault(entry["sha256"], converted)
+            if self._chunk_deduplicator is not None:
+                self._chunk_deduplicator.load_state(entry)
 
     async def _convert_single_file(self, file_path: str) -> Tuple[str, Optional[str]]:
         """
         Converts a single file to markdown and performs chunking.
         Returns a tuple (file_path, None) on success or (file_path, error_message) on error.
         """
+        metrics = new_file_metrics(self._get_source_name(file_path))
+        started = time.perf_counter()
+        err = None
         try:
-            loop = asyncio.get_running_loop()
-            
-            # Step 1: Convert file to markdown
-            result = await loop.run_in_executor(None, parse_to_md, file_path)
-            
-            # Step 2: Write markdown content to file
-            base_name = os.path.splitext(os.path.basename(file_path))[0]
-            md_file_path = os.path.join(os.path.dirname(file_path), f"{base_name}.md")
-            def write_md():
-                with open(md_file_path, "w", encoding="utf-8") as f:
-                    f.write(result)
-            await loop.run_in_executor(None, write_md)
-            
-            # Step 3: Determine chunker settings based on file extension
-            ext = os.path.splitext(file_path)[1].lower()
-            chosen_type, chosen_params = self._get_chunker_config(ext)
-            
-            # Step 4: Validate chunker parameters
-            self._validate_chunker_params(chosen_type, chosen_params)
-            
-            # Step 5: Create the chunker instance
-            chunker_instance = create_chunker(chosen_type, **chosen_params)
-            
-            # Step 6: Read markdown file and perform chunking
-            def read_md_and_chunk():
-                with open(md_file_path, "r", encoding="utf-8") as f:
-                    text_content = f.read()
-                chunks = chunker_instance(text_content)
-                return [chunk.text for chunk in chunks]
-            chunks = await loop.run_in_executor(None, read_md_and_chunk)
-            
-            # Step 7: Write chunks to individual files
-            await self._write_chunks(base_name, chunks, os.path.dirname(file_path))
-            
-            # Step 8: Remove the original file and, if specified, the temporary markdown file
-            await loop.run_in_executor(None, self._remove_file, file_path)
-            if self.delete_md_files:
-                await loop.run_in_executor(None, self._remove_file, md_file_path)
-                
-            return (file_path, None)
+            if self._manifest is not None:
+                await self._convert_incremental(file_path, metrics)
+            elif self._source_digests is not None:
+                await self._convert_deduplicated(file_path, metrics)
+            else:
+                await self._convert_file(file_path, metrics)
         except Exception as e:
-            return (file_path, str(e))
+            err = str(e)
+            metrics.update(status="error", error=err)
+        finally:
+            if self._read_ahead is not None:
+                self._read_ahead.release(file_path)
+        metrics["total_seconds"] = time.perf_counter() - started
+        self._record_metrics(metrics)
+        return (file_path, err)
+
+    def _record_metrics(self, metrics: Dict[str, Any]) -> None:
+        """
+        Adds the metrics of one file to the run report and passes them to the metrics hooks.
+        """
+        if self._report is not None:
+            self._report.add(metrics)
+        for hook in self.metrics_hooks:
+            hook.on_file(metrics)
+
+    async def _convert_file(self, file_path: str, metrics: Optional[Dict[str, Any]] = None) -> List[str]:
+        """
+        Converts a single file to markdown, performs chunking and writes the outputs.
+        Returns the paths of the output files. Sizes and stage timings are recorded in metrics if given.
+        """
+        loop = asyncio.get_running_loop()
+        if metrics is None:
+            metrics = new_file_metrics(self._get_source_name(file_path))
+        metrics["bytes_in"] = await self._get_file_size(file_path)
+        base_name = self._get_base_name(file_path)
+        output_dir = self._get_output_dir(file_path)
+        if not self.copy_source:
+            await loop.run_in_executor(None, self._dst_handler.make_dirs, output_dir)
+
+        # The intermediate markdown is only written when it is kept
+        md_file_path = None
+        if not self.delete_md_files:
+            md_file_path = os.path.join(output_dir, f"{base_name}.md")
+
+        # Step 1: Determine chunker settings based on file extension
+        ext = os.path.splitext(file_path)[1].lower()
+        chosen_type, chosen_params = self._get_chunker_config(ext)
+
+        # Remote sources are parsed from a local copy, usually prefetched while earlier files were converted
+        started = time.perf_counter()
+        local_path = await self._stage(file_path)
+        if local_path != file_path:
+            metrics["stages"]["download"] = time.perf_counter() - started
+
+        if ext == ".xlsx" and self.stream_xlsx_min_size is not None and metrics["bytes_in"] >= self.stream_xlsx_min_size:
+            # Steps 2-3 for huge workbooks: chunk row batches in the worker and write them from a spool file
+            output_paths = await self._convert_xlsx_streaming(
+                file_path, local_path, base_name, output_dir, chosen_type, chosen_params, md_file_path, metrics
+            )
+        else:
+            # Step 2: Convert to markdown and chunk inside the worker
+            records, stats = await self._parse_and_chunk(local_path, ext, chosen_type, chosen_params, md_file_path)
+            metrics["stages"].update(stats["stages"])
+            metrics["chars_out"] = stats["chars_out"]
+            metrics["parse_cache_hits"] = stats["parse_cache_hits"]
+            metrics["worker_peak_rss"] = stats["worker_peak_rss"]
+
+            if self._chunk_deduplicator is not None:
+                started = time.perf_counter()
+                kept = await loop.run_in_executor(
+                    None, self._chunk_deduplicator.filter, records, self._get_source_name(file_path)
+                )
+                metrics["stages"]["dedup"] = time.perf_counter() - started
+                metrics["duplicate_chunks"] = len(records) - len(kept)
+                records = kept
+            metrics["chunks"] = len(records)
+
+            # Step 3: Write chunks through the output sink
+            started = time.perf_counter()
+            output_paths = await self._write_chunks(file_path, base_name, records, output_dir)
+            metrics["stages"]["chunk_write"] = time.perf_counter() - started
+        if md_file_path is not None:
+            output_paths.insert(0, md_file_path)
+
+        if self.upload_folder is not None:
+            # Consolidated outputs are shared by all sources and uploaded at the end of the run
+            own_outputs = output_paths if self._sink.supports_removal else output_paths[:1 if md_file_path else 0]
+            started = time.perf_counter()
+            await self._upload_outputs(own_outputs)
+            metrics["stages"]["upload"] = time.perf_counter() - started
+
+        # Step 4: Remove the copied original file
+        if self.copy_source:
+            started = time.perf_counter()
+            await loop.run_in_executor(None, self._remove_file, file_path)
+            metrics["stages"]["cleanup"] = time.perf_counter() - started
+
+        return output_paths
+
+    async def _convert_xlsx_streaming(
+        self,
+        file_path: str,
+        local_path: str,
+        base_name: str,
+        output_dir: str,
+        chunker_type: str,
+        chunker_params: Dict[str, Any],
+        md_file_path: Optional[str],
+        metrics: Dict[str, Any],
+    ) -> List[str]:
+        """
+        Chunks a huge xlsx workbook with bounded memory (see convert_xlsx_streaming): the worker spools
+        chunk records to a temporary file, which is then passed to the output sink in batches.
+        local_path is where the workbook is read from, file_path names it in the outputs.
+        Returns the paths of the written files.
+        """
+        loop = asyncio.get_running_loop()
+        fd, spool_path = tempfile.mkstemp(prefix="officechunker-", suffix=".jsonl")
+        os.close(fd)
+        try:
+            count, stats = await loop.run_in_executor(
+                self._executor, convert_xlsx_streaming, local_path, chunker_type, chunker_params, spool_path, md_file_path
+            )
+            metrics["stages"].update(stats["stages"])
+            metrics["chars_out"] = stats["chars_out"]
+            metrics["worker_peak_rss"] = stats["worker_peak_rss"]
+
+            started = time.perf_counter()
+            output_paths, written = await loop.run_in_executor(
+                None, self._write_spooled_chunks, file_path, base_name, spool_path, output_dir
+            )
+            # Includes deduplication, which is done batch by batch while writing
+            metrics["stages"]["chunk_write"] = time.perf_counter() - started
+            metrics["chunks"] = written
+            metrics["duplicate_chunks"] = count - written
+            return output_paths
+        finally:
+            await loop.run_in_executor(None, self._remove_file, spool_path)
+
+    def _write_spooled_chunks(self, file_path: str, base_name: str, spool_path: str, output_dir: str) -> Tuple[List[str], int]:
+        """
+        Reads chunk records from a spool file and writes them through the output sink, SPOOL_BATCH_SIZE at a time.
+        Returns the paths of the written files and the number of records written.
+        """
+        source = self._get_source_name(file_path)
+        output_paths: Dict[str, None] = {}
+        written = 0
+        with self._sink_guard(), open(spool_path, "r", encoding="utf-8") as spool:
+            while True:
+                batch = [json.loads(line) for line in itertools.islice(spool, SPOOL_BATCH_SIZE)]
+                if not batch:
+                    break
+                if self._chunk_deduplicator is not None:
+                    batch = self._chunk_deduplicator.filter(batch, source)
+                output_paths.update(dict.fromkeys(self._sink.write(source, batch, output_dir, base_name, first_index=written)))
+                written += len(batch)
+            self._mark_completed(source)
+        return list(output_paths), written
+
+    async def _convert_deduplicated(self, file_path: str, metrics: Dict[str, Any]) -> None:
+        """
+        Converts a file unless a byte-identical copy was converted earlier in this run, in which case
+        only a reference to that copy is written. A copy that is still being converted is waited for;
+        if its conversion fails, this file is converted instead.
+        """
+        loop = asyncio.get_running_loop()
+        if self._read_ahead is not None:
+            # Hash the local copy, which is downloaded anyway, instead of reading the remote file twice
+            digest = await loop.run_in_executor(None, file_sha256, await self._stage(file_path))
+        else:
+            digest = await self.file_handler.aget_file_hash(file_path)
+        while digest in self._source_digests:
+            # Shielded, so that cancelling this file does not cancel the first copy's result
+            duplicate_of = await asyncio.shield(self._source_digests[digest])
+            if duplicate_of is not None:
+                metrics["status"] = "duplicate"
+                await loop.run_in_executor(None, self._write_duplicate, file_path, duplicate_of, digest)
+                if self.copy_source:
+                    await loop.run_in_executor(None, self._remove_file, file_path)
+                return
+
+        converted = loop.create_future()
+        self._source_digests[digest] = converted
+        if self._dedup_state is not None:
+            self._converted_digests[self._get_source_name(file_path)] = digest
+        try:
+            await self._convert_file(file_path, metrics)
+        except BaseException:
+            # Let the next copy be converted instead
+            del self._source_digests[digest]
+            self._converted_digests.pop(self._get_source_name(file_path), None)
+            converted.set_result(None)
+            raise
+        converted.set_result(self._get_source_name(file_path))
+
+    def _write_duplicate(self, file_path: str, duplicate_of: str, digest: str) -> None:
+        source = self._get_source_name(file_path)
+        with self._sink_guard():
+            self._duplicate_log.write(source, duplicate_of, digest)
+            self._mark_completed(source)
+
+    async def _convert_incremental(self, file_path: str, metrics: Dict[str, Any]) -> None:
+        """
+        Converts a file only if it is new, its content changed, or its chunker configuration changed,
+        and records the result in the manifest.
+        """
+        loop = asyncio.get_running_loop()
+        rel_path = os.path.relpath(file_path, self.src_folder)
+        self._seen_files.add(rel_path)
+        entry = self._manifest.get(rel_path)
+
+        ext = os.path.splitext(file_path)[1].lower()
+        chunker = manifest_chunker_config(*self._get_chunker_config(ext))
+        size = await self.file_handler.aget_file_size(file_path)
+        mtime = await self.file_handler.aget_file_mtime(file_path)
 
-    async def _convert_folder_async(self) -> List[Tuple[str, str]]:
+        # Unchanged size and mtime: trust the manifest without reading the file
+        if entry is not None and entry["chunker"] == chunker and entry["size"] == size and entry["mtime"] == mtime:
+            self._skipped_files += 1
+            metrics["status"] = "skipped"
+            return
+
+        file_hash = await self.file_handler.aget_file_hash(file_path)
+        if entry is not None and entry["chunker"] == chunker and entry["hash"] == file_hash:
+            # Touched but identical content
+            entry.update(size=size, mtime=mtime)
+            self._skipped_files += 1
+            metrics["status"] = "skipped"
+            return
+
+        # Outputs of the previous version are removed first, so no stale chunks survive a failure
+        if entry is not None:
+            await loop.run_in_executor(None, self._remove_outputs, entry)
+            self._manifest.remove(rel_path)
+
+        output_paths = await self._convert_file(file_path, metrics)
+        self._manifest.set(rel_path, {
+            "hash": file_hash,
+            "size": size,
+            "mtime": mtime,
+            "chunker": chunker,
+            "outputs": [os.path.relpath(p, self.dst_folder) for p in output_paths],
+        })
+
+    def _remove_outputs(self, entry: Dict[str, Any]) -> None:
+        """
+        Removes the output files recorded in a manifest entry, and their uploaded copies.
+        """
+        for rel_output in entry.get("outputs", []):
+            self._remove_file(os.path.join(self.dst_folder, rel_output))
+            if self.upload_folder is not None:
+                try:
+                    self.file_handler.remove_file(os.path.join(self.upload_folder, rel_output))
+                except FileNotFoundError:
+                    pass
+
+    async def _stage(self, file_path: str) -> str:
+        """
+        Returns a local path to parse a source from: the path itself, or the downloaded copy of a remote source.
+        """
+        if self._read_ahead is None:
+            return file_path
+        return await self._read_ahead.get(file_path)
+
+    async def _download_source(self, file_path: str) -> str:
+        """
+        Downloads a remote source into the staging folder, keeping its relative path and extension.
+        """
+        local_path = os.path.join(self._staging_dir, os.path.relpath(file_path, self.src_folder))
+        os.makedirs(os.path.dirname(local_path), exist_ok=True)
+        await self.file_handler.adownload(file_path, local_path)
+        return local_path
+
+    async def _upload_outputs(self, output_paths: List[str]) -> None:
         """
-        Converts all files in the destination folder to markdown and performs chunking.
+        Uploads output files to the same relative location under upload_folder, concurrently.
+        """
+        await asyncio.gather(*(
+            self.file_handler.aupload(output_path, self.file_handler.map_path(output_path, self.dst_folder, self.upload_folder))
+            for output_path in output_paths
+        ))
+
+    def _remove_deleted_sources(self) -> None:
+        """
+        Removes outputs and manifest entries of source files that no longer exist.
+        """
+        for rel_path in self._manifest:
+            if rel_path not in self._seen_files:
+                self._remove_outputs(self._manifest.remove(rel_path))
+
+    def _remove_deleted_paths(self, paths: List[str]) -> None:
+        """
+        Removes outputs and manifest entries of deleted source files, and of all files under deleted directories.
+        """
+        prefixes = [os.path.relpath(path, self.src_folder) for path in paths]
+        for rel_path in self._manifest:
+            if any(rel_path == prefix or rel_path.startswith(prefix + os.sep) for prefix in prefixes):
+                self._remove_outputs(self._manifest.remove(rel_path))
+
+    async def _convert_folder_async(self, paths: Optional[List[str]] = None) -> List[Tuple[str, str]]:
+        """
+        Converts all files to markdown and performs chunking, writing the outputs under the destination folder.
         Returns a list of error logs.
+
+        With paths (incremental runs only, see watch), only those source paths are checked instead of the whole folder:
+        existing files are converted if they changed, and outputs of paths that no longer exist are removed.
         """
-        # Prepare the destination folder by removing it if it exists and then copying the source folder.
-        if os.path.exists(self.dst_folder):
-            self.file_handler.remove_tree(self.dst_folder)
-        self.file_handler.copy_tree(self.src_folder, self.dst_folder)
-        
-        # Get all file paths from the destination folder.
-        all_files = self.file_handler.list_files(self.dst_folder)
-        tasks = [self._convert_single_file(fp) for fp in all_files]
+        if self.report_path is not None or self.metrics_hooks:
+            self._report = RunReport()
+
+        # Prepare the destination folder by removing it if it exists, unless this run is incremental,
+        # resumed, or one shard of a run whose other shards share the destination folder.
+        if self.incremental:
+            self._manifest = Manifest.load(self._get_state_path(MANIFEST_FILE_NAME))
+            self._seen_files = set()
+            self._skipped_files = 0
+        elif not self.resume and self.shard_count is None and os.path.exists(self.dst_folder):
+            self._dst_handler.remove_tree(self.dst_folder)
+
+        if self.copy_source:
+            # Fallback: copy the source folder and convert the copies in place.
+            started = time.perf_counter()
+            self.file_handler.copy_tree(self.src_folder, self.dst_folder)
+            if self._report is not None:
+                self._report.add_run_stage("copy", time.perf_counter() - started)
+            all_files = self.file_handler.aiter_files(self.dst_folder)
+        else:
+            # Read directly from the source folder; outputs are mirrored under the destination folder.
+            self._dst_handler.make_dirs(self.dst_folder)
+            if self.resume:
+                self._journal = CheckpointJournal.load(self._get_state_path(JOURNAL_FILE_NAME))
+                self._completed = []
+            self._resumed_files = 0
+            listed = self.file_handler.aiter_files(self.src_folder) if paths is None else aiterate(fp for fp in paths if os.path.isfile(fp))
+            all_files = (
+                fp async for fp in listed
+                if not self._is_output_path(fp) and self._should_convert(fp)
+            )
+
+        # Order file paths by size unless disabled; the whole listing is only held when fully ordered.
+        total = None
+        if self.largest_first:
+            all_files = largest_first(all_files, self._get_file_size, self.schedule_window)
+            if self.schedule_window is None:
+                all_files = [fp async for fp in all_files]
+                total = len(all_files)
+
+        loop = asyncio.get_running_loop()
         error_logs: List[Tuple[str, str]] = []
-        
-        results = []
-        for coro in tqdm(asyncio.as_completed(tasks), total=len(tasks), desc="Converting files"):
-            result = await coro
-            results.append(result)
-            
-        for file_path, err in results:
-            if err is not None:
-                error_logs.append((file_path, err))
+        self._sink = create_sink(self.output_format, self.dst_folder, self._get_shard_suffix(), **self.sink_options)
+        if self.dedup_files:
+            self._source_digests = {}
+            self._duplicate_log = DuplicateLog(self._get_state_path(DUPLICATES_FILE_NAME))
+        if self.dedup_chunks is not None:
+            self._chunk_deduplicator = ChunkDeduplicator(self.dedup_chunks, self.dedup_threshold)
+        if self._journal is not None and (self.dedup_files or self.dedup_chunks is not None):
+            self._dedup_state = DedupState(self._get_state_path(DEDUP_STATE_FILE_NAME))
+        if self.file_handler.is_remote:
+            # Remote sources are downloaded into a staging folder, `prefetch` files ahead of the ones being converted
+            self._staging_dir = tempfile.mkdtemp(prefix="officechunker-staging-")
+            depth = 0 if self.incremental else (self.prefetch if self.prefetch is not None else self._get_worker_count())
+            self._read_ahead = ReadAhead(all_files, self._download_source, self._remove_file, depth)
+            all_files = self._read_ahead
+        run_outputs: List[str] = []
+        try:
+            if self._journal is not None:
+                # Continue after the last checkpoint, discarding records written after it
+                self._sink.restore(self._journal.sink_state)
+                if self._duplicate_log is not None:
+                    self._duplicate_log.restore(self._journal.__contains__)
+                if self._dedup_state is not None:
+                    self._restore_dedup_state()
+            elif self.shard_count is not None:
+                # Start this shard's consolidated files from scratch instead of appending to an earlier run's
+                self._sink.restore(None)
+                if self._duplicate_log is not None:
+                    self._duplicate_log.restore(None)
+            from tqdm import tqdm
+
+            with tqdm(total=total, desc="Converting files", unit="file", disable=paths is not None) as progress:
+                async for file_path, err in run_bounded(all_files, self._convert_single_file, self._get_max_in_flight()):
+                    progress.update()
+                    if err is not None:
+                        error_logs.append((file_path, err))
+                    if self._journal is not None and len(self._completed) >= self.checkpoint_every:
+                        await loop.run_in_executor(None, self._checkpoint)
+        finally:
+            try:
+                if self._journal is not None:
+                    await loop.run_in_executor(None, self._checkpoint)
+            finally:
+                self._sink.close()
+                run_outputs = self._sink.output_files()
+                self._sink = None
+                if self._read_ahead is not None:
+                    await self._read_ahead.aclose()
+                    self._read_ahead = None
+                    shutil.rmtree(self._staging_dir, ignore_errors=True)
+                    self._staging_dir = None
+                if self._duplicate_log is not None:
+                    self._duplicate_log.close()
+                    self._duplicate_log = None
+                self._source_digests = None
+                self._chunk_deduplicator = None
+                if self._dedup_state is not None:
+                    self._dedup_state.close()
+                    self._dedup_state = None
+                self._converted_digests = {}
+                if self._journal is not None:
+                    self._journal.close()
+                    self._journal = None
+
+        if self._manifest is not None:
+            if paths is None:
+                self._remove_deleted_sources()
+            else:
+                self._remove_deleted_paths([path for path in paths if not os.path.exists(path)])
+            self._manifest.save()
+            self._manifest = None
+
+        if self.upload_folder is not None:
+            state_files = [
+                self._get_state_path(name)
+                for name in (MANIFEST_FILE_NAME, JOURNAL_FILE_NAME, DUPLICATES_FILE_NAME, DEDUP_STATE_FILE_NAME)
+            ]
+            await self._upload_outputs(run_outputs + [path for path in state_files if os.path.exists(path)])
+
+        if self._report is not None:
+            report = self._report.to_dict()
+            for hook in self.metrics_hooks:
+                hook.on_run_end(report)
+            if self.report_path is not None:
+                self._report.save(self.report_path, report)
+            self._report = None
         return error_logs
 
+    def _read_source(self, index: int, source: ChunkSource) -> Tuple[str, Optional[str], Optional[bytes]]:
+        """
+        Normalizes an iter_chunks source into (name, path, data); exactly one of path and data is set.
+        File-like objects are read here, so that only bytes are handed to the executor.
+        """
+        if isinstance(source, (str, os.PathLike)):
+            path = os.fspath(source)
+            return path, path, None
+        if isinstance(source, tuple):
+            name, data = source
+        else:
+            name, data = getattr(source, "name", None), source
+            if not isinstance(name, str):
+                name = f"<stream {index}>"
+        if not isinstance(data, (bytes, bytearray)):
+            data = data.read()
+        return name, None, bytes(data)
+
+    async def _chunk_source(self, item: Tuple[int, ChunkSource]) -> Tuple[str, List[Dict[str, Any]]]:
+        """
+        Parses and chunks one iter_chunks source in the executor. Returns (name, chunk records).
+        """
+        loop = asyncio.get_running_loop()
+        name, path, data = await loop.run_in_executor(None, self._read_source, *item)
+        ext = os.path.splitext(name)[1].lower()
+        chosen_type, chosen_params = self._get_chunker_config(ext)
+        try:
+            if path is not None:
+                records, _ = await self._parse_and_chunk(path, ext, chosen_type, chosen_params)
+            else:
+                records, _ = await loop.run_in_executor(
+                    self._executor, convert_stream, data, ext, chosen_type, chosen_params
+                )
+        except Exception as e:
+            raise RuntimeError(f"Error chunking {name}: {e}") from e
+        return name, records
+
+    async def aiter_chunks(self, sources: Iterable[ChunkSource]) -> AsyncIterator[Tuple[str, int, Dict[str, Any]]]:
+        """
+        Parses and chunks sources in memory, without writing anything to dst_folder.
+
+        Yields (source, chunk_index, chunk) as soon as each source is chunked, so sources come out
+        in completion order. source is the path, the given name, or '<stream i>' for unnamed streams;
+        chunk is a record with "text", "token_count", "start_index" and "end_index"
+        (plus "target_token_count" with target_tokenizer).
+        Sources are consumed lazily and at most max_in_flight of them are processed at once,
+        so a slow consumer also slows down parsing instead of buffering results.
+        An error on any source is raised as a RuntimeError naming that source.
+
+        Parameters:
+        - sources: Iterable of paths, bytes, binary file-like objects or (name, bytes/file-like) pairs.
+        """
+        owns_executor = self._executor is None
+        if owns_executor:
+            self._executor = self._create_executor()
+        try:
+            async for name, records in run_bounded(enumerate(sources), self._chunk_source, self._get_max_in_flight()):
+                for i, record in enumerate(records):
+                    yield name, i, record
+        finally:
+            if owns_executor:
+                self._executor.shutdown()
+                self._executor = None
+
+    def iter_chunks(self, sources: Iterable[ChunkSource]) -> Iterator[Tuple[str, int, Dict[str, Any]]]:
+        """
+        Synchronous version of aiter_chunks, driven by a private event loop.
+
+        Parameters:
+        - sources: Iterable of paths, bytes, binary file-like objects or (name, bytes/file-like) pairs.
+        """
+        loop = asyncio.new_event_loop()
+        chunk_iterator = self.aiter_chunks(sources)
+        try:
+            while True:
+                try:
+                    yield loop.run_until_complete(chunk_iterator.__anext__())
+                except StopAsyncIteration:
+                    return
+        finally:
+            loop.run_until_complete(chunk_iterator.aclose())
+            loop.run_until_complete(loop.shutdown_default_executor())
+            loop.close()
+
     def convert(self) -> None:
         """
         Converts all files in the folder to markdown and performs chunking.
@@ -208,13 +1226,104 @@ class Converter:
         print("Checking environment and preparing for conversion...")
         
         async def run():
-            return await self._convert_folder_async()
+            self._executor = self._create_executor()
+            try:
+                return await self._convert_folder_async()
+            finally:
+                self._executor.shutdown()
+                self._executor = None
         
         error_log = asyncio.run(run())
         
+        if self.incremental:
+            print(f"Skipped {self._skipped_files} unchanged files.")
+        if self.resume:
+            print(f"Skipped {self._resumed_files} files completed by an earlier run.")
+        self._print_errors(error_log)
+
+    def _print_errors(self, error_log: List[Tuple[str, str]]) -> None:
         if error_log:
             print("Errors encountered during conversion:")
             for fp, err in error_log:
                 print(f"[Error] File: {fp}, Reason: {err}")
         else:
-            print("All files converted successfully!")
\ No newline at end of file
+            print("All files converted successfully!")
+
+    def watch(
+        self,
+        debounce: float = 2.0,
+        poll_interval: float = 5.0,
+        polling: bool = False,
+        stop_event: Optional[threading.Event] = None,
+    ) -> None:
+        """
+        Brings dst_folder up to date like convert(), then keeps converting files as they are created or modified
+        and removes the outputs of deleted files, until stop_event is set or the process is interrupted.
+        The worker pool, with its parsers and chunkers, stays up between changes, so a new file is converted
+        without start-up cost. Requires incremental=True: the manifest maps every source to its outputs.
+        With report_path, the report is rewritten after every batch of changes.
+
+        Parameters:
+        - debounce: Seconds a file must go without new events before it is converted, so that a file that is still
+                    being written, or saved in several steps, is converted once.
+        - poll_interval: Seconds between two listings of src_folder when polling.
+        - polling: Find changes by listing src_folder every poll_interval seconds instead of with inotify.
+                   Polling is also used where inotify is unavailable (platforms other than Linux).
+        - stop_event: threading.Event that stops watching when set, e.g. from another thread.
+                      Called from the main thread, SIGTERM stops watching the same way.
+        """
+        if not self.incremental:
+            raise ValueError("watch keeps outputs up to date through the manifest and requires incremental=True.")
+        if self.file_handler.is_remote:
+            raise ValueError("watch needs a local src_folder.")
+        if debounce < 0:
+            raise ValueError("debounce must be a non-negative number.")
+        if self.dst_folder in [".", "..", "/"]:
+            raise ValueError("Invalid destination folder.")
+        stop_event = stop_event if stop_event is not None else threading.Event()
+
+        async def run():
+            loop = asyncio.get_running_loop()
+            if threading.current_thread() is threading.main_thread() and hasattr(signal, "SIGTERM"):
+                try:
+                    # Finish the current batch and save the manifest when stopped by a service manager
+                    loop.add_signal_handler(signal.SIGTERM, stop_event.set)
+                except NotImplementedError:
+                    pass
+            # Started before the first pass, so that changes made during it are not missed
+            watcher = await loop.run_in_executor(
+                None, create_watcher, self.src_folder, self.file_handler, poll_interval, polling, self._is_output_path
+            )
+            try:
+                self._executor = self._create_executor()
+                print("Checking environment and preparing for conversion...")
+                error_log = await self._convert_folder_async()
+                print(f"Skipped {self._skipped_files} unchanged files.")
+                self._print_errors(error_log)
+                print(f"Watching {self.src_folder} for changes ({type(watcher).__name__})...")
+
+                debouncer = Debouncer(debounce)
+                while not stop_event.is_set():
+                    wait = debouncer.time_to_next()
+                    timeout = WATCH_WAKEUP if wait is None else min(wait, WATCH_WAKEUP)
+                    debouncer.add(await loop.run_in_executor(None, watcher.read_changes, timeout))
+                    due = debouncer.pop_due()
+                    if not due:
+                        continue
+                    # Lost events: check the whole folder again
+                    changed = None if RESCAN in due else sorted(due)
+                    error_log = await self._convert_folder_async(changed)
+                    for fp, err in error_log:
+                        print(f"[Error] File: {fp}, Reason: {err}")
+                    print(f"Processed {len(due) if changed is not None else 'all'} changed paths "
+                          f"({self._skipped_files} unchanged, {len(error_log)} errors).")
+            finally:
+                watcher.close()
+                if self._executor is not None:
+                    self._executor.shutdown()
+                    self._executor = None
+
+        try:
+            asyncio.run(run())
+        except KeyboardInterrupt:
+            print("Stopped watching.")
\ No newline at end of file
@@ -0,0 +1,329 @@
+import base64
+import hashlib
+import json
+import os
+import re
+import threading
+import warnings
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Set, Tuple
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+DEDUP_CHUNK_MODES = ("exact", "near")
+
+DUPLICATES_FILE_NAME = "duplicates.jsonl"
+
+DEDUP_STATE_FILE_NAME = ".officechunker_dedup.jsonl"
+
+_WORD_RE = re.compile(r"\w+")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def _hash64(data: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little")
+
+
+class MinHasher:
+    """
+    MinHash signatures of texts over lower-cased word shingles. The fraction of equal signature
+    values of two texts estimates the Jaccard similarity of their shingle sets.
+
+    Each permutation is a multiply-shift hash (a * h + b mod 2**64, upper 32 bits) of the
+    64-bit shingle hash h, computed for all shingles at once with numpy.
+
+    Args:
+        num_perm (int): number of permutations, i.e. signature length
+        shingle_size (int): number of consecutive words per shingle
+        seed (int): seed of the permutations; signatures are only comparable with the same seed
+    """
+
+    def __init__(self, num_perm: int = 128, shingle_size: int = 5, seed: int = 1):
+        if num_perm < 1:
+            raise ValueError("num_perm must be a positive integer.")
+        if shingle_size < 1:
+            raise ValueError("shingle_size must be a positive integer.")
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        # numpy is only needed for near-duplicate detection, so it is not imported with this module
+        import numpy as np
+
+        rng = np.random.default_rng(seed)
+        # Odd multipliers make each permutation a bijection of the 64-bit hashes
+        self._a = rng.integers(0, 2**64, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 2**64, size=num_perm, dtype=np.uint64)
+
+    def shingles(self, text: str) -> Set[str]:
+        words = _WORD_RE.findall(text.lower())
+        if len(words) <= self.shingle_size:
+            return {" ".join(words)} if words else set()
+        return {" ".join(words[i:i + self.shingle_size]) for i in range(len(words) - self.shingle_size + 1)}
+
+    def signature(self, text: str) -> Optional["np.ndarray"]:
+        """
+        Returns the uint32 signature of text, or None if it has no words.
+        """
+        import numpy as np
+
+        shingles = self.shingles(text)
+        if not shingles:
+            return None
+        hashes = np.fromiter((_hash64(s.encode("utf-8")) for s in shingles), dtype=np.uint64, count=len(shingles))
+        with np.errstate(over="ignore"):
+            permuted = (hashes[:, None] * self._a + self._b) >> np.uint64(32)
+        return permuted.min(axis=0).astype(np.uint32)
+
+
+def lsh_bands(num_perm: int, threshold: float) -> Tuple[int, int]:
+    """
+    Returns (bands, rows) with bands * rows <= num_perm whose candidate threshold (1 / bands) ** (1 / rows),
+    the similarity at which two texts become candidates with probability of about one half, is closest to threshold.
+    """
+    best = (1, num_perm)
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        if abs((1 / bands) ** (1 / rows) - threshold) < abs((1 / best[0]) ** (1 / best[1]) - threshold):
+            best = (bands, rows)
+    return best
+
+
+class ChunkDeduplicator:
+    """
+    Drops chunks whose text was already kept earlier in the run.
+
+    "exact" drops chunks whose whitespace-normalized text equals a kept chunk's.
+    "near" also drops chunks whose estimated Jaccard similarity of word shingles (see MinHasher)
+    with a kept chunk is at least threshold. Candidates are found with locality-sensitive hashing
+    over bands of the signatures, so each chunk is only compared with a few kept chunks.
+
+    Memory grows with the number of kept chunks: a 16-byte digest each for "exact",
+    plus the signature (4 bytes per permutation) and its band keys for "near".
+    filter can be called from several threads. The chunks kept for a source can be taken out with
+    pop_state and added back to a new deduplicator with load_state, to carry the state over to a resumed run.
+
+    Args:
+        mode (str): "exact" or "near"
+        threshold (float): minimum similarity of near-duplicates, between 0 and 1
+        num_perm (int): MinHash permutations of "near"
+        shingle_size (int): words per shingle of "near"
+    """
+
+    def __init__(self, mode: str = "exact", threshold: float = 0.9, num_perm: int = 128, shingle_size: int = 5):
+        if mode not in DEDUP_CHUNK_MODES:
+            raise ValueError(f"mode must be one of {DEDUP_CHUNK_MODES}, got '{mode}'")
+        if not 0 < threshold <= 1:
+            raise ValueError("threshold must be in (0, 1].")
+        self.mode = mode
+        self.threshold = threshold
+        self._digests: Set[bytes] = set()
+        self._lock = threading.Lock()
+        # Digests and signatures kept per source since its last pop_state
+        self._added: Dict[str, List[Tuple[bytes, Optional["np.ndarray"]]]] = {}
+        if mode == "near":
+            self._hasher = MinHasher(num_perm=num_perm, shingle_size=shingle_size)
+            self._bands, self._rows = lsh_bands(num_perm, threshold)
+            self._buckets: List[Dict[int, List[int]]] = [{} for _ in range(self._bands)]
+            self._signatures: List["np.ndarray"] = []
+
+    def filter(self, records: List[Dict[str, Any]], source: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Returns the records that are not duplicates of a kept chunk, in order, and keeps them.
+        Duplicates within records are dropped as well. With source, the kept chunks are remembered for pop_state.
+        """
+        kept = []
+        for record in records:
+            text = record["text"]
+            digest = hashlib.blake2b(_WHITESPACE_RE.sub(" ", text).strip().encode("utf-8"), digest_size=16).digest()
+            # Signatures are computed outside the lock, so threads only serialize on the index lookups
+            signature = self._hasher.signature(text) if self.mode == "near" else None
+            with self._lock:
+                if digest in self._digests:
+                    continue
+                if signature is not None:
+                    keys = self._band_keys(signature)
+                    if self._has_near_duplicate(signature, keys):
+                        continue
+                    self._add_signature(signature, keys)
+                self._digests.add(digest)
+                if source is not None:
+                    self._added.setdefault(source, []).append((digest, signature))
+            kept.append(record)
+        return kept
+
+    def pop_state(self, source: str) -> Dict[str, Any]:
+        """
+        Returns the chunks kept for source since the last call, as base64 strings of their concatenated digests
+        ("chunks") and, for "near", signatures ("signatures"), in the form load_state reads.
+        """
+        with self._lock:
+            added = self._added.pop(source, [])
+        state: Dict[str, Any] = {"chunks": base64.b64encode(b"".join(digest for digest, _ in added)).decode("ascii")}
+        if self.mode == "near":
+            state["signatures"] = base64.b64encode(b"".join(signature.tobytes() for _, signature in added)).decode("ascii")
+        return state
+
+    def load_state(self, state: Dict[str, Any]) -> None:
+        """
+        Keeps the chunks of a state returned by pop_state, so that later copies of them are dropped.
+        A state without signatures, e.g. written by an "exact" run, only restores exact duplicates.
+        """
+        digests = base64.b64decode(state.get("chunks") or "")
+        signatures = None
+        if self.mode == "near" and state.get("signatures"):
+            import numpy as np
+
+            signatures = np.frombuffer(base64.b64decode(state["signatures"]), dtype=np.uint32)
+            if len(signatures) != len(digests) // 16 * self._hasher.num_perm:
+                warnings.warn("Ignoring MinHash signatures of another signature length.")
+                signatures = None
+        with self._lock:
+            for i in range(len(digests) // 16):
+                self._digests.add(digests[i * 16:(i + 1) * 16])
+                if signatures is not None:
+                    signature = signatures[i * self._hasher.num_perm:(i + 1) * self._hasher.num_perm].copy()
+                    self._add_signature(signature, self._band_keys(signature))
+
+    def _band_keys(self, signature: "np.ndarray") -> List[int]:
+        return [
+            hash(signature[band * self._rows:(band + 1) * self._rows].tobytes())
+            for band in range(self._bands)
+        ]
+
+    def _has_near_duplicate(self, signature: "np.ndarray", keys: List[int]) -> bool:
+        candidates = set()
+        for bucket, key in zip(self._buckets, keys):
+            candidates.update(bucket.get(key, ()))
+        # Band keys are only hints: similarity is checked on the whole signature
+        return any((self._signatures[i] == signature).mean() >= self.threshold for i in candidates)
+
+    def _add_signature(self, signature: "np.ndarray", keys: List[int]) -> None:
+        index = len(self._signatures)
+        self._signatures.append(signature)
+        for bucket, key in zip(self._buckets, keys):
+            bucket.setdefault(key, []).append(index)
+
+
+class DuplicateLog:
+    """
+    Append-only JSONL record of source files that were not converted because a byte-identical copy was.
+    Each line references the converted copy:
+        {"source": <duplicate source path>, "duplicate_of": <converted source path>, "sha256": <content digest>}
+
+    write can be called from several threads.
+
+    Args:
+        path (str): path of the log file
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+        self._lock = threading.Lock()
+
+    def write(self, source: str, duplicate_of: str, digest: str) -> None:
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, "a", encoding="utf-8")
+            entry = {"source": source, "duplicate_of": duplicate_of, "sha256": digest}
+            self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    def flush(self) -> None:
+        """
+        Forces the lines written so far to disk.
+        """
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+
+    def restore(self, keep: Optional[Callable[[str], bool]] = None) -> None:
+        """
+        Prepares the log to continue a run: only lines whose source satisfies keep are kept,
+        e.g. the sources completed before the last checkpoint. With None, the log is cleared.
+        """
+        self.close()
+        if not os.path.exists(self.path):
+            return
+        if keep is None:
+            os.remove(self.path)
+            return
+        lines = []
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    if keep(json.loads(line)["source"]):
+                        lines.append(line if line.endswith("\n") else line + "\n")
+                except (ValueError, KeyError, TypeError) as e:
+                    warnings.warn(f"Ignoring unreadable line of duplicate log {self.path}: {e}")
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.writelines(lines)
+        os.replace(tmp_path, self.path)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class DedupState:
+    """
+    Append-only record of what the files completed by a resumable run contribute to deduplication, kept next to
+    its checkpoint journal, so that a resumed run still recognizes copies of files and chunks converted before
+    it was interrupted. One line per completed source:
+        {"source": <source path>, "sha256": <content digest, with dedup_files>, "chunks": ..., "signatures": ...}
+    where "chunks" and "signatures" are the source's kept chunks, see ChunkDeduplicator.pop_state.
+
+    Lines are forced to disk before the checkpoint that completes their source is journaled; lines of sources
+    that no checkpoint completed are dropped by restore.
+
+    Args:
+        path (str): path of the state file
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+
+    def write(self, entries: List[Dict[str, Any]]) -> None:
+        """
+        Appends entries and forces them to disk.
+        """
+        if not entries:
+            return
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write("".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def restore(self, keep: Callable[[str], bool]) -> List[Dict[str, Any]]:
+        """
+        Prepares the state to continue a run: returns the entries whose source satisfies keep, e.g. the sources
+        completed before the last checkpoint, and drops the others from the file.
+        """
+        self.close()
+        if not os.path.exists(self.path):
+            return []
+        entries, lines = [], []
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    if keep(entry["source"]):
+                        entries.append(entry)
+                        lines.append(line if line.endswith("\n") else line + "\n")
+                except (ValueError, KeyError, TypeError) as e:
+                    warnings.warn(f"Ignoring unreadable line of deduplication state {self.path}: {e}")
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.writelines(lines)
+        os.replace(tmp_path, self.path)
+        return entries
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
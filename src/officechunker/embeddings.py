@@ -0,0 +1,292 @@
+import hashlib
+import os
+import queue
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+from chonkie import BaseEmbeddings, SemanticChunker
+
+
+class _EmbeddingRequest:
+    def __init__(self, texts: List[str]):
+        self.texts = texts
+        self.vectors: List[np.ndarray] = []
+        self.error: Optional[BaseException] = None
+        self.done = threading.Event()
+
+
+class EmbeddingBatcher:
+    """
+    Coalesces embed_batch calls made concurrently by many chunker calls (one per file)
+    into fixed-size batches, runs each batch through the model once and hands every
+    caller back its own vectors.
+
+    Args:
+        model (BaseEmbeddings): the wrapped embedding model
+        batch_size (int): number of texts per model call
+        max_wait (float): seconds to wait for other callers to fill a batch
+    """
+
+    def __init__(self, model: BaseEmbeddings, batch_size: int = 256, max_wait: float = 0.005):
+        if batch_size < 1:
+            raise ValueError("batch_size must be a positive integer.")
+        self.model = model
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        self._queue: "queue.Queue[_EmbeddingRequest]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._thread_lock = threading.Lock()
+
+    def embed(self, texts: List[str]) -> List[np.ndarray]:
+        """
+        Embeds texts as part of a shared batch; blocks until their vectors are ready.
+        """
+        if not texts:
+            return []
+        self._ensure_thread()
+        request = _EmbeddingRequest(texts)
+        self._queue.put(request)
+        request.done.wait()
+        if request.error is not None:
+            raise request.error
+        return request.vectors
+
+    def _ensure_thread(self) -> None:
+        with self._thread_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="officechunker-embedding-batcher", daemon=True)
+                self._thread.start()
+
+    def _collect(self) -> List[_EmbeddingRequest]:
+        requests = [self._queue.get()]
+        count = len(requests[0].texts)
+        deadline = time.monotonic() + self.max_wait
+        while count < self.batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                request = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            requests.append(request)
+            count += len(request.texts)
+        return requests
+
+    def _run(self) -> None:
+        while True:
+            requests = self._collect()
+            texts = [text for request in requests for text in request.texts]
+            try:
+                vectors: List[np.ndarray] = []
+                for start in range(0, len(texts), self.batch_size):
+                    vectors.extend(self.model.embed_batch(texts[start:start + self.batch_size]))
+                offset = 0
+                for request in requests:
+                    request.vectors = list(vectors[offset:offset + len(request.texts)])
+                    offset += len(request.texts)
+            except BaseException as e:
+                for request in requests:
+                    request.error = e
+            for request in requests:
+                request.done.set()
+
+
+class EmbeddingCache:
+    """
+    On-disk embedding cache keyed by a hash of (model, text), stored in SQLite so that it can be
+    shared by worker processes and across runs. Repeated boilerplate such as headers and footers
+    is embedded once.
+
+    Args:
+        cache_dir (str): directory of the cache database
+    """
+
+    FILE_NAME = "embeddings.sqlite3"
+
+    def __init__(self, cache_dir: str):
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, self.FILE_NAME)
+        self._local = threading.local()
+        with self._connection() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, dtype TEXT NOT NULL, vector BLOB NOT NULL)"
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def make_key(namespace: str, text: str) -> str:
+        return hashlib.sha256(f"{namespace}\0{text}".encode("utf-8")).hexdigest()
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, np.ndarray]:
+        found: Dict[str, np.ndarray] = {}
+        conn = self._connection()
+        # Stay well below SQLite's limit on query parameters
+        for start in range(0, len(keys), 500):
+            batch = list(keys[start:start + 500])
+            rows = conn.execute(
+                f"SELECT key, dtype, vector FROM embeddings WHERE key IN ({','.join('?' * len(batch))})", batch
+            ).fetchall()
+            for key, dtype, vector in rows:
+                found[key] = np.frombuffer(vector, dtype=dtype)
+        return found
+
+    def put_many(self, items: Dict[str, np.ndarray]) -> None:
+        if not items:
+            return
+        with self._connection() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, dtype, vector) VALUES (?, ?, ?)",
+                [(key, np.asarray(v).dtype.str, np.ascontiguousarray(v).tobytes()) for key, v in items.items()],
+            )
+
+
+def get_model_namespace(model: BaseEmbeddings) -> Optional[str]:
+    """
+    Returns the cache namespace of an embedding model: its class, model name and vector dimension,
+    or None if the model exposes no name (chonkie's model2vec and sentence-transformers wrappers keep it
+    in model_name_or_path, the API ones in model).
+    """
+    for attribute in ("model_name_or_path", "model"):
+        name = getattr(model, attribute, None)
+        if isinstance(name, str) and name:
+            cls = type(model)
+            return f"{cls.__module__}.{cls.__qualname__}:{name}:{model.dimension}"
+    return None
+
+
+class BatchedEmbeddings(BaseEmbeddings):
+    """
+    Embedding model wrapper that sends embed/embed_batch through a shared EmbeddingBatcher
+    and an optional EmbeddingCache. Everything else is delegated to the wrapped model.
+
+    Args:
+        model (BaseEmbeddings): the wrapped embedding model
+        batch_size (int): number of texts per model call
+        max_wait (float): seconds to wait for other callers to fill a batch
+        cache (EmbeddingCache): optional on-disk cache
+        cache_namespace (str): cache namespace of the model; required with a cache if
+                               get_model_namespace cannot tell the model apart from others
+    """
+
+    def __init__(
+        self,
+        model: BaseEmbeddings,
+        batch_size: int = 256,
+        max_wait: float = 0.005,
+        cache: Optional[EmbeddingCache] = None,
+        cache_namespace: Optional[str] = None,
+    ):
+        super().__init__()
+        self.model = model
+        self.cache = cache
+        self._batcher = EmbeddingBatcher(model, batch_size=batch_size, max_wait=max_wait)
+        self._namespace = cache_namespace or get_model_namespace(model)
+        if cache is not None and self._namespace is None:
+            raise ValueError(
+                f"Cannot cache the embeddings of {type(model).__qualname__}: it exposes no model name, "
+                f"so its vectors could be mixed up with another model's. Set embedding_cache_namespace."
+            )
+
+    def embed(self, text: str) -> np.ndarray:
+        return self.embed_batch([text])[0]
+
+    def embed_batch(self, texts: List[str]) -> List[np.ndarray]:
+        vectors: Dict[str, np.ndarray] = {}
+        keys: Dict[str, str] = {}
+        if self.cache is not None:
+            keys = {text: self.cache.make_key(self._namespace, text) for text in texts}
+            cached = self.cache.get_many(list(set(keys.values())))
+            vectors = {text: cached[key] for text, key in keys.items() if key in cached}
+
+        # Duplicate sentences within a call are embedded once
+        missing = list(dict.fromkeys(text for text in texts if text not in vectors))
+        if missing:
+            new_vectors = dict(zip(missing, self._batcher.embed(missing)))
+            if self.cache is not None:
+                self.cache.put_many({keys[text]: vector for text, vector in new_vectors.items()})
+            vectors.update(new_vectors)
+        return [vectors[text] for text in texts]
+
+    def count_tokens(self, text: str) -> int:
+        return self.model.count_tokens(text)
+
+    def count_tokens_batch(self, texts: List[str]) -> List[int]:
+        return self.model.count_tokens_batch(texts)
+
+    def similarity(self, u: np.ndarray, v: np.ndarray) -> float:
+        return self.model.similarity(u, v)
+
+    @property
+    def dimension(self) -> int:
+        return self.model.dimension
+
+    def get_tokenizer_or_token_counter(self) -> Any:
+        return self.model.get_tokenizer_or_token_counter()
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called for attributes not found on the wrapper, e.g. embed_as_tokens
+        if name == "model":
+            raise AttributeError(name)
+        return getattr(self.model, name)
+
+    def __repr__(self) -> str:
+        return f"BatchedEmbeddings({self.model!r})"
+
+
+# Process-wide settings applied to new semantic/sdpm chunkers, see configure_embedding_batching
+_settings: Dict[str, Any] = {"batch_size": None, "max_wait": 0.005, "cache": None, "cache_namespace": None}
+
+
+def configure_embedding_batching(
+    batch_size: Optional[int] = None,
+    max_wait: float = 0.005,
+    cache_dir: Optional[str] = None,
+    cache_namespace: Optional[str] = None,
+) -> None:
+    """
+    Enables cross-document embedding batching and/or the on-disk embedding cache for
+    chunkers created from now on in this process. Both are disabled when left as None.
+
+    Args:
+        batch_size (int): number of sentences per model call
+        max_wait (float): seconds to wait for other files' sentences to fill a batch
+        cache_dir (str): directory of the on-disk embedding cache
+        cache_namespace (str): cache namespace of the embedding model, see BatchedEmbeddings
+    """
+    _settings["batch_size"] = batch_size
+    _settings["max_wait"] = max_wait
+    _settings["cache"] = EmbeddingCache(cache_dir) if cache_dir is not None else None
+    _settings["cache_namespace"] = cache_namespace
+
+
+def wrap_chunker_embeddings(chunker: Any) -> Any:
+    """
+    Routes the sentence embeddings of a semantic/sdpm chunker through BatchedEmbeddings
+    if batching or caching is configured. Other chunkers are returned unchanged:
+    "late" embeds whole documents token by token, so its embeddings cannot be shared
+    between files or cached per sentence.
+    """
+    if _settings["batch_size"] is None and _settings["cache"] is None:
+        return chunker
+    if not isinstance(chunker, SemanticChunker) or isinstance(chunker.embedding_model, BatchedEmbeddings):
+        return chunker
+    chunker.embedding_model = BatchedEmbeddings(
+        chunker.embedding_model,
+        # Without batching, each call still goes to the model in one piece
+        batch_size=_settings["batch_size"] or 1 << 30,
+        max_wait=_settings["max_wait"] if _settings["batch_size"] is not None else 0,
+        cache=_settings["cache"],
+        cache_namespace=_settings["cache_namespace"],
+    )
+    return chunker
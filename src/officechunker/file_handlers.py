@@ -1,8 +1,33 @@
+import asyncio
+import base64
+import contextlib
+import datetime
+import email.utils
+import hashlib
+import http.client
+import itertools
 import os
+import queue
 import shutil
-from typing import List
+import tempfile
+import threading
+import urllib.parse
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
 from abc import ABC, abstractmethod
 
+from officechunker.utils import file_sha256
+
+T = TypeVar("T")
+
+# Paths per listing page of connectors without a paginated listing API, see BaseFileConnector.iter_pages
+LISTING_PAGE_SIZE = 1000
+
+# Guards the lazy creation of the connectors' async executors
+_executor_lock = threading.Lock()
+
+
 class BaseFileConnector(ABC):
     """_summary_
     Base Format to Connect any File System to Convertor
@@ -10,6 +35,13 @@ class BaseFileConnector(ABC):
     Args:
         ABC (_type_): _description_
     """
+
+    # Whether paths of this connector are not local files, so that sources must be downloaded before
+    # they are parsed and outputs uploaded after they are written
+    is_remote = False
+
+    # Maximum number of blocking calls the async methods run at once
+    async_max_workers = min(32, (os.cpu_count() or 1) + 4)
     
     @abstractmethod
     def copy_tree(self, src: str, dst: str) -> None:
@@ -27,6 +59,166 @@ class BaseFileConnector(ABC):
     def remove_file(self, file_path: str) -> None:
         pass
     
+    def get_file_size(self, file_path: str) -> int:
+        """
+        Returns the size of a file in bytes, used to convert the largest files first.
+        Local paths are stat'ed; remote connectors should override this, else their files keep the listing order.
+        """
+        if self.is_remote:
+            raise NotImplementedError(f"{type(self).__name__} does not report file sizes.")
+        return os.path.getsize(file_path)
+    
+    def get_file_mtime(self, file_path: str) -> float:
+        """
+        Returns the modification time of a file, used by incremental runs to skip unchanged files without hashing them.
+        Local paths are stat'ed; remote connectors must override this to support incremental runs.
+        """
+        if self.is_remote:
+            raise NotImplementedError(f"{type(self).__name__} does not report modification times.")
+        return os.path.getmtime(file_path)
+    
+    def get_file_hash(self, file_path: str) -> str:
+        """
+        Returns a digest of the file content, used to detect changed and duplicate files.
+        Local paths are hashed in place, remote files through a temporary download.
+        """
+        if not self.is_remote:
+            return file_sha256(file_path)
+        with tempfile.TemporaryDirectory(prefix="officechunker-hash-") as tmp_dir:
+            local_path = os.path.join(tmp_dir, "file")
+            self.download(file_path, local_path)
+            return file_sha256(local_path)
+    
+    def make_dirs(self, path: str) -> None:
+        """
+        Creates the directory and any missing parents; does nothing if it already exists.
+        Remote connectors have nothing to create by default, as in object stores.
+        """
+        if not self.is_remote:
+            os.makedirs(path, exist_ok=True)
+    
+    def map_path(self, file_path: str, src_root: str, dst_root: str) -> str:
+        """
+        Maps a path under src_root to the same relative location under dst_root.
+        """
+        return os.path.join(dst_root, os.path.relpath(file_path, src_root))
+    
+    def iter_files(self, folder_path: str) -> Iterator[str]:
+        """
+        Lazily yields file paths under folder_path.
+        Connectors that can page through large listings should override this.
+        """
+        return iter(self.list_files(folder_path))
+
+    def iter_pages(self, folder_path: str) -> Iterator[List[str]]:
+        """
+        Yields the file paths under folder_path one listing page at a time, see aiter_files.
+        Connectors with a paginated listing API should override this; by default, iter_files is cut
+        into pages of LISTING_PAGE_SIZE paths.
+        """
+        files = self.iter_files(folder_path)
+        while True:
+            page = list(itertools.islice(files, LISTING_PAGE_SIZE))
+            if not page:
+                return
+            yield page
+
+    def is_within(self, file_path: str, folder_path: str) -> bool:
+        """
+        Whether file_path lies in folder_path or one of its subfolders.
+        """
+        folder = os.path.abspath(folder_path)
+        return os.path.commonpath([os.path.abspath(file_path), folder]) == folder
+
+    def download(self, file_path: str, local_path: str) -> None:
+        """
+        Copies a file to a local path, streaming its content.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support downloads.")
+
+    def upload(self, local_path: str, file_path: str) -> None:
+        """
+        Copies a local file to file_path, streaming its content; missing parent folders are created.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support uploads.")
+
+    def close(self) -> None:
+        """
+        Releases pooled connections and the threads of the async methods.
+        """
+        executor = self.__dict__.pop("_async_executor", None)
+        if executor is not None:
+            executor.shutdown()
+
+    # Async interface: the blocking methods run on a pool of async_max_workers threads per connector,
+    # so that listing pages, stat calls, downloads and uploads of many files overlap.
+
+    def _get_async_executor(self) -> ThreadPoolExecutor:
+        executor = self.__dict__.get("_async_executor")
+        if executor is None:
+            with _executor_lock:
+                executor = self.__dict__.get("_async_executor")
+                if executor is None:
+                    executor = self.__dict__["_async_executor"] = ThreadPoolExecutor(
+                        max_workers=self.async_max_workers, thread_name_prefix="officechunker-connector"
+                    )
+        return executor
+
+    async def _run_async(self, fn: Callable[..., T], *args: Any) -> T:
+        """
+        Runs a blocking call on the async executor. A call that has already started when the awaiting task is
+        cancelled is waited for before the cancellation propagates, so that e.g. no download still writes into
+        a folder its caller removes next.
+        """
+        future = self._get_async_executor().submit(fn, *args)
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            # Cancelling the awaiting task cancels the call if it had not started yet
+            if not future.cancelled():
+                with contextlib.suppress(Exception):
+                    await asyncio.wrap_future(future)
+            raise
+
+    async def aiter_files(self, folder_path: str) -> AsyncIterator[str]:
+        """
+        Async version of iter_files: yields the paths of one listing page (see iter_pages)
+        while the next page is requested.
+        """
+        pages = self.iter_pages(folder_path)
+        next_page = asyncio.ensure_future(self._run_async(next, pages, None))
+        try:
+            while True:
+                page = await next_page
+                if page is None:
+                    return
+                next_page = asyncio.ensure_future(self._run_async(next, pages, None))
+                for file_path in page:
+                    yield file_path
+        finally:
+            next_page.cancel()
+
+    async def aget_file_size(self, file_path: str) -> int:
+        return await self._run_async(self.get_file_size, file_path)
+
+    async def aget_file_mtime(self, file_path: str) -> float:
+        return await self._run_async(self.get_file_mtime, file_path)
+
+    async def aget_file_hash(self, file_path: str) -> str:
+        return await self._run_async(self.get_file_hash, file_path)
+
+    async def adownload(self, file_path: str, local_path: str) -> None:
+        await self._run_async(self.download, file_path, local_path)
+
+    async def aupload(self, local_path: str, file_path: str) -> None:
+        await self._run_async(self.upload, local_path, file_path)
+
+    async def aremove_file(self, file_path: str) -> None:
+        await self._run_async(self.remove_file, file_path)
+
+    async def aclose(self) -> None:
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
+    
     
     
 class LocalFileConnector(BaseFileConnector):
@@ -45,13 +237,307 @@ class LocalFileConnector(BaseFileConnector):
         
         
     def list_files(self,folder_path:str) -> List[str]:
-        file_list = []
+        return list(self.iter_files(folder_path))
+    
+    def iter_files(self, folder_path: str) -> Iterator[str]:
         for root, _, files in os.walk(folder_path):
             for f in files:
-                file_list.append(os.path.join(root,f))
-        return file_list
+                yield os.path.join(root,f)
+
+    def iter_pages(self, folder_path: str) -> Iterator[List[str]]:
+        # One page per directory, so that a page never waits for the next directory to be read
+        for root, _, files in os.walk(folder_path):
+            for i in range(0, len(files), LISTING_PAGE_SIZE):
+                yield [os.path.join(root, f) for f in files[i:i + LISTING_PAGE_SIZE]]
     
     def remove_file(self,file_path: str) -> None:
         os.remove(file_path)
+    
+    def download(self, file_path: str, local_path: str) -> None:
+        shutil.copyfile(file_path, local_path)
+
+    def upload(self, local_path: str, file_path: str) -> None:
+        os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+        shutil.copyfile(local_path, file_path)
+        
         
-        
\ No newline at end of file
+class _ConnectionPool:
+    """
+    Thread-safe pool of keep-alive HTTP(S) connections to one host, with at most max_connections open at once.
+    """
+
+    def __init__(self, endpoint_url: str, max_connections: int, timeout: Optional[float]):
+        parsed = urllib.parse.urlsplit(endpoint_url)
+        if parsed.scheme not in ("http", "https"):
+            raise ValueError(f"endpoint_url must be an http:// or https:// URL, got '{endpoint_url}'")
+        self._connection_class = http.client.HTTPSConnection if parsed.scheme == "https" else http.client.HTTPConnection
+        self._netloc = parsed.netloc
+        self._timeout = timeout
+        self._idle: "queue.LifoQueue[http.client.HTTPConnection]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(max_connections)
+
+    @contextlib.contextmanager
+    def connection(self) -> Iterator[http.client.HTTPConnection]:
+        """
+        Lends a connection, blocking while max_connections are in use. A connection is only returned
+        to the pool if the block completes; otherwise it may hold an unread response and is closed.
+        """
+        with self._slots:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = self._connection_class(self._netloc, timeout=self._timeout, blocksize=1 << 16)
+            try:
+                yield conn
+            except BaseException:
+                conn.close()
+                raise
+            self._idle.put(conn)
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+class HttpFileConnector(BaseFileConnector):
+    """
+    Connector for an S3-style object store over HTTP(S), using path-style URLs ('<endpoint_url>/<bucket>/<key>').
+
+    Folders are key prefixes and files are object keys, e.g. src_folder="reports/2024" lists every key under
+    'reports/2024/'. Listings are paginated (ListObjectsV2) and remember each object's size and modification
+    time, so size ordering and incremental runs need no extra requests. Requests share a pool of keep-alive
+    connections, downloads and uploads are streamed, and the async methods run on max_connections threads,
+    with aiter_files requesting the next listing page while the current one is consumed and aget_file_size /
+    aget_file_mtime answering listed keys without a request. Requests are not signed: use an endpoint that accepts
+    the given headers,
+    e.g. a gateway with a bearer token, or the bundled officechunker.object_store server for tests.
+
+    Args:
+        endpoint_url (str): base URL of the store, e.g. "http://127.0.0.1:9000"
+        bucket (str): bucket holding the files
+        max_connections (int): maximum number of concurrent requests (default: 8)
+        page_size (int): keys requested per listing page (default: 1000)
+        headers (dict): extra headers sent with every request, e.g. {"Authorization": "Bearer ..."}
+        timeout (float): socket timeout in seconds (default: 60)
+    """
+
+    is_remote = True
+
+    _NAMESPACE = "{http://s3.amazonaws.com/doc/2006-03-01/}"
+
+    def __init__(
+        self,
+        endpoint_url: str,
+        bucket: str,
+        max_connections: int = 8,
+        page_size: int = 1000,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = 60.0,
+    ):
+        if max_connections < 1:
+            raise ValueError("max_connections must be a positive integer.")
+        if page_size < 1:
+            raise ValueError("page_size must be a positive integer.")
+        self.endpoint_url = endpoint_url.rstrip("/")
+        self.bucket = bucket
+        self.max_connections = max_connections
+        # Each async call holds at most one connection
+        self.async_max_workers = max_connections
+        self.page_size = page_size
+        self.headers = dict(headers) if headers is not None else {}
+        self._base_path = urllib.parse.urlsplit(self.endpoint_url).path
+        self._pool = _ConnectionPool(self.endpoint_url, max_connections, timeout)
+        # (size, mtime) of listed keys
+        self._stats: Dict[str, Tuple[int, float]] = {}
+        self._stats_lock = threading.Lock()
+
+    # Requests
+
+    def _url(self, key: str = "", query: Optional[Dict[str, Any]] = None) -> str:
+        url = f"{self._base_path}/{urllib.parse.quote(self.bucket, safe='')}"
+        if key:
+            url += "/" + urllib.parse.quote(self._to_key(key), safe="/~")
+        if query:
+            url += "?" + urllib.parse.urlencode(query)
+        return url
+
+    @staticmethod
+    def _to_key(path: str) -> str:
+        return path.replace(os.sep, "/").strip("/")
+
+    @contextlib.contextmanager
+    def _request(
+        self,
+        method: str,
+        url: str,
+        body: Any = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Iterator[http.client.HTTPResponse]:
+        """
+        Sends a request on a pooled connection and yields the response, raising FileNotFoundError for 404
+        and OSError for other error statuses. The response must be read completely inside the block.
+        """
+        all_headers = {**self.headers, **(headers or {})}
+        with self._pool.connection() as conn:
+            for attempt in range(2):
+                try:
+                    conn.request(method, url, body=body, headers=all_headers)
+                    response = conn.getresponse()
+                    break
+                except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                    # The server may have closed an idle keep-alive connection: retry once on a new one
+                    conn.close()
+                    if attempt or (body is not None and not hasattr(body, "seek")):
+                        raise
+                    if body is not None:
+                        body.seek(0)
+            if response.status >= 300:
+                detail = response.read()[:200].decode("utf-8", "replace")
+                error = FileNotFoundError if response.status == 404 else OSError
+                raise error(f"{method} {url} failed with {response.status} {response.reason}: {detail}")
+            yield response
+            response.read()
+
+    def _head(self, file_path: str, headers: Optional[Dict[str, str]] = None) -> http.client.HTTPMessage:
+        with self._request("HEAD", self._url(file_path), headers=headers) as response:
+            return response.headers
+
+    # Listing
+
+    def iter_pages(self, folder_path: str) -> Iterator[List[str]]:
+        """
+        Yields the keys under folder_path one listing page (page_size keys) at a time, recording their sizes and mtimes.
+        """
+        prefix = self._to_key(folder_path)
+        query: Dict[str, Any] = {"list-type": 2, "max-keys": self.page_size}
+        if prefix:
+            query["prefix"] = prefix + "/"
+        while True:
+            with self._request("GET", self._url(query=query)) as response:
+                root = ET.fromstring(response.read())
+            keys = []
+            for contents in root.iter(f"{self._NAMESPACE}Contents"):
+                key = contents.findtext(f"{self._NAMESPACE}Key")
+                if key.endswith("/"):
+                    # Folder placeholder object
+                    continue
+                mtime = datetime.datetime.fromisoformat(
+                    contents.findtext(f"{self._NAMESPACE}LastModified").replace("Z", "+00:00")
+                ).timestamp()
+                with self._stats_lock:
+                    self._stats[key] = (int(contents.findtext(f"{self._NAMESPACE}Size")), mtime)
+                keys.append(key)
+            yield keys
+            token = root.findtext(f"{self._NAMESPACE}NextContinuationToken")
+            if root.findtext(f"{self._NAMESPACE}IsTruncated") != "true" or not token:
+                return
+            query["continuation-token"] = token
+
+    def list_files(self, folder_path: str) -> List[str]:
+        return list(self.iter_files(folder_path))
+
+    def is_within(self, file_path: str, folder_path: str) -> bool:
+        # Folders are key prefixes; the empty prefix is the whole bucket
+        prefix = self._to_key(folder_path)
+        key = self._to_key(file_path)
+        return not prefix or key == prefix or key.startswith(prefix + "/")
+
+    def iter_files(self, folder_path: str) -> Iterator[str]:
+        for keys in self.iter_pages(folder_path):
+            yield from keys
+
+    # Metadata
+
+    def _listed_stat(self, file_path: str) -> Optional[Tuple[int, float]]:
+        with self._stats_lock:
+            return self._stats.get(self._to_key(file_path))
+
+    def _stat(self, file_path: str) -> Tuple[int, float]:
+        key = self._to_key(file_path)
+        stat = self._listed_stat(key)
+        if stat is None:
+            headers = self._head(key)
+            stat = (
+                int(headers.get("Content-Length", 0)),
+                email.utils.parsedate_to_datetime(headers["Last-Modified"]).timestamp(),
+            )
+        return stat
+
+    def get_file_size(self, file_path: str) -> int:
+        return self._stat(file_path)[0]
+
+    def get_file_mtime(self, file_path: str) -> float:
+        return self._stat(file_path)[1]
+
+    async def aget_file_size(self, file_path: str) -> int:
+        # Listed keys need neither a request nor a thread
+        stat = self._listed_stat(file_path)
+        return stat[0] if stat is not None else await super().aget_file_size(file_path)
+
+    async def aget_file_mtime(self, file_path: str) -> float:
+        stat = self._listed_stat(file_path)
+        return stat[1] if stat is not None else await super().aget_file_mtime(file_path)
+
+    def get_file_hash(self, file_path: str) -> str:
+        # Use the SHA-256 checksum stored by the server if there is one, else stream the content
+        headers = self._head(file_path, headers={"x-amz-checksum-mode": "ENABLED"})
+        checksum = headers.get("x-amz-checksum-sha256")
+        if checksum:
+            return base64.b64decode(checksum).hex()
+        digest = hashlib.sha256()
+        for block in self.iter_bytes(file_path):
+            digest.update(block)
+        return digest.hexdigest()
+
+    # Content
+
+    def iter_bytes(self, file_path: str, block_size: int = 1 << 20) -> Iterator[bytes]:
+        """
+        Streams the content of a file in blocks.
+        """
+        with self._request("GET", self._url(file_path)) as response:
+            for block in iter(lambda: response.read(block_size), b""):
+                yield block
+
+    def download(self, file_path: str, local_path: str) -> None:
+        # Written under a temporary name, so that an interrupted download never looks complete
+        tmp_path = local_path + ".part"
+        try:
+            with open(tmp_path, "wb") as f:
+                for block in self.iter_bytes(file_path):
+                    f.write(block)
+            os.replace(tmp_path, local_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def upload(self, local_path: str, file_path: str) -> None:
+        size = os.path.getsize(local_path)
+        with open(local_path, "rb") as f:
+            # http.client sends the file in blocks, so it is never held in memory
+            with self._request("PUT", self._url(file_path), body=f, headers={"Content-Length": str(size)}):
+                pass
+
+    def remove_file(self, file_path: str) -> None:
+        with self._request("DELETE", self._url(file_path)):
+            pass
+        with self._stats_lock:
+            self._stats.pop(self._to_key(file_path), None)
+
+    def copy_tree(self, src: str, dst: str) -> None:
+        # Server-side copies: the content does not pass through this machine
+        for key in self.iter_files(src):
+            copy_source = urllib.parse.quote(f"/{self.bucket}/{key}", safe="/~")
+            with self._request("PUT", self._url(self.map_path(key, src, dst)), headers={"x-amz-copy-source": copy_source}):
+                pass
+
+    def remove_tree(self, path: str) -> None:
+        for key in list(self.iter_files(path)):
+            self.remove_file(key)
+
+    def close(self) -> None:
+        super().close()
+        self._pool.close()
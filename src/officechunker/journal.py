@@ -0,0 +1,93 @@
+import json
+import os
+import warnings
+from typing import Any, Dict, List, Optional, Set
+
+
+JOURNAL_FILE_NAME = ".officechunker_journal.jsonl"
+
+
+class CheckpointJournal:
+    """
+    Append-only record of the files a run has completed, used to resume an interrupted run.
+
+    Each line is one checkpoint:
+        {"sources": [<completed source paths>, ...], "sink": <state returned by the sink's checkpoint()>}
+
+    A checkpoint is only appended after the sink made the records of those sources durable,
+    so a crash between checkpoints loses at most the files completed since the last one.
+    A torn last line, e.g. from a crash while appending, is ignored.
+
+    Args:
+        path (str): path of the journal file
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.completed: Set[str] = set()
+        self.sink_state: Optional[Dict[str, Any]] = None
+        self._file = None
+
+    @classmethod
+    def load(cls, path: str) -> "CheckpointJournal":
+        """
+        Loads the journal at path; a missing journal gives an empty one.
+        """
+        journal = cls(path)
+        if not os.path.exists(path):
+            return journal
+        with open(path, "r", encoding="utf-8") as f:
+            for line_number, line in enumerate(f, start=1):
+                try:
+                    entry = json.loads(line)
+                    journal.completed.update(entry["sources"])
+                    journal.sink_state = entry.get("sink")
+                except (ValueError, KeyError, TypeError) as e:
+                    warnings.warn(f"Ignoring unreadable line {line_number} of journal {path}: {e}")
+                    break
+        return journal
+
+    def reset(self) -> None:
+        """
+        Forgets all checkpoints, so that the run starts from scratch.
+        """
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        self.completed = set()
+        self.sink_state = None
+
+    def record(self, sources: List[str], sink_state: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Appends a checkpoint and forces it to disk.
+        """
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8")
+            # Drop a torn last line left by a crash, so that the new checkpoint starts on its own line
+            self._truncate_torn_line()
+        self._file.write(json.dumps({"sources": sources, "sink": sink_state}, ensure_ascii=False) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.completed.update(sources)
+        self.sink_state = sink_state
+
+    def _truncate_torn_line(self) -> None:
+        size = os.path.getsize(self.path)
+        if size == 0:
+            return
+        with open(self.path, "rb") as f:
+            data = f.read()
+        end = data.rfind(b"\n") + 1
+        if end != size:
+            self._file.truncate(end)
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __contains__(self, source: str) -> bool:
+        return source in self.completed
+
+    def __len__(self) -> int:
+        return len(self.completed)
@@ -0,0 +1,89 @@
+import json
+import os
+import warnings
+from typing import Any, Dict, Iterator, Optional
+
+from officechunker.chunkers import DEFAULT_PARAMS
+
+
+MANIFEST_FILE_NAME = ".officechunker_manifest.json"
+MANIFEST_VERSION = 1
+
+
+def manifest_chunker_config(chunker_type: str, chunker_params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Returns the JSON form of a chunker configuration as recorded in the manifest.
+    Params are merged with DEFAULT_PARAMS, so a change of defaults also triggers re-conversion.
+    """
+    params = DEFAULT_PARAMS.get(chunker_type, {}).copy()
+    params.update(chunker_params)
+    # Round-trip through JSON so that it compares equal to what is loaded back from disk
+    return json.loads(json.dumps({"type": chunker_type, "params": params}, sort_keys=True, default=repr))
+
+
+class Manifest:
+    """
+    Record of the files converted into a destination folder, used for incremental runs.
+
+    Entries are keyed by the source path relative to the source folder:
+        {
+            "hash": <sha256 of the source content>,
+            "size": <bytes>,
+            "mtime": <modification time>,
+            "chunker": {"type": <chunker_type>, "params": <params>},
+            "outputs": [<output paths relative to the destination folder>, ...]
+        }
+
+    Args:
+        path (str): path of the manifest file
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.entries: Dict[str, Dict[str, Any]] = {}
+
+    @classmethod
+    def load(cls, path: str) -> "Manifest":
+        """
+        Loads the manifest at path. A missing or unreadable manifest gives an empty one,
+        which makes the next run convert everything again.
+        """
+        manifest = cls(path)
+        if not os.path.exists(path):
+            return manifest
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != MANIFEST_VERSION:
+                raise ValueError(f"unsupported manifest version {data.get('version')}")
+            manifest.entries = data["files"]
+        except (OSError, ValueError, KeyError, AttributeError) as e:
+            warnings.warn(f"Ignoring unreadable manifest {path}: {e}")
+        return manifest
+
+    def save(self) -> None:
+        """
+        Writes the manifest atomically, so an interrupted save never leaves a truncated file.
+        """
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": MANIFEST_VERSION, "files": self.entries}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def get(self, rel_path: str) -> Optional[Dict[str, Any]]:
+        return self.entries.get(rel_path)
+
+    def set(self, rel_path: str, entry: Dict[str, Any]) -> None:
+        self.entries[rel_path] = entry
+
+    def remove(self, rel_path: str) -> Optional[Dict[str, Any]]:
+        return self.entries.pop(rel_path, None)
+
+    def __contains__(self, rel_path: str) -> bool:
+        return rel_path in self.entries
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self.entries))
+
+    def __len__(self) -> int:
+        return len(self.entries)
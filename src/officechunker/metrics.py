@@ -0,0 +1,158 @@
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+from officechunker.utils import get_peak_rss_bytes
+
+
+# Per-file stages, in pipeline order
+STAGES = ("copy", "download", "parse", "md_write", "chunk", "dedup", "chunk_write", "upload", "cleanup")
+
+PERCENTILES = (50, 90, 99)
+
+
+def new_file_metrics(source: str) -> Dict[str, Any]:
+    """
+    Returns an empty metrics record for one source file, filled in while it is converted.
+    """
+    return {
+        "source": source,
+        "ext": os.path.splitext(source)[1].lower(),
+        "status": "converted",
+        "error": None,
+        "bytes_in": 0,
+        "chars_out": 0,
+        "chunks": 0,
+        "duplicate_chunks": 0,
+        "parse_cache_hits": 0,
+        "worker_peak_rss": 0,
+        "stages": {},
+        "total_seconds": 0.0,
+    }
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    """
+    Returns the q-th percentile (0-100) of already sorted values, interpolating between ranks.
+    """
+    if not sorted_values:
+        return 0.0
+    rank = (len(sorted_values) - 1) * q / 100
+    low = int(rank)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (rank - low)
+
+
+def _summarize(values: List[float]) -> Dict[str, float]:
+    values = sorted(values)
+    summary = {f"p{q}": percentile(values, q) for q in PERCENTILES}
+    summary["max"] = values[-1] if values else 0.0
+    summary["total"] = sum(values)
+    return summary
+
+
+class MetricsHook:
+    """
+    Base Format to forward conversion metrics to an external metrics system.
+    Override the methods you need; both are called from the Converter's event loop,
+    so they should return quickly.
+    """
+
+    def on_file(self, file_metrics: Dict[str, Any]) -> None:
+        """
+        Called once per source file with the record built by new_file_metrics.
+        """
+        pass
+
+    def on_run_end(self, report: Dict[str, Any]) -> None:
+        """
+        Called at the end of a run with the same dict that is written by RunReport.save.
+        """
+        pass
+
+
+class RunReport:
+    """
+    Collects per-file metrics of a run and aggregates them per extension.
+
+    Args:
+        keep_files (bool): whether to keep every per-file record in the report
+    """
+
+    def __init__(self, keep_files: bool = True):
+        self.keep_files = keep_files
+        self.files: List[Dict[str, Any]] = []
+        self.run_stages: Dict[str, float] = {}
+        self._by_ext: Dict[str, Dict[str, Any]] = {}
+        self._worker_peak_rss = 0
+        self._started = time.time()
+        self._start_counter = time.perf_counter()
+
+    def add(self, file_metrics: Dict[str, Any]) -> None:
+        if self.keep_files:
+            self.files.append(file_metrics)
+        self._worker_peak_rss = max(self._worker_peak_rss, file_metrics["worker_peak_rss"])
+
+        ext = self._by_ext.setdefault(file_metrics["ext"], {
+            "files": 0, "converted": 0, "skipped": 0, "duplicates": 0, "errors": 0,
+            "bytes_in": 0, "chars_out": 0, "chunks": 0, "duplicate_chunks": 0, "parse_cache_hits": 0,
+            "stages": {stage: [] for stage in STAGES}, "total_seconds": [],
+        })
+        ext["files"] += 1
+        ext[{"error": "errors", "duplicate": "duplicates"}.get(file_metrics["status"], file_metrics["status"])] += 1
+        if file_metrics["status"] != "converted":
+            return
+        ext["bytes_in"] += file_metrics["bytes_in"]
+        ext["chars_out"] += file_metrics["chars_out"]
+        ext["chunks"] += file_metrics["chunks"]
+        ext["duplicate_chunks"] += file_metrics["duplicate_chunks"]
+        ext["parse_cache_hits"] += file_metrics["parse_cache_hits"]
+        for stage, seconds in file_metrics["stages"].items():
+            ext["stages"][stage].append(seconds)
+        ext["total_seconds"].append(file_metrics["total_seconds"])
+
+    def add_run_stage(self, stage: str, seconds: float) -> None:
+        """
+        Records a stage that runs once for the whole run, e.g. copying the source tree.
+        """
+        self.run_stages[stage] = self.run_stages.get(stage, 0.0) + seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        wall_seconds = time.perf_counter() - self._start_counter
+        by_ext = {}
+        for ext, data in sorted(self._by_ext.items()):
+            by_ext[ext] = {
+                "files": data["files"],
+                "converted": data["converted"],
+                "skipped": data["skipped"],
+                "duplicates": data["duplicates"],
+                "errors": data["errors"],
+                "bytes_in": data["bytes_in"],
+                "chars_out": data["chars_out"],
+                "chunks": data["chunks"],
+                "duplicate_chunks": data["duplicate_chunks"],
+                "parse_cache_hits": data["parse_cache_hits"],
+                "total_seconds": _summarize(data["total_seconds"]),
+                "stages": {stage: _summarize(values) for stage, values in data["stages"].items() if values},
+            }
+        totals = {key: sum(data[key] for data in by_ext.values())
+                  for key in ("files", "converted", "skipped", "duplicates", "errors",
+                              "bytes_in", "chars_out", "chunks", "duplicate_chunks", "parse_cache_hits")}
+        report = {
+            "started_at": self._started,
+            "wall_seconds": wall_seconds,
+            "files_per_second": totals["converted"] / wall_seconds if wall_seconds > 0 else 0.0,
+            "bytes_per_second": totals["bytes_in"] / wall_seconds if wall_seconds > 0 else 0.0,
+            "peak_rss": {"main": get_peak_rss_bytes(), "workers": self._worker_peak_rss},
+            "run_stages": self.run_stages,
+            **totals,
+            "by_extension": by_ext,
+        }
+        if self.keep_files:
+            report["files_detail"] = self.files
+        return report
+
+    def save(self, path: str, report: Optional[Dict[str, Any]] = None) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report if report is not None else self.to_dict(), f, indent=2, ensure_ascii=False)
@@ -0,0 +1,289 @@
+import argparse
+import base64
+import datetime
+import email.utils
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+import urllib.parse
+import xml.etree.ElementTree as ET
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator, Optional, Tuple
+
+
+_NAMESPACE = "http://s3.amazonaws.com/doc/2006-03-01/"
+
+
+class _ObjectStoreHandler(BaseHTTPRequestHandler):
+    """
+    Serves the directories under server.root as buckets: '/<bucket>/<key>' is the file '<root>/<bucket>/<key>'.
+    """
+
+    protocol_version = "HTTP/1.1"
+    server: "_ObjectStoreHTTPServer"
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+    # Helpers
+
+    def _split_path(self) -> Tuple[str, str, dict]:
+        parsed = urllib.parse.urlsplit(self.path)
+        bucket, _, key = urllib.parse.unquote(parsed.path).lstrip("/").partition("/")
+        return bucket, key, urllib.parse.parse_qs(parsed.query)
+
+    def _bucket_path(self, bucket: str) -> Optional[str]:
+        if not bucket or bucket in (".", "..") or "/" in bucket:
+            return None
+        return os.path.join(self.server.root, bucket)
+
+    def _local_path(self, bucket: str, key: str) -> Optional[str]:
+        """
+        Returns the file of a key, or None for names that would escape the bucket.
+        """
+        bucket_path = self._bucket_path(bucket)
+        parts = key.split("/")
+        if bucket_path is None or any(part in ("", ".", "..") for part in parts):
+            return None
+        return os.path.join(bucket_path, *parts)
+
+    def _send(self, status: int, body: bytes = b"", content_type: str = "application/xml", headers: Optional[dict] = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def _send_error(self, status: int, code: str) -> None:
+        error = ET.Element("Error")
+        ET.SubElement(error, "Code").text = code
+        ET.SubElement(error, "Resource").text = self.path
+        self._send(status, ET.tostring(error, encoding="utf-8", xml_declaration=True))
+
+    def _read_body(self, out) -> None:
+        """
+        Copies the request body to out, with a Content-Length or chunked transfer encoding.
+        """
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            while True:
+                size = int(self.rfile.readline().split(b";")[0], 16)
+                if size == 0:
+                    # Optional trailers end with an empty line
+                    while self.rfile.readline() not in (b"\r\n", b"\n", b""):
+                        pass
+                    return
+                out.write(self.rfile.read(size))
+                self.rfile.readline()
+        remaining = int(self.headers.get("Content-Length", 0))
+        while remaining > 0:
+            block = self.rfile.read(min(remaining, 1 << 16))
+            if not block:
+                raise ConnectionError("Request body ended early")
+            out.write(block)
+            remaining -= len(block)
+
+    # Requests
+
+    def do_GET(self) -> None:
+        bucket, key, query = self._split_path()
+        if not key:
+            self._list(bucket, query)
+            return
+        path = self._local_path(bucket, key)
+        if path is None or not os.path.isfile(path):
+            self._send_error(404, "NoSuchKey")
+            return
+        with open(path, "rb") as f:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/octet-stream")
+            self.send_header("Content-Length", str(os.fstat(f.fileno()).st_size))
+            self.send_header("Last-Modified", email.utils.formatdate(os.fstat(f.fileno()).st_mtime, usegmt=True))
+            self.end_headers()
+            shutil.copyfileobj(f, self.wfile, 1 << 16)
+
+    def do_HEAD(self) -> None:
+        bucket, key, _ = self._split_path()
+        path = self._local_path(bucket, key) if key else None
+        if path is None or not os.path.isfile(path):
+            self._send_error(404, "NoSuchKey")
+            return
+        stat = os.stat(path)
+        headers = {"Last-Modified": email.utils.formatdate(stat.st_mtime, usegmt=True)}
+        if self.headers.get("x-amz-checksum-mode", "").upper() == "ENABLED":
+            digest = hashlib.sha256()
+            with open(path, "rb") as f:
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(block)
+            headers["x-amz-checksum-sha256"] = base64.b64encode(digest.digest()).decode("ascii")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(stat.st_size))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+
+    def do_PUT(self) -> None:
+        bucket, key, _ = self._split_path()
+        path = self._local_path(bucket, key) if key else None
+        if path is None:
+            self._send_error(400, "InvalidKey")
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Written to a temporary file first, so that readers never see a partial object
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".upload-")
+        try:
+            with os.fdopen(fd, "wb") as out:
+                copy_source = self.headers.get("x-amz-copy-source")
+                if copy_source is not None:
+                    self._read_body(out)
+                    source_bucket, _, source_key = urllib.parse.unquote(copy_source).lstrip("/").partition("/")
+                    source_path = self._local_path(source_bucket, source_key)
+                    if source_path is None or not os.path.isfile(source_path):
+                        self._send_error(404, "NoSuchKey")
+                        return
+                    with open(source_path, "rb") as f:
+                        shutil.copyfileobj(f, out, 1 << 16)
+                else:
+                    self._read_body(out)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        self._send(200)
+
+    def do_DELETE(self) -> None:
+        bucket, key, _ = self._split_path()
+        path = self._local_path(bucket, key) if key else None
+        if path is None:
+            self._send_error(400, "InvalidKey")
+            return
+        if os.path.isfile(path):
+            os.remove(path)
+        # Deleting a missing key succeeds, as in S3
+        self._send(204)
+
+    def _list(self, bucket: str, query: dict) -> None:
+        """
+        ListObjectsV2: keys under prefix in lexicographic order, max-keys at a time.
+        The continuation token is the last key of the previous page.
+        """
+        bucket_path = self._bucket_path(bucket)
+        if bucket_path is None or not os.path.isdir(bucket_path):
+            self._send_error(404, "NoSuchBucket")
+            return
+        prefix = query.get("prefix", [""])[0]
+        max_keys = int(query.get("max-keys", ["1000"])[0])
+        token = query.get("continuation-token", [None])[0]
+        start_after = base64.urlsafe_b64decode(token).decode("utf-8") if token else query.get("start-after", [""])[0]
+
+        keys = sorted(key for key in self._iter_keys(bucket) if key.startswith(prefix) and key > start_after)
+        page, truncated = keys[:max_keys], len(keys) > max_keys
+
+        result = ET.Element("ListBucketResult", xmlns=_NAMESPACE)
+        ET.SubElement(result, "Name").text = bucket
+        ET.SubElement(result, "Prefix").text = prefix
+        ET.SubElement(result, "KeyCount").text = str(len(page))
+        ET.SubElement(result, "MaxKeys").text = str(max_keys)
+        ET.SubElement(result, "IsTruncated").text = "true" if truncated else "false"
+        for key in page:
+            stat = os.stat(self._local_path(bucket, key))
+            contents = ET.SubElement(result, "Contents")
+            ET.SubElement(contents, "Key").text = key
+            ET.SubElement(contents, "LastModified").text = (
+                datetime.datetime.fromtimestamp(stat.st_mtime, datetime.timezone.utc).isoformat(timespec="microseconds")
+                .replace("+00:00", "Z")
+            )
+            ET.SubElement(contents, "Size").text = str(stat.st_size)
+        if truncated:
+            ET.SubElement(result, "NextContinuationToken").text = base64.urlsafe_b64encode(page[-1].encode("utf-8")).decode("ascii")
+        self._send(200, ET.tostring(result, encoding="utf-8", xml_declaration=True))
+
+    def _iter_keys(self, bucket: str) -> Iterator[str]:
+        bucket_root = self._bucket_path(bucket)
+        for root, _, names in os.walk(bucket_root):
+            for name in names:
+                if name.startswith(".upload-"):
+                    continue
+                yield os.path.relpath(os.path.join(root, name), bucket_root).replace(os.sep, "/")
+
+
+class _ObjectStoreHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], root: str):
+        self.root = root
+        super().__init__(address, _ObjectStoreHandler)
+
+
+class ObjectStoreServer:
+    """
+    Minimal S3-style object store over HTTP, serving the directories under root as buckets.
+    A local stand-in for remote storage in tests and development, to be used with HttpFileConnector.
+
+    Supports paginated ListObjectsV2 listings, GET/HEAD/DELETE of objects, PUT uploads (with Content-Length
+    or chunked transfer encoding) and server-side copies (x-amz-copy-source). HEAD returns the SHA-256
+    checksum with x-amz-checksum-mode: ENABLED. There is no authentication: bind it to localhost only.
+
+    Args:
+        root (str): directory whose subdirectories are the buckets
+        host (str): interface to listen on (default: 127.0.0.1)
+        port (int): port to listen on; 0 picks a free port (default: 0)
+    """
+
+    def __init__(self, root: str, host: str = "127.0.0.1", port: int = 0):
+        self.root = os.path.abspath(root)
+        self._server = _ObjectStoreHTTPServer((host, port), self.root)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "ObjectStoreServer":
+        """
+        Serves requests in a background thread.
+        """
+        self._thread = threading.Thread(target=self._server.serve_forever, name="officechunker-object-store", daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        self._server.serve_forever()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "ObjectStoreServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve the subdirectories of a folder as buckets of an S3-style object store.")
+    parser.add_argument("root", type=str, help="Folder whose subdirectories are the buckets.")
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="Interface to listen on (default: 127.0.0.1).")
+    parser.add_argument("--port", type=int, default=9000, help="Port to listen on (default: 9000).")
+    args = parser.parse_args()
+
+    server = ObjectStoreServer(args.root, args.host, args.port)
+    print(f"Serving {server.root} at {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
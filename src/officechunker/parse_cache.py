@@ -0,0 +1,182 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import warnings
+import zlib
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from officechunker.utils import file_sha256
+
+
+# Bump when process.py changes the markdown it produces for the same parser version, so that older entries
+# are no longer hit (and are evicted over time)
+PARSE_FORMAT_VERSION = 1
+
+
+def get_parser_version() -> str:
+    """
+    Returns the version string that cache keys include: the installed markitdown version and PARSE_FORMAT_VERSION.
+    Read from the package metadata, so that markitdown is not imported.
+    """
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:
+        markitdown_version = version("markitdown")
+    except PackageNotFoundError:
+        markitdown_version = "unknown"
+    return f"markitdown={markitdown_version};format={PARSE_FORMAT_VERSION}"
+
+
+class ParseCache:
+    """
+    On-disk cache of parsed markdown keyed by a hash of (parser version, source content, variant), stored
+    zlib-compressed in SQLite so that it can be shared by worker processes and by concurrent runs on one host.
+    Rerunning with another chunker configuration then skips parsing files whose content has not changed.
+    When the compressed entries exceed max_size bytes, the least recently used ones are evicted.
+
+    Args:
+        cache_dir (str): directory of the cache database
+        max_size (int): maximum total size in bytes of the compressed entries (default: unlimited)
+        compression_level (int): zlib compression level, 1 (fastest) to 9 (smallest)
+    """
+
+    FILE_NAME = "parses.sqlite3"
+
+    def __init__(self, cache_dir: str, max_size: Optional[int] = None, compression_level: int = 6):
+        if max_size is not None and max_size < 1:
+            raise ValueError("max_size must be a positive integer.")
+        if not 1 <= compression_level <= 9:
+            raise ValueError("compression_level must be between 1 and 9.")
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, self.FILE_NAME)
+        self.max_size = max_size
+        self.compression_level = compression_level
+        self.parser_version = get_parser_version()
+        self._local = threading.local()
+        with self._connection() as conn:
+            # Small columns come before the markdown, so that reading them does not load the blob;
+            # the index covers the total size and the eviction order
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS parses "
+                "(key TEXT PRIMARY KEY, size INTEGER NOT NULL, last_used REAL NOT NULL, markdown BLOB NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS parses_lru ON parses (last_used, size)")
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            # Only takes effect when the database is created; lets evictions give space back to the file system
+            conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def make_key(self, digest: str, variant: str = "") -> str:
+        """
+        Returns the key of a source with content hash digest. variant tells apart results that differ for the same
+        content, e.g. the file extension MarkItDown picks its converter by, or a page range.
+        """
+        return hashlib.sha256(f"{self.parser_version}\0{digest}\0{variant}".encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        conn = self._connection()
+        row = conn.execute("SELECT markdown FROM parses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        try:
+            markdown = zlib.decompress(row[0]).decode("utf-8")
+        except (zlib.error, UnicodeDecodeError):
+            return None
+        with conn:
+            conn.execute("UPDATE parses SET last_used = ? WHERE key = ?", (time.time(), key))
+        return markdown
+
+    def put(self, key: str, markdown: str) -> None:
+        data = zlib.compress(markdown.encode("utf-8"), self.compression_level)
+        if self.max_size is not None and len(data) > self.max_size:
+            return
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO parses (key, size, last_used, markdown) VALUES (?, ?, ?, ?)",
+                (key, len(data), time.time(), data),
+            )
+            # Evicting in the same transaction keeps concurrent writers from evicting on stale totals
+            evicted = self._evict(conn) if self.max_size is not None else 0
+        if evicted:
+            conn.execute("PRAGMA incremental_vacuum").fetchall()
+
+    def _evict(self, conn: sqlite3.Connection) -> int:
+        """
+        Deletes the least recently used entries until the total size is within max_size; returns how many.
+        """
+        excess = conn.execute("SELECT COALESCE(SUM(size), 0) FROM parses").fetchone()[0] - self.max_size
+        if excess <= 0:
+            return 0
+        keys = []
+        for key, size in conn.execute("SELECT key, size FROM parses ORDER BY last_used"):
+            if excess <= 0:
+                break
+            keys.append((key,))
+            excess -= size
+        conn.executemany("DELETE FROM parses WHERE key = ?", keys)
+        return len(keys)
+
+    def get_or_parse(self, digest: str, variant: str, parse: Callable[[], str]) -> Tuple[str, bool]:
+        """
+        Returns the cached markdown of a source, or parses and caches it. Returns (markdown, whether it was cached).
+        A cache that cannot be read or written (e.g. a full disk) only costs the parse.
+        """
+        key = self.make_key(digest, variant)
+        try:
+            markdown = self.get(key)
+        except sqlite3.Error as e:
+            warnings.warn(f"Cannot read parse cache {self.path}: {e}")
+            markdown = None
+        if markdown is not None:
+            return markdown, True
+        markdown = parse()
+        try:
+            self.put(key, markdown)
+        except sqlite3.Error as e:
+            warnings.warn(f"Cannot write parse cache {self.path}: {e}")
+        return markdown, False
+
+
+# Process-wide parse cache used by the worker functions, see configure_parse_cache
+_settings: Dict[str, Any] = {"cache": None}
+
+
+def configure_parse_cache(cache_dir: Optional[str] = None, max_size: Optional[int] = None) -> None:
+    """
+    Enables the on-disk parse cache for files parsed from now on in this process; disabled when cache_dir is None.
+
+    Args:
+        cache_dir (str): directory of the parse cache
+        max_size (int): maximum total size in bytes of the compressed entries
+    """
+    _settings["cache"] = ParseCache(cache_dir, max_size) if cache_dir is not None else None
+
+
+def cached_parse(file_path: str, variant: str, parse: Callable[[], str]) -> Tuple[str, bool]:
+    """
+    Parses a file through the configured parse cache, keyed by the SHA-256 of its content.
+    Returns (markdown, whether it came from the cache); without a cache, the file is just parsed.
+    """
+    cache = _settings["cache"]
+    if cache is None:
+        return parse(), False
+    return cache.get_or_parse(file_sha256(file_path), variant, parse)
+
+
+def cached_parse_stream(data: bytes, variant: str, parse: Callable[[], str]) -> Tuple[str, bool]:
+    """
+    Same as cached_parse for in-memory file content.
+    """
+    cache = _settings["cache"]
+    if cache is None:
+        return parse(), False
+    return cache.get_or_parse(hashlib.sha256(data).hexdigest(), variant, parse)
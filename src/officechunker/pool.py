@@ -0,0 +1,290 @@
+import collections
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Executor, Future
+from multiprocessing.connection import wait
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from officechunker.utils import get_rss_bytes
+
+
+def _worker_main(conn: Any, initializer: Optional[Callable[..., None]], initargs: Tuple[Any, ...]) -> None:
+    """
+    Worker process loop: runs the initializer, reports ready, then runs one task at a time
+    until it receives None or the pipe is closed.
+    """
+    if initializer is not None:
+        initializer(*initargs)
+    conn.send(("ready", None))
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            return
+        if task is None:
+            return
+        fn, args, kwargs = task
+        try:
+            message = ("result", fn(*args, **kwargs))
+        except BaseException as e:
+            message = ("error", e)
+        try:
+            conn.send(message)
+        except Exception as e:
+            # The result or exception could not be pickled
+            conn.send(("error", RuntimeError(f"{type(e).__name__}: {e} ({message[1]!r})")))
+
+
+class _WorkItem:
+    def __init__(self, future: Future, fn: Callable[..., Any], args: Tuple[Any, ...], kwargs: Dict[str, Any]):
+        self.future = future
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+
+
+class _Worker:
+    def __init__(self, process: Any, conn: Any):
+        self.process = process
+        self.conn = conn
+        self.ready = False
+        self.item: Optional[_WorkItem] = None
+        self.started = 0.0
+        self.tasks_done = 0
+
+
+class SupervisedPool(Executor):
+    """
+    Process pool that, unlike ProcessPoolExecutor, can kill and replace a single worker:
+    a task that runs longer than `timeout` or whose worker grows beyond `max_memory` fails
+    with TimeoutError / MemoryError, its worker is killed and a new one is started, and all
+    other tasks keep running. Workers can also be recycled after `max_tasks_per_worker` tasks
+    to release memory leaked by parsers.
+
+    Args:
+        max_workers (int): number of worker processes (default: number of CPUs)
+        mp_context: multiprocessing context used to start workers (default: spawn)
+        initializer (callable): called with initargs in every new worker, e.g. init_worker
+        initargs (tuple): arguments of initializer
+        timeout (float): seconds a task may run before its worker is killed (default: unlimited)
+        max_memory (int): resident memory in bytes a worker may use before it is killed (default: unlimited).
+                          Only enforced where the RSS of other processes can be read (Linux /proc).
+        max_tasks_per_worker (int): tasks after which a worker is replaced by a fresh one (default: unlimited)
+        poll_interval (float): seconds between timeout and memory checks
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        mp_context: Optional[Any] = None,
+        initializer: Optional[Callable[..., None]] = None,
+        initargs: Tuple[Any, ...] = (),
+        timeout: Optional[float] = None,
+        max_memory: Optional[int] = None,
+        max_tasks_per_worker: Optional[int] = None,
+        poll_interval: float = 0.1,
+    ):
+        if max_workers is not None and max_workers < 1:
+            raise ValueError("max_workers must be a positive integer.")
+        if timeout is not None and timeout <= 0:
+            raise ValueError("timeout must be a positive number.")
+        if max_memory is not None and max_memory < 1:
+            raise ValueError("max_memory must be a positive integer.")
+        if max_tasks_per_worker is not None and max_tasks_per_worker < 1:
+            raise ValueError("max_tasks_per_worker must be a positive integer.")
+        self.max_workers = max_workers if max_workers is not None else (os.cpu_count() or 1)
+        self.timeout = timeout
+        self.max_memory = max_memory
+        self.max_tasks_per_worker = max_tasks_per_worker
+        self.poll_interval = poll_interval
+        self._context = mp_context if mp_context is not None else multiprocessing.get_context("spawn")
+        self._initializer = initializer
+        self._initargs = initargs
+
+        self._queue: Deque[_WorkItem] = collections.deque()
+        self._workers: List[_Worker] = []
+        self._retiring: List[Any] = []
+        self._lock = threading.Lock()
+        self._shutdown = False
+        self._wakeup_reader, self._wakeup_writer = self._context.Pipe(duplex=False)
+        self._thread = threading.Thread(target=self._supervise, name="officechunker-pool-supervisor", daemon=True)
+        self._thread.start()
+
+    def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("cannot schedule new futures after shutdown")
+            future: Future = Future()
+            self._queue.append(_WorkItem(future, fn, args, kwargs))
+            self._wakeup_writer.send_bytes(b"")
+        return future
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        with self._lock:
+            if cancel_futures:
+                while self._queue:
+                    self._queue.popleft().future.cancel()
+            if not self._shutdown:
+                self._shutdown = True
+                self._wakeup_writer.send_bytes(b"")
+        if wait:
+            self._thread.join()
+
+    # Supervisor thread
+
+    def _supervise(self) -> None:
+        try:
+            while True:
+                with self._lock:
+                    self._assign()
+                    if self._shutdown and not self._queue and all(w.item is None for w in self._workers):
+                        return
+                waitables = [self._wakeup_reader]
+                for worker in self._workers:
+                    waitables += [worker.conn, worker.process.sentinel]
+                for conn in wait(waitables, timeout=self.poll_interval):
+                    if conn is self._wakeup_reader:
+                        self._wakeup_reader.recv_bytes()
+                for worker in list(self._workers):
+                    self._check(worker)
+                self._reap()
+        finally:
+            self._stop_workers()
+
+    def _assign(self) -> None:
+        while self._queue and self._queue[0].future.cancelled():
+            self._queue.popleft()
+        idle = [w for w in self._workers if w.ready and w.item is None]
+        while self._queue and idle:
+            item = self._queue.popleft()
+            if not item.future.set_running_or_notify_cancel():
+                continue
+            worker = idle.pop()
+            try:
+                worker.conn.send((item.fn, item.args, item.kwargs))
+            except Exception as e:
+                # e.g. arguments that cannot be pickled; the worker itself is fine
+                item.future.set_exception(e)
+                idle.append(worker)
+                continue
+            worker.item = item
+            worker.started = time.monotonic()
+        # Start workers on demand, including replacements for killed or recycled ones
+        starting = sum(1 for w in self._workers if not w.ready)
+        while len(self._workers) < self.max_workers and len(self._queue) > starting:
+            self._start_worker()
+            starting += 1
+
+    def _start_worker(self) -> None:
+        parent_conn, child_conn = self._context.Pipe()
+        process = self._context.Process(
+            target=_worker_main, args=(child_conn, self._initializer, self._initargs), daemon=True
+        )
+        process.start()
+        child_conn.close()
+        self._workers.append(_Worker(process, parent_conn))
+
+    def _check(self, worker: _Worker) -> None:
+        """
+        Collects a finished result, and kills the worker if it died, timed out or uses too much memory.
+        """
+        try:
+            while worker.conn.poll():
+                kind, value = worker.conn.recv()
+                if kind == "ready":
+                    worker.ready = True
+                    continue
+                item, worker.item = worker.item, None
+                worker.tasks_done += 1
+                if item is not None:
+                    if kind == "result":
+                        item.future.set_result(value)
+                    else:
+                        item.future.set_exception(value)
+                # Recycle the worker after max_tasks_per_worker tasks, or if it kept too much memory
+                if (self.max_tasks_per_worker is not None and worker.tasks_done >= self.max_tasks_per_worker) or (
+                    self.max_memory is not None and get_rss_bytes(worker.process.pid) > self.max_memory
+                ):
+                    self._retire(worker)
+                    return
+        except (EOFError, OSError):
+            pass
+
+        if not worker.process.is_alive():
+            if not worker.ready:
+                # The worker died while starting, e.g. in the initializer: fail a queued task instead of
+                # restarting workers forever
+                with self._lock:
+                    item = self._queue.popleft() if self._queue else None
+                if item is not None and item.future.set_running_or_notify_cancel():
+                    item.future.set_exception(
+                        RuntimeError(f"Worker failed to start (exit code {worker.process.exitcode})")
+                    )
+            self._remove(worker, RuntimeError(f"Worker exited unexpectedly with exit code {worker.process.exitcode}"))
+            return
+        if worker.item is not None and self.timeout is not None and time.monotonic() - worker.started > self.timeout:
+            self._remove(worker, TimeoutError(f"Worker timed out after {self.timeout:g} seconds"))
+            return
+        # Only a running task is failed for memory; idle workers are recycled after their task instead
+        if worker.item is not None and self.max_memory is not None:
+            rss = get_rss_bytes(worker.process.pid)
+            if rss > self.max_memory:
+                self._remove(worker, MemoryError(
+                    f"Worker exceeded the memory limit ({rss / 2**20:.0f} MiB > {self.max_memory / 2**20:.0f} MiB)"
+                ))
+
+    def _remove(self, worker: _Worker, error: BaseException) -> None:
+        """
+        Kills a worker, failing its current task with error; a replacement is started on demand.
+        """
+        if worker.process.is_alive():
+            worker.process.kill()
+        worker.process.join()
+        worker.conn.close()
+        self._workers.remove(worker)
+        if worker.item is not None and not worker.item.future.done():
+            worker.item.future.set_exception(error)
+
+    def _retire(self, worker: _Worker) -> None:
+        """
+        Asks an idle worker to exit after its last task; a replacement is started on demand.
+        """
+        try:
+            worker.conn.send(None)
+        except OSError:
+            pass
+        worker.conn.close()
+        self._workers.remove(worker)
+        self._retiring.append(worker.process)
+
+    def _reap(self) -> None:
+        for process in list(self._retiring):
+            if not process.is_alive():
+                process.join()
+                self._retiring.remove(process)
+
+    def _stop_workers(self) -> None:
+        with self._lock:
+            workers, self._workers = self._workers, []
+            # Futures still queued when the supervisor exits abnormally
+            while self._queue:
+                item = self._queue.popleft()
+                if not item.future.done() and item.future.set_running_or_notify_cancel():
+                    item.future.set_exception(RuntimeError("The worker pool was shut down"))
+        for worker in workers:
+            if worker.item is not None and not worker.item.future.done():
+                worker.item.future.set_exception(RuntimeError("The worker pool was shut down"))
+            try:
+                worker.conn.send(None)
+            except OSError:
+                pass
+        for process in [w.process for w in workers] + self._retiring:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.kill()
+                process.join()
+        for worker in workers:
+            worker.conn.close()
+        self._retiring = []
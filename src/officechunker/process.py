@@ -1,4 +1,50 @@
-from markitdown import MarkItDown
+import datetime
+import io
+import os
+import re
+import sys
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Iterator, List, Optional
+
+if TYPE_CHECKING:
+    from markitdown import MarkItDown
+
+
+# Each worker (thread or process) keeps its own MarkItDown instance
+_local = threading.local()
+_pandas_lock = threading.Lock()
+_pandas_configured = False
+
+
+def _configure_pandas() -> None:
+    """
+    Turns off pandas' truncation of long cells once per process, before any workbook is converted.
+    DataFrame.to_html, used for xlsx by MarkItDown and parse_part_to_md, lifts the limit with a process-wide
+    option_context, which threads converting workbooks at the same time restore under each other's feet,
+    so that cells randomly came out cut to 50 characters.
+    """
+    global _pandas_configured
+    with _pandas_lock:
+        if not _pandas_configured:
+            import pandas as pd
+
+            pd.set_option("display.max_colwidth", None)
+            _pandas_configured = True
+
+
+def get_markitdown() -> "MarkItDown":
+    """
+    Return the MarkItDown instance owned by the current worker, creating it on first use.
+    markitdown is imported here rather than at module load, since it loads every converter backend.
+    """
+    md = getattr(_local, "markitdown", None)
+    if md is None:
+        from markitdown import MarkItDown
+
+        _configure_pandas()
+        md = MarkItDown(enable_plugins=False)
+        _local.markitdown = md
+    return md
 
 
 def parse_to_md(file_path: str) -> str:
@@ -9,7 +55,7 @@ def parse_to_md(file_path: str) -> str:
         file_path(str): path for individual file
     """
 
-    md = MarkItDown(enable_plugins=False)
+    md = get_markitdown()
     try:
         result = md.convert(file_path)
         return result.markdown
@@ -18,3 +64,176 @@ def parse_to_md(file_path: str) -> str:
         raise RuntimeError(f"Error converting file: {file_path}. Reason: {e}")
     except Exception as e:
         raise
+
+
+def parse_stream_to_md(data: bytes, file_extension: str = "") -> str:
+    """
+    Use MarkItDown to convert in-memory file content to md format
+
+    Args:
+        data(bytes): content of the file
+        file_extension(str): extension such as ".pdf", used to pick the converter
+    """
+
+    md = get_markitdown()
+    from markitdown import StreamInfo
+
+    stream_info = StreamInfo(extension=file_extension) if file_extension else None
+    try:
+        result = md.convert_stream(io.BytesIO(data), stream_info=stream_info)
+        return result.markdown
+
+    except ValueError as e:
+        raise RuntimeError(f"Error converting stream with extension '{file_extension}'. Reason: {e}")
+
+
+# Formats whose parsing can be split into independent parts: pages for PDF, sheets for xlsx
+SPLITTABLE_EXTENSIONS = (".pdf", ".xlsx")
+
+
+def count_parts(file_path: str) -> int:
+    """
+    Returns the number of pages of a PDF or sheets of an xlsx workbook.
+
+    Args:
+        file_path(str): path for individual file
+    """
+    ext = os.path.splitext(file_path)[1].lower()
+    if ext == ".pdf":
+        from pdfminer.pdfpage import PDFPage
+
+        with open(file_path, "rb") as f:
+            return sum(1 for _ in PDFPage.get_pages(f))
+    if ext == ".xlsx":
+        from openpyxl import load_workbook
+
+        wb = load_workbook(file_path, read_only=True)
+        try:
+            return len(wb.sheetnames)
+        finally:
+            wb.close()
+    raise ValueError(f"Cannot split files of type '{ext}', expected one of {SPLITTABLE_EXTENSIONS}")
+
+
+def parse_part_to_md(file_path: str, start: int, end: Optional[int] = None) -> str:
+    """
+    Converts pages (PDF) or sheets (xlsx) [start, end) of a file the same way MarkItDown converts the
+    whole file. Joining the parts of a file in order with join_parts gives MarkItDown's output.
+
+    Args:
+        file_path(str): path for individual file
+        start(int): index of the first page or sheet
+        end(int): index after the last page or sheet, None for the end of the file
+    """
+    ext = os.path.splitext(file_path)[1].lower()
+    if ext == ".pdf":
+        import pdfminer.high_level
+
+        return pdfminer.high_level.extract_text(file_path, page_numbers=range(start, end if end is not None else sys.maxsize))
+    if ext == ".xlsx":
+        import pandas as pd
+        from openpyxl import load_workbook
+        from markitdown.converters import HtmlConverter
+
+        _configure_pandas()
+        wb = load_workbook(file_path, read_only=True)
+        try:
+            sheet_names = wb.sheetnames[start:end]
+        finally:
+            wb.close()
+        if not sheet_names:
+            return ""
+        # Same formatting as MarkItDown's XlsxConverter, without its final strip (done in join_parts)
+        html_converter = HtmlConverter()
+        sheets = pd.read_excel(file_path, sheet_name=sheet_names, engine="openpyxl")
+        md_content = ""
+        for s in sheet_names:
+            md_content += f"## {s}\n"
+            md_content += html_converter.convert_string(sheets[s].to_html(index=False)).markdown.strip() + "\n\n"
+        return md_content
+    raise ValueError(f"Cannot split files of type '{ext}', expected one of {SPLITTABLE_EXTENSIONS}")
+
+
+def join_parts(parts: List[str], file_extension: str) -> str:
+    """
+    Stitches the outputs of parse_part_to_md back into one markdown document, applying
+    the same whitespace normalization as MarkItDown.
+
+    Args:
+        parts(list): outputs of parse_part_to_md in page/sheet order
+        file_extension(str): extension of the parsed file
+    """
+    markdown = "".join(parts)
+    if file_extension == ".xlsx":
+        markdown = markdown.strip()
+    markdown = "\n".join(line.rstrip() for line in re.split(r"\r?\n", markdown))
+    return re.sub(r"\n{3,}", "\n\n", markdown)
+
+
+def _format_cell(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, (datetime.date, datetime.time)):
+        text = value.isoformat()
+    else:
+        text = str(value)
+    return text.replace("|", "\\|").replace("\r\n", " ").replace("\n", " ")
+
+
+def iter_xlsx_batches(
+    file_path: str,
+    max_tokens: Optional[int] = None,
+    count_tokens: Optional[Callable[[str], float]] = None,
+    max_rows: int = 1000,
+) -> Iterator[str]:
+    """
+    Reads an xlsx workbook row by row (openpyxl read-only mode) and yields markdown tables of
+    consecutive rows, so that memory stays bounded however large the workbook is.
+    Every batch starts with the sheet name and the sheet's header row, so each one is readable on its own.
+
+    Args:
+        file_path(str): path for individual file
+        max_tokens(int): approximate token budget of a batch, including its header (default: rows only)
+        count_tokens(callable): counts the tokens of a string, required with max_tokens
+        max_rows(int): maximum number of rows per batch
+    """
+    from openpyxl import load_workbook
+
+    wb = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        for ws in wb.worksheets:
+            header = None
+            width = 0
+            rows: List[str] = []
+            tokens = 0
+            for values in ws.iter_rows(values_only=True):
+                if all(v is None for v in values):
+                    continue
+                cells = [_format_cell(v) for v in values]
+                if header is None:
+                    width = len(cells)
+                    header = (
+                        f"## {ws.title}\n"
+                        f"| {' | '.join(cells)} |\n"
+                        f"| {' | '.join(['---'] * width)} |\n"
+                    )
+                    header_tokens = count_tokens(header) if max_tokens is not None else 0
+                    continue
+                cells = (cells + [""] * width)[:max(width, len(cells))]
+                line = f"| {' | '.join(cells)} |"
+                line_tokens = count_tokens(line) + 1 if max_tokens is not None else 0
+                if rows and (
+                    len(rows) >= max_rows
+                    or (max_tokens is not None and header_tokens + tokens + line_tokens > max_tokens)
+                ):
+                    yield header + "\n".join(rows) + "\n\n"
+                    rows, tokens = [], 0
+                rows.append(line)
+                tokens += line_tokens
+            if rows:
+                yield header + "\n".join(rows) + "\n\n"
+            elif header is not None:
+                # Header-only sheet
+                yield header + "\n"
+    finally:
+        wb.close()
@@ -0,0 +1,194 @@
+import asyncio
+import collections
+import hashlib
+import heapq
+import itertools
+import os
+from typing import AsyncIterable, AsyncIterator, Awaitable, Callable, Deque, Dict, Generic, Iterable, List, Optional, Set, TypeVar, Union
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+_EXHAUSTED = object()
+
+
+async def aiterate(items: Union[Iterable[T], AsyncIterable[T]]) -> AsyncIterator[T]:
+    """
+    Iterates over sync or async items from a coroutine. Sync items are pulled on the default executor,
+    since listings and user-supplied generators may block.
+    """
+    if hasattr(items, "__aiter__"):
+        async for item in items:
+            yield item
+        return
+    loop = asyncio.get_running_loop()
+    iterator = iter(items)
+    while True:
+        item = await loop.run_in_executor(None, next, iterator, _EXHAUSTED)
+        if item is _EXHAUSTED:
+            return
+        yield item
+
+
+async def largest_first(
+    paths: Union[Iterable[str], AsyncIterable[str]],
+    size_of: Callable[[str], Awaitable[int]],
+    window: Optional[int] = None,
+) -> AsyncIterator[str]:
+    """
+    Orders paths by decreasing size (longest-processing-time first), so that a huge file
+    is not picked up last and leaves the run waiting on a single worker.
+
+    Args:
+        paths: File paths, e.g. a connector's aiter_files listing, consumed lazily.
+        size_of: Returns the size of a path in bytes, e.g. a connector's aget_file_size.
+        window: Number of paths buffered for reordering. None orders the whole listing,
+                which holds every (size, path) pair in memory; a finite window keeps memory
+                flat and only orders files within that look-ahead.
+    """
+    counter = itertools.count()
+    heap = []
+    async for path in aiterate(paths):
+        heapq.heappush(heap, (-await size_of(path), next(counter), path))
+        if window is not None and len(heap) > window:
+            yield heapq.heappop(heap)[2]
+    while heap:
+        yield heapq.heappop(heap)[2]
+
+
+async def run_bounded(
+    items: Union[Iterable[T], AsyncIterable[T]],
+    worker: Callable[[T], Awaitable[R]],
+    max_in_flight: int,
+) -> AsyncIterator[R]:
+    """
+    Runs worker(item) for each item with at most max_in_flight coroutines alive at once,
+    yielding results in completion order.
+
+    Items are pulled only when a slot frees up (see aiterate), so memory stays flat however
+    many items there are. A consumer that stops iterating also stops new work from being scheduled.
+    """
+    if max_in_flight < 1:
+        raise ValueError("max_in_flight must be a positive integer.")
+
+    iterator = aiterate(items)
+    pending: Set["asyncio.Future[R]"] = set()
+    ready: List["asyncio.Future[R]"] = []
+    exhausted = False
+    try:
+        while True:
+            while not exhausted and len(pending) < max_in_flight:
+                try:
+                    item = await iterator.__anext__()
+                except StopAsyncIteration:
+                    exhausted = True
+                    break
+                pending.add(asyncio.ensure_future(worker(item)))
+            if not pending:
+                return
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            ready = list(done)
+            while ready:
+                yield ready.pop().result()
+    finally:
+        for task in pending:
+            task.cancel()
+        # Finished results that were never consumed, e.g. after another task raised
+        for task in ready:
+            if not task.cancelled():
+                task.exception()
+        await iterator.aclose()
+
+
+def shard_of(name: str, shard_count: int) -> int:
+    """
+    Returns the shard (0 to shard_count - 1) a file belongs to. The assignment depends only on the
+    file's path relative to the source folder, so every node computes the same split without
+    coordination, and it does not change when other files are added or removed.
+
+    Args:
+        name: Path of the file relative to the source folder.
+        shard_count: Number of shards.
+    """
+    digest = hashlib.sha1(name.replace(os.sep, "/").encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % shard_count
+
+
+class ReadAhead(Generic[T, R]):
+    """
+    Iterates asynchronously over items while fetching the next `depth` of them ahead of time,
+    e.g. downloading remote files while earlier ones are parsed.
+
+    Iterating starts a fetch(item) task for up to `depth` items beyond the last one handed out.
+    get(item) returns the task of an item's fetch, starting it if it was not prefetched, and
+    release(item) forgets an item and passes its fetched result to discard, e.g. to delete a local copy.
+    Items handed out but not released yet keep their results, so at most depth items plus those
+    being processed are fetched at any time. Must be used from the event loop's thread.
+
+    Args:
+        items: Items, sync or async, consumed lazily (see aiterate).
+        fetch: Coroutine function that fetches an item and returns the result, e.g. the path of a local copy.
+        discard: Called with the result of every released fetch.
+        depth: Number of items fetched ahead; 0 only fetches items when get is called.
+    """
+
+    def __init__(
+        self,
+        items: Union[Iterable[T], AsyncIterable[T]],
+        fetch: Callable[[T], Awaitable[R]],
+        discard: Callable[[R], None],
+        depth: int,
+    ):
+        if depth < 0:
+            raise ValueError("depth must be a non-negative integer.")
+        self._items = aiterate(items)
+        self._fetch = fetch
+        self._discard = discard
+        self.depth = depth
+        self._ahead: Deque[T] = collections.deque()
+        self._tasks: Dict[T, "asyncio.Task[R]"] = {}
+        self._exhausted = False
+
+    def __aiter__(self) -> "ReadAhead[T, R]":
+        return self
+
+    async def __anext__(self) -> T:
+        while not self._exhausted and len(self._ahead) <= self.depth:
+            try:
+                item = await self._items.__anext__()
+            except StopAsyncIteration:
+                self._exhausted = True
+                break
+            self._ahead.append(item)
+            if self.depth:
+                self.get(item)
+        if not self._ahead:
+            raise StopAsyncIteration
+        return self._ahead.popleft()
+
+    def get(self, item: T) -> "asyncio.Task[R]":
+        task = self._tasks.get(item)
+        if task is None:
+            task = self._tasks[item] = asyncio.ensure_future(self._fetch(item))
+        return task
+
+    def release(self, item: T) -> None:
+        task = self._tasks.pop(item, None)
+        if task is not None:
+            task.cancel()
+            task.add_done_callback(self._discard_result)
+
+    def _discard_result(self, task: "asyncio.Task[R]") -> None:
+        if not task.cancelled() and task.exception() is None:
+            self._discard(task.result())
+
+    async def aclose(self) -> None:
+        """
+        Releases every fetched item, e.g. the ones fetched ahead when a run stops early,
+        and waits for fetches that were already running.
+        """
+        tasks = list(self._tasks.values())
+        for item in list(self._tasks):
+            self.release(item)
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await self._items.aclose()
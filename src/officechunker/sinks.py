@@ -0,0 +1,373 @@
+import glob
+import importlib.util
+import json
+import os
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+
+
+# Ways MarkdownChunkSink can store chunk metadata next to the chunk text
+CHUNK_METADATA_MODES = ("front_matter", "sidecar")
+
+
+def chunk_to_record(chunk: Any) -> Dict[str, Any]:
+    """
+    Converts a chonkie Chunk (or a plain string when return_type="texts") into a picklable dict.
+    Workers check the offsets against the chunked markdown and may add "target_token_count", the token count
+    of the text with a second tokenizer.
+    """
+    if isinstance(chunk, str):
+        return {"text": chunk, "token_count": None, "start_index": None, "end_index": None}
+    return {
+        "text": chunk.text,
+        "token_count": chunk.token_count,
+        "start_index": chunk.start_index,
+        "end_index": chunk.end_index,
+    }
+
+
+class BaseChunkSink(ABC):
+    """
+    Base Format for the destination of chunk records
+
+    Args:
+        dst_folder (str): destination folder of the run
+        name_suffix (str): appended to the names of consolidated output files, e.g. to keep shards of a run apart
+    """
+
+    # Whether outputs can be removed per source file (required by incremental runs)
+    supports_removal = False
+
+    def __init__(self, dst_folder: str, name_suffix: str = ""):
+        self.dst_folder = dst_folder
+        self.name_suffix = name_suffix
+
+    @classmethod
+    def check_available(cls) -> None:
+        """
+        Raises ImportError if an optional dependency of this sink is not installed, so that a run can fail
+        when it is configured rather than once the first chunks are written.
+        """
+        pass
+
+    @abstractmethod
+    def write(self, source: str, records: List[Dict[str, Any]], output_dir: str, base_name: str, first_index: int = 0) -> List[str]:
+        """
+        Writes the chunk records of one source file.
+
+        Args:
+            source (str): source path relative to the source folder
+            records (list): chunk records in order, see chunk_to_record
+            output_dir (str): directory mirroring the source file's directory under dst_folder
+            base_name (str): source file name, that output file names start with
+            first_index (int): chunk index of the first record, when a source is written in several calls
+        Returns:
+            Paths of the files written for this source.
+        """
+        pass
+
+    def close(self) -> None:
+        """
+        Flushes buffered records and releases open files.
+        """
+        pass
+
+    def output_files(self) -> List[str]:
+        """
+        Returns the consolidated output files shared by all sources, e.g. to upload them after the run.
+        Per-source files are returned by write instead.
+        """
+        return []
+
+    def checkpoint(self) -> Dict[str, Any]:
+        """
+        Makes every record written so far durable and returns the state that restore needs
+        to continue after a crash from exactly this point.
+        """
+        return {}
+
+    def restore(self, state: Optional[Dict[str, Any]]) -> None:
+        """
+        Prepares the sink to continue from a checkpoint state, discarding anything written after it.
+        With None, the run starts from scratch and this sink's previous output files are removed.
+        """
+        pass
+
+
+class MarkdownChunkSink(BaseChunkSink):
+    """
+    Writes each chunk to its own '{base_name}_{i}.md' file next to the source's outputs
+
+    Args:
+        metadata (str): where to keep each chunk's source, index, token counts and offsets, so that consumers
+                        do not need to re-tokenize the chunks: "front_matter" writes them as a YAML block at the
+                        top of the chunk file, "sidecar" as one JSON line per chunk in '{base_name}_chunks.jsonl'
+                        (default: only the text is written)
+    """
+
+    supports_removal = True
+
+    def __init__(self, dst_folder: str, name_suffix: str = "", metadata: Optional[str] = None):
+        super().__init__(dst_folder, name_suffix)
+        if metadata is not None and metadata not in CHUNK_METADATA_MODES:
+            raise ValueError(f"metadata must be one of {CHUNK_METADATA_MODES}, got '{metadata}'")
+        self.metadata = metadata
+
+    def write(self, source: str, records: List[Dict[str, Any]], output_dir: str, base_name: str, first_index: int = 0) -> List[str]:
+        chunk_file_paths = []
+        sidecar_lines = []
+        for i, record in enumerate(records, start=first_index):
+            chunk_file_name = f"{base_name}_{i+1}.md"
+            chunk_file_path = os.path.join(output_dir, chunk_file_name)
+            metadata = {"source": source, "chunk_index": i, **{k: v for k, v in record.items() if k != "text"}}
+            with open(chunk_file_path, "w", encoding="utf-8") as f:
+                if self.metadata == "front_matter":
+                    # JSON scalars are valid YAML, so values need no escaping of their own
+                    f.write("---\n" + "".join(f"{k}: {json.dumps(v, ensure_ascii=False)}\n" for k, v in metadata.items()) + "---\n")
+                f.write(record["text"])
+            chunk_file_paths.append(chunk_file_path)
+            if self.metadata == "sidecar":
+                sidecar_lines.append(json.dumps({"file": chunk_file_name, **metadata}, ensure_ascii=False) + "\n")
+
+        if self.metadata == "sidecar":
+            sidecar_path = os.path.join(output_dir, f"{base_name}_chunks.jsonl")
+            # Sources written in several calls (see first_index) continue the same sidecar
+            with open(sidecar_path, "w" if first_index == 0 else "a", encoding="utf-8") as f:
+                f.writelines(sidecar_lines)
+            chunk_file_paths.append(sidecar_path)
+        return chunk_file_paths
+
+
+class _BufferedChunkSink(BaseChunkSink):
+    """
+    Collects records in memory and hands them to _flush_batch in batches of batch_size.
+    With shard_size set, a new output file is started every shard_size records.
+    """
+
+    extension = ""
+
+    def __init__(
+        self,
+        dst_folder: str,
+        name_suffix: str = "",
+        file_name: str = "chunks",
+        batch_size: int = 1000,
+        shard_size: Optional[int] = None,
+    ):
+        super().__init__(dst_folder, name_suffix)
+        if batch_size < 1:
+            raise ValueError("batch_size must be a positive integer.")
+        if shard_size is not None and shard_size < 1:
+            raise ValueError("shard_size must be a positive integer.")
+        self.file_name = file_name
+        self.batch_size = batch_size
+        self.shard_size = shard_size
+        self._buffer: List[Dict[str, Any]] = []
+        self._shard_index = 0
+        self._records_in_shard = 0
+        self._lock = threading.Lock()
+        # Restored runs always number their files, see checkpoint
+        self._numbered = shard_size is not None
+
+    def _shard_path(self, shard_index: Optional[int] = None) -> str:
+        name = f"{self.file_name}{self.name_suffix}"
+        if not self._numbered:
+            return os.path.join(self.dst_folder, f"{name}{self.extension}")
+        index = self._shard_index if shard_index is None else shard_index
+        return os.path.join(self.dst_folder, f"{name}-{index:05d}{self.extension}")
+
+    def _output_files(self) -> List[str]:
+        """
+        Returns this sink's existing output files, numbered or not.
+        """
+        name = glob.escape(os.path.join(self.dst_folder, f"{self.file_name}{self.name_suffix}"))
+        return glob.glob(f"{name}{self.extension}") + glob.glob(f"{name}-[0-9][0-9][0-9][0-9][0-9]{self.extension}")
+
+    def output_files(self) -> List[str]:
+        return sorted(self._output_files())
+
+    def write(self, source: str, records: List[Dict[str, Any]], output_dir: str, base_name: str, first_index: int = 0) -> List[str]:
+        with self._lock:
+            shard_paths: List[str] = []
+            for i, record in enumerate(records, start=first_index):
+                if self.shard_size is not None and self._records_in_shard >= self.shard_size:
+                    self._flush()
+                    self._close_shard()
+                    self._shard_index += 1
+                    self._records_in_shard = 0
+                if not shard_paths or shard_paths[-1] != self._shard_path():
+                    shard_paths.append(self._shard_path())
+                self._buffer.append({"source": source, "chunk_index": i, **record})
+                self._records_in_shard += 1
+                if len(self._buffer) >= self.batch_size:
+                    self._flush()
+            return shard_paths
+
+    def _flush(self) -> None:
+        if self._buffer:
+            self._flush_batch(self._buffer)
+            self._buffer = []
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush()
+            self._close_shard()
+
+    def checkpoint(self) -> Dict[str, Any]:
+        # Formats that cannot be appended to, like Parquet, are only readable once closed:
+        # finish the current file and continue in a new one.
+        with self._lock:
+            self._flush()
+            self._close_shard()
+            if self._records_in_shard:
+                self._shard_index += 1
+                self._records_in_shard = 0
+            self._numbered = True
+            return {"shard_index": self._shard_index}
+
+    def restore(self, state: Optional[Dict[str, Any]]) -> None:
+        with self._lock:
+            self._numbered = True
+            self._shard_index = state["shard_index"] if state is not None else 0
+            self._records_in_shard = 0
+            for path in self._output_files():
+                if state is None or self._file_index(path) is None or self._file_index(path) >= self._shard_index:
+                    os.remove(path)
+
+    def _file_index(self, path: str) -> Optional[int]:
+        stem = os.path.basename(path)[:-len(self.extension)] if self.extension else os.path.basename(path)
+        head, _, index = stem.rpartition("-")
+        return int(index) if head == f"{self.file_name}{self.name_suffix}" and index.isdigit() else None
+
+    @abstractmethod
+    def _flush_batch(self, batch: List[Dict[str, Any]]) -> None:
+        pass
+
+    def _close_shard(self) -> None:
+        pass
+
+
+class JsonlChunkSink(_BufferedChunkSink):
+    """
+    Appends one JSON object per chunk to '{file_name}.jsonl' (or one file per shard)
+    """
+
+    extension = ".jsonl"
+
+    def __init__(self, dst_folder: str, name_suffix: str = "", **kwargs: Any):
+        super().__init__(dst_folder, name_suffix, **kwargs)
+        self._file = None
+
+    def _flush_batch(self, batch: List[Dict[str, Any]]) -> None:
+        if self._file is None:
+            self._file = open(self._shard_path(), "a", encoding="utf-8")
+        self._file.write("".join(json.dumps(record, ensure_ascii=False) + "\n" for record in batch))
+        self._file.flush()
+
+    def _close_shard(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def checkpoint(self) -> Dict[str, Any]:
+        # JSON lines can be appended to: keep the file open and remember its length
+        with self._lock:
+            self._flush()
+            path = self._shard_path()
+            if self._file is not None:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+            offset = os.path.getsize(path) if os.path.exists(path) else 0
+            return {
+                "shard_index": self._shard_index,
+                "records_in_shard": self._records_in_shard,
+                "numbered": self._numbered,
+                "offset": offset,
+            }
+
+    def restore(self, state: Optional[Dict[str, Any]]) -> None:
+        if state is None or "offset" not in state:
+            super().restore(state)
+            return
+        with self._lock:
+            self._shard_index = state["shard_index"]
+            self._records_in_shard = state["records_in_shard"]
+            self._numbered = state["numbered"]
+            current = self._shard_path()
+            for path in self._output_files():
+                index = self._file_index(path)
+                if path != current and (index is None or index > self._shard_index):
+                    os.remove(path)
+            # Drop records written after the checkpoint, e.g. by files that were in flight during a crash
+            if os.path.exists(current):
+                with open(current, "r+b") as f:
+                    f.truncate(state["offset"])
+
+
+class ParquetChunkSink(_BufferedChunkSink):
+    """
+    Writes chunks to '{file_name}.parquet' (or one file per shard), one row group per batch.
+    Requires pyarrow.
+    """
+
+    extension = ".parquet"
+
+    @classmethod
+    def check_available(cls) -> None:
+        # find_spec looks pyarrow up without importing it, which takes a while
+        if importlib.util.find_spec("pyarrow") is None:
+            raise ImportError("The 'parquet' output format requires pyarrow. Install it with 'pip install pyarrow'.")
+
+    def __init__(self, dst_folder: str, name_suffix: str = "", **kwargs: Any):
+        self.check_available()
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        super().__init__(dst_folder, name_suffix, **kwargs)
+        self._pa = pa
+        self._pq = pq
+        self._schema = pa.schema([
+            ("source", pa.string()),
+            ("chunk_index", pa.int64()),
+            ("text", pa.string()),
+            ("token_count", pa.int64()),
+            ("start_index", pa.int64()),
+            ("end_index", pa.int64()),
+            ("target_token_count", pa.int64()),
+        ])
+        self._writer = None
+
+    def _flush_batch(self, batch: List[Dict[str, Any]]) -> None:
+        if self._writer is None:
+            self._writer = self._pq.ParquetWriter(self._shard_path(), self._schema)
+        columns = {name: [record.get(name) for record in batch] for name in self._schema.names}
+        self._writer.write_table(self._pa.table(columns, schema=self._schema))
+
+    def _close_shard(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+SINK_MAP = {
+    "md": MarkdownChunkSink,
+    "jsonl": JsonlChunkSink,
+    "parquet": ParquetChunkSink,
+}
+
+
+def create_sink(output_format: str, dst_folder: str, name_suffix: str = "", **sink_kwargs: Any) -> BaseChunkSink:
+    """
+    Create Sink Instance based on the output_format
+
+    Args:
+        output_format (string): one of SINK_MAP
+        dst_folder (string): destination folder of the run
+        name_suffix (string): appended to the names of consolidated output files
+        **sink_kwargs: Any
+    """
+    if output_format not in SINK_MAP:
+        raise ValueError(f"Unsupported output_format: {output_format}")
+    SINK_MAP[output_format].check_available()
+    return SINK_MAP[output_format](dst_folder, name_suffix, **sink_kwargs)
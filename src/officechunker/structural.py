@@ -0,0 +1,299 @@
+import re
+from typing import Any, Callable, List, Optional, Tuple, Union
+
+from chonkie import BaseChunker
+from chonkie.types import Chunk
+
+
+# Markdown structure emitted by MarkItDown: ATX headings (docx headings, xlsx sheet names as '## <sheet>',
+# pptx slide titles), slide markers, pipe tables and fenced code blocks
+_HEADING_RE = re.compile(r" {0,3}(#{1,6})(?:[ \t]|\r?\n|$)")
+_SLIDE_RE = re.compile(r"\s*<!--\s*Slide number:\s*\d+\s*-->")
+_FENCE_RE = re.compile(r" {0,3}(`{3,}|~{3,})")
+_TABLE_SEPARATOR_RE = re.compile(r"\s*\|?\s*:?-{3,}:?\s*(\|\s*:?-{3,}:?\s*)*\|?\s*$")
+
+# Split points inside a block that exceeds the token budget, tried in order: lines, sentences, words.
+# Each piece keeps the delimiter that ends it. Pieces that are still too large are cut by characters.
+_SPLIT_PATTERNS = (
+    re.compile(r"\n"),
+    re.compile(r"[.!?](?=\s)\s*"),
+    re.compile(r"\s+"),
+)
+
+
+class _Block:
+    """
+    A heading, paragraph, table or code block starting at offset start. A block ends where the next one starts,
+    so blank lines belong to the block before them. Tables keep the offsets of their rows and header.
+    """
+
+    __slots__ = ("kind", "start", "rows", "header_end")
+
+    def __init__(self, kind: str, start: int):
+        self.kind = kind
+        self.start = start
+        self.rows: List[int] = []
+        self.header_end: Optional[int] = None
+
+
+class _Unit:
+    """
+    A span [start, end) to be packed into chunks, with its token count. header is the table header that
+    a chunk starting at this unit repeats; level is the next split pattern to try if the unit is too large.
+    """
+
+    __slots__ = ("start", "end", "tokens", "header", "level")
+
+    def __init__(self, start: int, end: int, tokens: int, header: Optional[str] = None, level: int = 0):
+        self.start = start
+        self.end = end
+        self.tokens = tokens
+        self.header = header
+        self.level = level
+
+
+class StructuralChunker(BaseChunker):
+    """
+    Splits markdown on the document structure MarkItDown emits before applying a token budget:
+    every heading up to max_heading_level, slide marker ('<!-- Slide number: N -->') and sheet ('## <sheet>')
+    starts a new section, and no chunk spans two sections. A section that fits chunk_size is one chunk;
+    a larger one is packed greedily from its paragraphs, tables (row by row) and code blocks, and only blocks
+    that alone exceed chunk_size are split further, by lines, sentences, words and finally characters.
+    A section holding only headings, e.g. a slide marker followed by the slide title, stays with the next one.
+
+    Runs in one linear pass with no embedding model. start_index/end_index are the chunk's span in the text;
+    with repeat_headers, chunks that continue a split section start with the section's headings, and chunks that
+    continue a split table with the table's header rows, so that their text is longer than that span.
+
+    Args:
+        tokenizer_or_token_counter: tokenizer name, tokenizer object or token counting function
+        chunk_size (int): maximum tokens per chunk (section and table headers repeated by repeat_headers included)
+        max_heading_level (int): headings down to this level ('#' is 1) start sections; deeper ones only start blocks
+        repeat_headers (bool): repeat section headings and table header rows at the start of continuation chunks
+        return_type (str): "chunks" for Chunk objects, "texts" for strings
+    """
+
+    def __init__(
+        self,
+        tokenizer_or_token_counter: Union[str, Any, Callable[[str], int]] = "gpt2",
+        chunk_size: int = 512,
+        max_heading_level: int = 2,
+        repeat_headers: bool = True,
+        return_type: str = "chunks",
+    ):
+        super().__init__(tokenizer_or_token_counter)
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be a positive integer.")
+        if not 0 <= max_heading_level <= 6:
+            raise ValueError("max_heading_level must be between 0 and 6.")
+        if return_type not in ("chunks", "texts"):
+            raise ValueError("return_type must be either 'chunks' or 'texts'.")
+        self.chunk_size = chunk_size
+        self.max_heading_level = max_heading_level
+        self.repeat_headers = repeat_headers
+        self.return_type = return_type
+        # Documents are already chunked in parallel by the Converter's workers
+        self._use_multiprocessing = False
+
+    def _count(self, texts: List[str]) -> List[int]:
+        return [int(count) for count in self.tokenizer.count_tokens_batch(texts)] if texts else []
+
+    def _parse(self, text: str) -> List[List[_Block]]:
+        """
+        Splits text into sections of blocks in one pass over its lines.
+        """
+        sections: List[List[_Block]] = [[]]
+        block: Optional[_Block] = None
+        fence: Optional[str] = None
+        after_blank = True
+        offset = 0
+        for line in text.splitlines(keepends=True):
+            start = offset
+            offset += len(line)
+            stripped = line.strip()
+            if fence is not None:
+                if stripped.startswith(fence):
+                    fence = None
+                continue
+            if not stripped:
+                after_blank = True
+                continue
+
+            heading = _HEADING_RE.match(line)
+            if heading is not None or _SLIDE_RE.match(line):
+                is_boundary = heading is None or len(heading.group(1)) <= self.max_heading_level
+                if is_boundary and any(b.kind != "heading" for b in sections[-1]):
+                    sections.append([])
+                block = _Block("heading", start)
+            elif _FENCE_RE.match(line):
+                fence = _FENCE_RE.match(line).group(1)
+                block = _Block("code", start)
+            elif stripped.startswith("|"):
+                if block is None or block.kind != "table" or after_blank:
+                    block = _Block("table", start)
+                    sections[-1].append(block)
+                elif len(block.rows) == 1 and _TABLE_SEPARATOR_RE.match(line):
+                    block.header_end = offset
+                block.rows.append(start)
+                after_blank = False
+                continue
+            elif block is not None and block.kind == "text" and not after_blank:
+                block.rows.append(start)
+                continue
+            else:
+                block = _Block("text", start)
+                block.rows.append(start)
+            sections[-1].append(block)
+            after_blank = False
+
+        sections = [section for section in sections if section]
+        if sections:
+            # Leading blank lines belong to the first block
+            sections[0][0].start = 0
+        return sections
+
+    def _split_unit(self, text: str, unit: _Unit, budget: int) -> List[_Unit]:
+        """
+        Splits a unit at the first split pattern, from its level on, that yields several pieces;
+        falls back to equal cuts by characters.
+        """
+        for level in range(unit.level, len(_SPLIT_PATTERNS)):
+            points = [m.end() for m in _SPLIT_PATTERNS[level].finditer(text, unit.start, unit.end)]
+            bounds = [unit.start] + [p for p in points if unit.start < p < unit.end] + [unit.end]
+            if len(bounds) > 2:
+                return [_Unit(s, e, 0, unit.header, level + 1) for s, e in zip(bounds, bounds[1:])]
+        parts = min(unit.end - unit.start, -(-unit.tokens // budget) + 1)
+        bounds = [unit.start + (unit.end - unit.start) * i // parts for i in range(parts + 1)]
+        return [_Unit(s, e, 0, unit.header, len(_SPLIT_PATTERNS)) for s, e in zip(bounds, bounds[1:]) if s < e]
+
+    def _fit(self, text: str, units: List[_Unit], budget: int) -> List[_Unit]:
+        """
+        Returns units with every unit above budget split until it fits (or is a single character).
+        """
+        fitted: List[_Unit] = []
+        for unit in units:
+            if unit.tokens <= budget or unit.end - unit.start <= 1:
+                fitted.append(unit)
+                continue
+            pieces = self._split_unit(text, unit, budget)
+            for piece, count in zip(pieces, self._count([text[p.start:p.end] for p in pieces])):
+                piece.tokens = count
+            fitted.extend(self._fit(text, pieces, budget))
+        return fitted
+
+    def _block_units(self, text: str, block: _Block, end: int) -> List[_Unit]:
+        """
+        Returns the units of a block that exceeds the budget: table rows (the header rows as one unit)
+        or the whole block, split further by _fit.
+        """
+        if block.kind != "table":
+            return [_Unit(block.start, end, 0)]
+        header = None
+        starts = block.rows
+        if block.header_end is not None:
+            header = text[block.rows[0]:block.header_end]
+            starts = [block.rows[0]] + [row for row in block.rows if row >= block.header_end]
+        bounds = starts + [end]
+        return [
+            _Unit(s, e, 0, header if header is not None and s >= block.header_end else None, 1)
+            for s, e in zip(bounds, bounds[1:])
+        ]
+
+    def _chunk_section(self, text: str, section: List[_Block], end: int) -> List[Tuple[int, int, str]]:
+        """
+        Packs a section that exceeds chunk_size into (start, end, prefix) spans, where prefix is
+        the text repeated before the span (see repeat_headers).
+        """
+        # Texts that continuation chunks may repeat: the section's leading headings and its table headers
+        heading = ""
+        headers: List[str] = []
+        if self.repeat_headers:
+            leading = 0
+            while leading < len(section) - 1 and section[leading].kind == "heading":
+                leading += 1
+            if leading:
+                heading = text[section[0].start:section[leading].start].rstrip() + "\n\n"
+            headers = list(dict.fromkeys(
+                text[block.rows[0]:block.header_end]
+                for block in section
+                if block.kind == "table" and block.header_end is not None
+            ))
+        prefix_tokens = dict(zip([heading, *headers], self._count([heading, *headers])))
+        prefix_tokens[""] = 0
+        # Repeated text may take at most half of a chunk: table headers are dropped first, then the heading
+        if prefix_tokens[heading] + max(map(prefix_tokens.get, headers), default=0) > self.chunk_size // 2:
+            headers = []
+        if prefix_tokens[heading] > self.chunk_size // 2:
+            heading = ""
+        budget = max(self.chunk_size - prefix_tokens[heading] - max(map(prefix_tokens.get, headers), default=0), 1)
+
+        block_ends = [block.start for block in section[1:]] + [end]
+        units = [_Unit(block.start, block_end, 0) for block, block_end in zip(section, block_ends)]
+        for unit, count in zip(units, self._count([text[u.start:u.end] for u in units])):
+            unit.tokens = count
+        fitted: List[_Unit] = []
+        for block, unit in zip(section, units):
+            if unit.tokens <= budget:
+                fitted.append(unit)
+                continue
+            pieces = self._block_units(text, block, unit.end)
+            for piece, count in zip(pieces, self._count([text[p.start:p.end] for p in pieces])):
+                piece.tokens = count
+            fitted.extend(self._fit(text, pieces, budget))
+
+        # Greedy packing: a unit that does not fit in the current chunk starts the next one
+        spans: List[Tuple[int, int, str]] = []
+        start = stop = tokens = 0
+        prefix = ""
+        for i, unit in enumerate(fitted):
+            if i and tokens + unit.tokens <= self.chunk_size:
+                stop = unit.end
+                tokens += unit.tokens
+                continue
+            header = unit.header if unit.header in headers else ""
+            if i:
+                spans.append((start, stop, prefix))
+                prefix = heading + header
+            start, stop, tokens = unit.start, unit.end, unit.tokens
+            if prefix:
+                tokens += prefix_tokens[heading] + prefix_tokens[header]
+        spans.append((start, stop, prefix))
+        return spans
+
+    def chunk(self, text: str) -> Union[List[Chunk], List[str]]:
+        """
+        Splits text into structure-aligned chunks.
+
+        Args:
+            text (str): markdown to chunk
+        Returns:
+            List of Chunk objects (or strings with return_type="texts") in document order.
+        """
+        if not text or not text.strip():
+            return []
+        sections = self._parse(text)
+        section_ends = [section[0].start for section in sections[1:]] + [len(text)]
+        section_tokens = self._count([text[section[0].start:end] for section, end in zip(sections, section_ends)])
+
+        spans: List[Tuple[int, int, str]] = []
+        for section, end, tokens in zip(sections, section_ends, section_tokens):
+            if tokens <= self.chunk_size:
+                spans.append((section[0].start, end, ""))
+            else:
+                spans.extend(self._chunk_section(text, section, end))
+
+        spans = [(start, end, prefix) for start, end, prefix in spans if text[start:end].strip()]
+        texts = [prefix + text[start:end] for start, end, prefix in spans]
+        if self.return_type == "texts":
+            return texts
+        return [
+            Chunk(text=chunk_text, start_index=start, end_index=end, token_count=count)
+            for chunk_text, (start, end, _), count in zip(texts, spans, self._count(texts))
+        ]
+
+    def __repr__(self) -> str:
+        return (
+            f"StructuralChunker(tokenizer={self.tokenizer}, chunk_size={self.chunk_size}, "
+            f"max_heading_level={self.max_heading_level}, repeat_headers={self.repeat_headers}, "
+            f"return_type={self.return_type})"
+        )
@@ -0,0 +1,52 @@
+import hashlib
+import os
+import sys
+from typing import Optional
+
+
+def get_rss_bytes(pid: Optional[int] = None) -> int:
+    """
+    Returns the current resident set size of a process in bytes (default: this process).
+    Returns 0 when it cannot be determined on this platform.
+
+    Args:
+        pid (int): process id, None for the current process
+    """
+    statm_path = f"/proc/{pid if pid is not None else 'self'}/statm"
+    try:
+        with open(statm_path, "r") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    if pid is None:
+        # The peak is the best we have without /proc
+        return get_peak_rss_bytes()
+    return 0
+
+
+def get_peak_rss_bytes() -> int:
+    """
+    Returns the peak resident set size of the current process in bytes, or 0 if unavailable.
+    """
+    try:
+        import resource
+    except ImportError:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def file_sha256(file_path: str, block_size: int = 1 << 20) -> str:
+    """
+    Returns the hex SHA-256 digest of a file's content, read in blocks.
+
+    Args:
+        file_path (str): path for individual file
+        block_size (int): number of bytes read at a time
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
@@ -0,0 +1,277 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+import warnings
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from officechunker.file_handlers import BaseFileConnector
+
+
+# Returned among the changed paths when events were lost and the whole folder must be checked again
+RESCAN = ""
+
+# inotify(7) event flags
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ONLYDIR = 0x01000000
+_IN_ISDIR = 0x40000000
+
+_WATCH_MASK = (
+    _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+    | _IN_DELETE_SELF | _IN_MOVE_SELF | _IN_ONLYDIR
+)
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+class BaseWatcher:
+    """
+    Base Format for watching a source folder for new, changed and deleted files
+
+    Args:
+        folder (str): folder to watch, recursively
+        ignore (callable): paths (files or directories) for which it returns True are not reported
+    """
+
+    def __init__(self, folder: str, ignore: Optional[Callable[[str], bool]] = None):
+        self.folder = folder
+        self.ignore = ignore if ignore is not None else (lambda path: False)
+
+    def read_changes(self, timeout: float) -> List[str]:
+        """
+        Waits up to timeout seconds and returns the paths that were created, modified or deleted since the last call,
+        possibly including RESCAN. A deleted or moved-away directory is reported as the directory path.
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> "BaseWatcher":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class InotifyWatcher(BaseWatcher):
+    """
+    Watches a local folder tree with Linux inotify, through libc (no extra dependency).
+    A watch is added to every directory; directories created or moved in later are watched as they appear,
+    and the files already in them are reported. If the kernel queue overflows, RESCAN is reported.
+    """
+
+    def __init__(self, folder: str, ignore: Optional[Callable[[str], bool]] = None):
+        super().__init__(folder, ignore)
+        libc_name = ctypes.util.find_library("c")
+        if not sys.platform.startswith("linux") or libc_name is None:
+            raise OSError("inotify is only available on Linux.")
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(self._libc, "inotify_init1"):
+            raise OSError("libc does not provide inotify.")
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_init1 failed: {os.strerror(ctypes.get_errno())}")
+        self._dirs: Dict[int, str] = {}
+        try:
+            self._add_tree(folder)
+        except OSError:
+            self.close()
+            raise
+
+    def _add_watch(self, directory: str) -> None:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), _WATCH_MASK)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, f"Cannot watch {directory}: {os.strerror(errno)}")
+        self._dirs[wd] = directory
+
+    def _add_tree(self, directory: str) -> List[str]:
+        """
+        Watches directory and its subdirectories; returns the files found in them.
+        """
+        files = []
+        for root, dirs, names in os.walk(directory):
+            dirs[:] = [d for d in dirs if not self.ignore(os.path.join(root, d))]
+            self._add_watch(root)
+            files.extend(os.path.join(root, name) for name in names)
+        return files
+
+    def read_changes(self, timeout: float) -> List[str]:
+        if self._fd < 0:
+            return []
+        readable, _, _ = select.select([self._fd], [], [], max(timeout, 0))
+        if not readable:
+            return []
+        changes: List[str] = []
+        while True:
+            try:
+                data = os.read(self._fd, 1 << 16)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+                name = data[offset + _EVENT_HEADER.size:offset + _EVENT_HEADER.size + length].rstrip(b"\0")
+                offset += _EVENT_HEADER.size + length
+                changes.extend(self._handle_event(wd, mask, os.fsdecode(name)))
+        return [path for path in dict.fromkeys(changes) if path == RESCAN or not self.ignore(path)]
+
+    def _handle_event(self, wd: int, mask: int, name: str) -> List[str]:
+        if mask & _IN_Q_OVERFLOW:
+            return [RESCAN]
+        if mask & _IN_IGNORED:
+            self._dirs.pop(wd, None)
+            return []
+        directory = self._dirs.get(wd)
+        if directory is None:
+            return []
+        if mask & (_IN_DELETE_SELF | _IN_MOVE_SELF):
+            # Subdirectories are reported through their parent's event; the watch goes away with IN_IGNORED.
+            # Outputs are kept if the watched folder itself disappears, e.g. when its file system is unmounted.
+            if directory == self.folder:
+                warnings.warn(f"Watched folder {self.folder} was removed or moved; no further changes will be seen.")
+            return []
+        path = os.path.join(directory, name)
+        if mask & _IN_ISDIR:
+            if mask & (_IN_CREATE | _IN_MOVED_TO) and not self.ignore(path):
+                try:
+                    return self._add_tree(path)
+                except OSError as e:
+                    # e.g. removed again right away, or out of watches (fs.inotify.max_user_watches)
+                    warnings.warn(f"Cannot watch new directory {path}: {e}")
+                    return [RESCAN] if os.path.isdir(path) else []
+            if mask & (_IN_DELETE | _IN_MOVED_FROM):
+                return [path]
+            return []
+        return [path]
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+            self._dirs = {}
+
+
+class PollingWatcher(BaseWatcher):
+    """
+    Finds changes by listing the folder through a file handler every poll_interval seconds and comparing
+    sizes and modification times. Works on any platform and file system, at the cost of a listing per poll.
+
+    Args:
+        file_handler (BaseFileConnector): connector used to list and stat files
+        poll_interval (float): seconds between two listings
+    """
+
+    def __init__(
+        self,
+        folder: str,
+        file_handler: BaseFileConnector,
+        poll_interval: float = 5.0,
+        ignore: Optional[Callable[[str], bool]] = None,
+    ):
+        super().__init__(folder, ignore)
+        if poll_interval <= 0:
+            raise ValueError("poll_interval must be a positive number.")
+        self.file_handler = file_handler
+        self.poll_interval = poll_interval
+        self._snapshot = self._scan()
+        self._next_poll = time.monotonic() + poll_interval
+
+    def _scan(self) -> Dict[str, Tuple[int, float]]:
+        snapshot = {}
+        for path in self.file_handler.iter_files(self.folder):
+            if self.ignore(path):
+                continue
+            try:
+                snapshot[path] = (self.file_handler.get_file_size(path), self.file_handler.get_file_mtime(path))
+            except FileNotFoundError:
+                # Deleted while listing
+                continue
+        return snapshot
+
+    def read_changes(self, timeout: float) -> List[str]:
+        wait = self._next_poll - time.monotonic()
+        if wait > timeout:
+            time.sleep(max(timeout, 0))
+            return []
+        time.sleep(max(wait, 0))
+        self._next_poll = time.monotonic() + self.poll_interval
+        snapshot = self._scan()
+        changes = [path for path, stat in snapshot.items() if self._snapshot.get(path) != stat]
+        changes.extend(path for path in self._snapshot if path not in snapshot)
+        self._snapshot = snapshot
+        return changes
+
+
+def create_watcher(
+    folder: str,
+    file_handler: BaseFileConnector,
+    poll_interval: float = 5.0,
+    polling: bool = False,
+    ignore: Optional[Callable[[str], bool]] = None,
+) -> BaseWatcher:
+    """
+    Returns an InotifyWatcher for local folders on Linux, or a PollingWatcher if polling is requested,
+    the folder is remote, or inotify is unavailable (other platforms, exhausted watch limits).
+    """
+    if not polling and not file_handler.is_remote:
+        try:
+            return InotifyWatcher(folder, ignore)
+        except OSError as e:
+            warnings.warn(f"Falling back to polling every {poll_interval}s: {e}")
+    return PollingWatcher(folder, file_handler, poll_interval, ignore)
+
+
+class Debouncer:
+    """
+    Collects changed paths and releases each one once it has seen no new event for delay seconds,
+    so that a file being written, copied or saved in several steps is converted once, after the last write.
+
+    Args:
+        delay (float): quiet period in seconds
+    """
+
+    def __init__(self, delay: float):
+        if delay < 0:
+            raise ValueError("delay must be a non-negative number.")
+        self.delay = delay
+        self._pending: Dict[str, float] = {}
+
+    def add(self, paths: List[str], now: Optional[float] = None) -> None:
+        now = time.monotonic() if now is None else now
+        for path in paths:
+            self._pending[path] = now
+
+    def pop_due(self, now: Optional[float] = None) -> Set[str]:
+        """
+        Removes and returns the paths that have been quiet for at least delay seconds.
+        """
+        now = time.monotonic() if now is None else now
+        due = {path for path, last_event in self._pending.items() if now - last_event >= self.delay}
+        for path in due:
+            del self._pending[path]
+        return due
+
+    def time_to_next(self, now: Optional[float] = None) -> Optional[float]:
+        """
+        Seconds until the next pending path is due, or None if nothing is pending.
+        """
+        if not self._pending:
+            return None
+        now = time.monotonic() if now is None else now
+        return max(min(self._pending.values()) + self.delay - now, 0.0)
+
+    def __len__(self) -> int:
+        return len(self._pending)
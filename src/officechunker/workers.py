@@ -0,0 +1,357 @@
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from officechunker.chunkers import TARGET_TOKEN_COUNTER, configure_chunker_registry, configure_target_tokenizer, get_chunker
+from officechunker.parse_cache import cached_parse, cached_parse_stream, configure_parse_cache
+from officechunker.process import (
+    get_markitdown,
+    iter_xlsx_batches,
+    join_parts,
+    parse_part_to_md,
+    parse_stream_to_md,
+    parse_to_md,
+)
+from officechunker.sinks import chunk_to_record
+from officechunker.utils import get_peak_rss_bytes
+
+
+# Writes kept .md files while the worker goes on chunking; threads are started on first use
+_md_writer = ThreadPoolExecutor(max_workers=2, thread_name_prefix="officechunker-md")
+
+
+def init_worker(
+    chunker_specs: List[Tuple[str, Dict[str, Any]]],
+    chunker_cache_size: Optional[int] = None,
+    chunker_cache_memory: Optional[int] = None,
+    embedding_options: Optional[Dict[str, Any]] = None,
+    target_tokenizer: Optional[str] = None,
+    parse_cache_options: Optional[Dict[str, Any]] = None,
+) -> None:
+    """
+    Process pool initializer: builds the MarkItDown instance and every configured chunker
+    once, so that they are reused for all files handled by this worker.
+
+    Args:
+        chunker_specs: List of (chunker_type, chunker_params) pairs used by the Converter.
+        chunker_cache_size: LRU size of the worker's chunker registry.
+        chunker_cache_memory: Memory cap in bytes of the worker's chunker registry.
+        embedding_options: Keyword arguments for configure_embedding_batching.
+        target_tokenizer: Tokenizer of the "target_token_count" of every chunk record, see TargetTokenCounter.
+        parse_cache_options: Keyword arguments for configure_parse_cache.
+    """
+    configure_chunker_registry(max_size=chunker_cache_size, max_memory=chunker_cache_memory)
+    configure_target_tokenizer(target_tokenizer)
+    configure_parse_cache(**(parse_cache_options or {}))
+    from officechunker.embeddings import configure_embedding_batching
+
+    configure_embedding_batching(**(embedding_options or {}))
+    get_markitdown()
+    for chunker_type, chunker_params in chunker_specs:
+        try:
+            get_chunker(chunker_type, **chunker_params)
+        except Exception:
+            # Leave it to the first file that needs this chunker to report the error,
+            # instead of breaking the whole pool.
+            pass
+
+
+def _write_text(path: str, text: str) -> float:
+    started = time.perf_counter()
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+    return time.perf_counter() - started
+
+
+def convert_file(
+    file_path: str,
+    chunker_type: str,
+    chunker_params: Dict[str, Any],
+    md_file_path: Optional[str] = None,
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Converts a single file to markdown and chunks the markdown in memory.
+    Runs inside the executor: only paths go in, and chunk records (see chunk_to_record)
+    plus the worker-side stats (see _stats) come out.
+
+    If md_file_path is given, the markdown is also written there (see convert_markdown).
+    """
+    # Step 1: Convert file to markdown, unless the parse cache has it
+    started = time.perf_counter()
+    result, cached = cached_parse(file_path, _get_extension(file_path), lambda: parse_to_md(file_path))
+    return convert_markdown(
+        result, chunker_type, chunker_params, md_file_path, time.perf_counter() - started, parse_cache_hits=int(cached)
+    )
+
+
+def parse_file_part(file_path: str, start: int, end: Optional[int] = None) -> Tuple[str, float, bool]:
+    """
+    Parses pages (PDF) or sheets (xlsx) [start, end) of a large file, see parse_part_to_md.
+    Returns the markdown fragment, the parse time and whether the fragment came from the parse cache.
+    """
+    started = time.perf_counter()
+    variant = f"{_get_extension(file_path)}:{start}:{end}"
+    markdown, cached = cached_parse(file_path, variant, lambda: parse_part_to_md(file_path, start, end))
+    return markdown, time.perf_counter() - started, cached
+
+
+def convert_parts(
+    parts: List[str],
+    file_extension: str,
+    chunker_type: str,
+    chunker_params: Dict[str, Any],
+    md_file_path: Optional[str] = None,
+    parse_seconds: float = 0.0,
+    parse_cache_hits: int = 0,
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Stitches the parts of a file parsed by parse_file_part and chunks the whole document,
+    so that chunk offsets refer to the stitched markdown.
+    """
+    return convert_markdown(
+        join_parts(parts, file_extension), chunker_type, chunker_params, md_file_path, parse_seconds, parse_cache_hits
+    )
+
+
+def convert_markdown(
+    markdown: str,
+    chunker_type: str,
+    chunker_params: Dict[str, Any],
+    md_file_path: Optional[str] = None,
+    parse_seconds: float = 0.0,
+    parse_cache_hits: int = 0,
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Chunks already parsed markdown and returns the chunk records and the worker-side stats.
+
+    If md_file_path is given, the markdown is also written there on a helper thread,
+    overlapping with chunking instead of blocking it.
+    """
+    # Start writing the markdown file only if it is kept
+    md_writer = None
+    if md_file_path is not None:
+        md_writer = _md_writer.submit(_write_text, md_file_path, markdown)
+
+    # Chunk the markdown directly from memory
+    started = time.perf_counter()
+    records = chunk_markdown(markdown, chunker_type, chunker_params)
+    chunk_seconds = time.perf_counter() - started
+
+    md_write_seconds = md_writer.result() if md_writer is not None else None
+    return records, _stats(markdown, parse_seconds, chunk_seconds, md_write_seconds, parse_cache_hits)
+
+
+def convert_stream(
+    data: bytes,
+    file_extension: str,
+    chunker_type: str,
+    chunker_params: Dict[str, Any],
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Converts in-memory file content to markdown and chunks it, without touching disk
+    (other than the parse cache, if configured).
+    """
+    started = time.perf_counter()
+    result, cached = cached_parse_stream(data, file_extension, lambda: parse_stream_to_md(data, file_extension))
+    return convert_markdown(
+        result, chunker_type, chunker_params, parse_seconds=time.perf_counter() - started, parse_cache_hits=int(cached)
+    )
+
+
+def _batch_token_counter(chunker_instance: Any) -> Callable[[str], int]:
+    """
+    Returns the token counter that sizes the batches of convert_xlsx_streaming: the chunker's tokenizer,
+    else the target tokenizer, else a word count.
+    """
+    tokenizer = getattr(chunker_instance, "tokenizer", None)
+    if tokenizer is not None:
+        return tokenizer.count_tokens
+    if TARGET_TOKEN_COUNTER.tokenizer_name is not None:
+        return lambda text: TARGET_TOKEN_COUNTER.count([text])[0]
+    return lambda text: len(text.split())
+
+
+def _split_xlsx_batch(
+    batch: str, records: List[Dict[str, Any]], chunker_instance: Any
+) -> List[Tuple[str, List[Dict[str, Any]]]]:
+    """
+    Returns (batch, chunk records) pairs for a batch of iter_xlsx_batches that came out as records. A batch of
+    several chunks is split by rows into smaller batches, each starting with the sheet name and header row again,
+    until each one is a single chunk or a single row, so that every chunk carries the header.
+    """
+    # Sheet name, header row and separator, then the rows
+    lines = batch.rstrip("\n").split("\n")
+    header, rows = lines[:3], lines[3:]
+    if len(records) <= 1 or len(rows) < 2:
+        return [(batch, records)]
+    parts = min(len(records), len(rows))
+    pieces: List[Tuple[str, List[Dict[str, Any]]]] = []
+    for i in range(parts):
+        piece = "\n".join(header + rows[len(rows) * i // parts:len(rows) * (i + 1) // parts]) + "\n\n"
+        pieces.extend(_split_xlsx_batch(piece, chunks_to_records(chunker_instance(piece), chunker_instance, piece), chunker_instance))
+    return pieces
+
+
+def convert_xlsx_streaming(
+    file_path: str,
+    chunker_type: str,
+    chunker_params: Dict[str, Any],
+    spool_path: str,
+    md_file_path: Optional[str] = None,
+) -> Tuple[int, Dict[str, Any]]:
+    """
+    Converts and chunks a large xlsx workbook with bounded memory: rows are read in batches
+    sized to the chunker's chunk_size (see iter_xlsx_batches), each batch is chunked right away
+    and its chunk records are appended to spool_path as JSON lines instead of being kept in memory.
+    Every chunk starts with its sheet's name and header row (see _split_xlsx_batch).
+
+    Chunk offsets refer to the concatenation of all batches, which is also what is written to
+    md_file_path if given. Returns the number of chunks and the worker-side stats.
+    """
+    chunker_instance = get_chunker(chunker_type, **chunker_params)
+    max_tokens = getattr(chunker_instance, "chunk_size", None)
+    estimate_tokens = _batch_token_counter(chunker_instance)
+
+    # The estimate may count tokens differently from the chunker (e.g. words instead of tokens); when a batch
+    # still comes out as several chunks, it is scaled up so that later batches fit one chunk.
+    scale = [1.0]
+
+    def count_tokens(text: str) -> float:
+        return estimate_tokens(text) * scale[0]
+
+    parse_seconds = chunk_seconds = md_write_seconds = 0.0
+    offset = 0
+    count = 0
+    md_file = open(md_file_path, "w", encoding="utf-8") if md_file_path is not None else None
+    try:
+        with open(spool_path, "w", encoding="utf-8") as spool:
+            batches = iter_xlsx_batches(file_path, max_tokens, count_tokens if max_tokens is not None else None)
+            while True:
+                started = time.perf_counter()
+                batch = next(batches, None)
+                parse_seconds += time.perf_counter() - started
+                if batch is None:
+                    break
+
+                started = time.perf_counter()
+                records = chunks_to_records(chunker_instance(batch), chunker_instance, batch)
+                if len(records) > 1:
+                    estimate = estimate_tokens(batch)
+                    if max_tokens is not None and estimate > 0:
+                        scale[0] = max(scale[0], 1.05 * sum(record["token_count"] or 0 for record in records) / estimate)
+                    pieces = _split_xlsx_batch(batch, records, chunker_instance)
+                else:
+                    pieces = [(batch, records)]
+                lines = []
+                for piece, piece_records in pieces:
+                    for record in piece_records:
+                        for key in ("start_index", "end_index"):
+                            if record[key] is not None:
+                                record[key] += offset
+                        lines.append(json.dumps(record, ensure_ascii=False) + "\n")
+                    offset += len(piece)
+                spool.write("".join(lines))
+                chunk_seconds += time.perf_counter() - started
+                count += len(lines)
+
+                if md_file is not None:
+                    started = time.perf_counter()
+                    md_file.write("".join(piece for piece, _ in pieces))
+                    md_write_seconds += time.perf_counter() - started
+    finally:
+        if md_file is not None:
+            md_file.close()
+
+    stages = {"parse": parse_seconds, "chunk": chunk_seconds}
+    if md_file_path is not None:
+        stages["md_write"] = md_write_seconds
+    return count, {"stages": stages, "chars_out": offset, "worker_peak_rss": get_peak_rss_bytes()}
+
+
+def chunk_markdown(markdown: str, chunker_type: str, chunker_params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Chunks markdown text with this worker's cached chunker and returns the chunk records.
+    """
+    chunker_instance = get_chunker(chunker_type, **chunker_params)
+    return chunks_to_records(chunker_instance(markdown), chunker_instance, markdown)
+
+
+def _is_span(markdown: str, record: Dict[str, Any], allow_prefix: bool) -> bool:
+    """
+    Whether a record's start/end offsets point to its text in markdown. With allow_prefix, the text may start
+    with repeated headers before that span (see StructuralChunker's repeat_headers).
+    """
+    start, end = record["start_index"], record["end_index"]
+    if not isinstance(start, int) or not isinstance(end, int) or not 0 <= start <= end <= len(markdown):
+        return False
+    span = markdown[start:end]
+    return record["text"] == span or (allow_prefix and start < end and record["text"].endswith(span))
+
+
+def _align_offsets(records: List[Dict[str, Any]], markdown: str, allow_prefix: bool) -> None:
+    """
+    Replaces chunk offsets that do not point to the chunk's text in markdown (e.g. chonkie's WordChunker
+    gives start_index -1 to chunks with overlap) by the next occurrence of the text after the previous chunk's
+    start, or by None if the text is not found, so that markdown[start_index:end_index] can be trusted.
+    """
+    search_from = 0
+    for record in records:
+        if record["start_index"] is None and record["end_index"] is None:
+            continue
+        if not _is_span(markdown, record, allow_prefix):
+            start = markdown.find(record["text"], search_from)
+            if start < 0:
+                record["start_index"] = record["end_index"] = None
+                continue
+            record["start_index"], record["end_index"] = start, start + len(record["text"])
+        search_from = record["start_index"] + 1
+
+
+def chunks_to_records(chunks: List[Any], chunker_instance: Any, markdown: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Converts a chunker's output into chunk records (see chunk_to_record). Token counts that the chunks
+    do not carry (return_type="texts") are counted with the chunker's own tokenizer, and with a target
+    tokenizer configured, each record also gets its "target_token_count" from the same pass.
+    If markdown is the chunked text, offsets are checked against it (see _align_offsets).
+    """
+    records = [chunk_to_record(chunk) for chunk in chunks]
+    if markdown is not None:
+        _align_offsets(records, markdown, getattr(chunker_instance, "repeat_headers", False))
+    missing = [record for record in records if record["token_count"] is None]
+    tokenizer = getattr(chunker_instance, "tokenizer", None)
+    if missing and tokenizer is not None:
+        for record, count in zip(missing, tokenizer.count_tokens_batch([record["text"] for record in missing])):
+            record["token_count"] = int(count)
+    target_counts = TARGET_TOKEN_COUNTER.count([record["text"] for record in records])
+    if target_counts is not None:
+        for record, count in zip(records, target_counts):
+            record["target_token_count"] = count
+    return records
+
+
+def _stats(
+    markdown: str,
+    parse_seconds: float,
+    chunk_seconds: float,
+    md_write_seconds: Optional[float] = None,
+    parse_cache_hits: int = 0,
+) -> Dict[str, Any]:
+    """
+    Worker-side measurements of one file: stage timings, markdown size, parse cache hits and the worker's peak RSS.
+    """
+    stages = {"parse": parse_seconds, "chunk": chunk_seconds}
+    if md_write_seconds is not None:
+        stages["md_write"] = md_write_seconds
+    return {
+        "stages": stages,
+        "chars_out": len(markdown),
+        "parse_cache_hits": parse_cache_hits,
+        "worker_peak_rss": get_peak_rss_bytes(),
+    }
+
+
+def _get_extension(file_path: str) -> str:
+    # MarkItDown picks its converter by extension, so the same content may parse differently under another one
+    return os.path.splitext(file_path)[1].lower()
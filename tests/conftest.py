@@ -0,0 +1,8 @@
+import os
+import sys
+
+# The package is not installed: import it from src, and the benchmarks helpers from the repository root
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (os.path.join(ROOT, "src"), ROOT):
+    if path not in sys.path:
+        sys.path.insert(0, path)
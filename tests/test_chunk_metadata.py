@@ -0,0 +1,101 @@
+import json
+import random
+
+import pytest
+
+from benchmarks.corpus import make_paragraphs
+from benchmarks.run import offline_chunker_params, offline_chunkers
+from officechunker.chunkers import CHONKER_MAP, DEFAULT_PARAMS
+from officechunker.converter import Converter
+from officechunker.workers import chunk_markdown
+
+
+def _markdown():
+    paragraphs = make_paragraphs(30, random.Random(1))
+    rows = "".join(f"| {i} | {paragraphs[i][:30]} |\n" for i in range(20))
+    return (
+        "# Report\n\n" + "\n\n".join(paragraphs[:15]) + "\n\n## Table\n\n| Id | Note |\n| --- | --- |\n" + rows
+        + "\n## Notes\n\n" + "\n\n".join(paragraphs[15:]) + "\n"
+    )
+
+
+@pytest.mark.parametrize("chunker_type", list(CHONKER_MAP))
+def test_offsets_point_to_the_chunk_text(chunker_type):
+    params = offline_chunker_params(chunker_type)
+    if params is None:
+        pytest.skip("no offline stand-in for this chunker")
+    params = {**params, "chunk_size": 64}
+    if "chunk_overlap" in DEFAULT_PARAMS[chunker_type]:
+        # chonkie's WordChunker reports wrong offsets for overlapping chunks
+        params["chunk_overlap"] = 20
+    if chunker_type == "structural":
+        params["repeat_headers"] = False
+    markdown = _markdown()
+    with offline_chunkers():
+        records = chunk_markdown(markdown, chunker_type, params)
+
+    assert len(records) > 1
+    for record in records:
+        assert record["start_index"] is not None
+        assert markdown[record["start_index"]:record["end_index"]] == record["text"]
+
+
+def test_repeated_headers_come_before_the_span():
+    markdown = _markdown()
+    records = chunk_markdown(markdown, "structural", {"tokenizer_or_token_counter": "word", "chunk_size": 64})
+    assert any(markdown[r["start_index"]:r["end_index"]] != r["text"] for r in records)
+    for record in records:
+        span = markdown[record["start_index"]:record["end_index"]]
+        assert span and record["text"].endswith(span)
+
+
+def _convert(tmp_path, name, **options):
+    src = tmp_path / "src"
+    if not src.exists():
+        src.mkdir()
+        (src / "notes.txt").write_text(_markdown(), encoding="utf-8")
+    dst = tmp_path / name
+    Converter(
+        str(src),
+        dst_folder=str(dst),
+        chunker_config={".txt": {"type": "word", "params": {"tokenizer_or_token_counter": "word", "chunk_size": 64, "chunk_overlap": 0}}},
+        **options,
+    ).convert()
+    return dst
+
+
+def _front_matter(path):
+    header, text = path.read_text(encoding="utf-8").removeprefix("---\n").split("---\n", 1)
+    fields = dict(line.split(": ", 1) for line in header.splitlines())
+    return {key: json.loads(value) for key, value in fields.items()}, text
+
+
+def test_front_matter_and_sidecar_hold_the_same_metadata(tmp_path):
+    front_matter = _convert(tmp_path, "front_matter", chunk_metadata="front_matter")
+    sidecar = _convert(tmp_path, "sidecar", chunk_metadata="sidecar")
+    jsonl = _convert(tmp_path, "jsonl", output_format="jsonl")
+
+    lines = [json.loads(line) for line in (sidecar / "notes.txt_chunks.jsonl").read_text(encoding="utf-8").splitlines()]
+    records = [json.loads(line) for line in (jsonl / "chunks.jsonl").read_text(encoding="utf-8").splitlines()]
+    assert len(lines) == len(records) > 1
+    for line, record in zip(lines, records):
+        metadata, text = _front_matter(front_matter / line["file"])
+        assert metadata == {key: value for key, value in record.items() if key != "text"}
+        assert {key: value for key, value in line.items() if key != "file"} == metadata
+        assert (sidecar / line["file"]).read_text(encoding="utf-8") == text == record["text"]
+        assert metadata["source"] == "notes.txt"
+        assert 0 < metadata["token_count"] <= 64
+
+
+def test_target_tokenizer_counts_every_chunk(tmp_path):
+    dst = _convert(tmp_path, "dst", output_format="jsonl", target_tokenizer="character")
+    records = [json.loads(line) for line in (dst / "chunks.jsonl").read_text(encoding="utf-8").splitlines()]
+    assert records
+    assert all(record["target_token_count"] == len(record["text"]) for record in records)
+
+
+def test_chunk_metadata_only_applies_to_md(tmp_path):
+    with pytest.raises(ValueError, match="chunk_metadata"):
+        Converter(str(tmp_path), dst_folder=str(tmp_path / "out"), output_format="jsonl", chunk_metadata="sidecar")
+    with pytest.raises(ValueError, match="chunk_metadata"):
+        Converter(str(tmp_path), dst_folder=str(tmp_path / "out"), chunk_metadata="inline")
@@ -0,0 +1,47 @@
+import pytest
+
+from officechunker.chunkers import DEFAULT_PARAMS, ChunkerRegistry, chunker_cache_key
+
+
+WORD = {"tokenizer_or_token_counter": "word", "chunk_overlap": 0}
+
+
+def test_omitted_and_explicit_defaults_share_one_key():
+    explicit = {**WORD, "chunk_size": DEFAULT_PARAMS["word"]["chunk_size"]}
+    assert chunker_cache_key("word", WORD) == chunker_cache_key("word", explicit)
+    assert chunker_cache_key("word", WORD) != chunker_cache_key("word", {**WORD, "chunk_size": 64})
+    assert chunker_cache_key("word", WORD) != chunker_cache_key("sentence", WORD)
+    # Unhashable values such as lists are keyed too
+    assert chunker_cache_key("sentence", {**WORD, "delim": [".", "\n"]}) == chunker_cache_key("sentence", {**WORD, "delim": [".", "\n"]})
+
+
+def test_registry_reuses_instances():
+    registry = ChunkerRegistry()
+    chunker = registry.get("word", **WORD)
+    assert registry.get("word", **WORD, chunk_size=DEFAULT_PARAMS["word"]["chunk_size"]) is chunker
+    assert registry.get("word", **WORD, chunk_size=64) is not chunker
+    assert len(registry) == 2
+
+
+def test_registry_evicts_the_least_recently_used():
+    registry = ChunkerRegistry(max_size=2)
+    first = registry.get("word", **WORD, chunk_size=16)
+    registry.get("word", **WORD, chunk_size=32)
+    # Using the first chunker makes the second one the least recently used
+    assert registry.get("word", **WORD, chunk_size=16) is first
+    registry.get("word", **WORD, chunk_size=64)
+
+    assert ("word", {**WORD, "chunk_size": 16}) in registry
+    assert ("word", {**WORD, "chunk_size": 32}) not in registry
+    assert ("word", {**WORD, "chunk_size": 64}) in registry
+
+    registry.configure(max_size=1)
+    assert len(registry) == 1
+    assert ("word", {**WORD, "chunk_size": 64}) in registry
+
+
+def test_registry_rejects_invalid_limits():
+    with pytest.raises(ValueError):
+        ChunkerRegistry(max_size=0)
+    with pytest.raises(ValueError):
+        ChunkerRegistry(max_memory=-1)
@@ -0,0 +1,59 @@
+import os
+import random
+
+import pytest
+
+from benchmarks.corpus import make_paragraphs
+from officechunker.converter import Converter
+
+
+CONFIG = {".txt": {"type": "word", "params": {"tokenizer_or_token_counter": "word", "chunk_size": 40, "chunk_overlap": 0}}}
+
+
+def _write_sources(src):
+    rng = random.Random(0)
+    for name in ("a.txt", os.path.join("reports", "2024", "b.txt")):
+        path = src / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("\n\n".join(make_paragraphs(6, rng)), encoding="utf-8")
+
+
+def _tree(folder):
+    return sorted(str(path.relative_to(folder)) for path in folder.rglob("*") if path.is_file())
+
+
+def _snapshot(folder):
+    return {name: ((folder / name).stat().st_mtime, (folder / name).read_bytes()) for name in _tree(folder)}
+
+
+def test_sources_are_read_in_place_and_outputs_mirror_the_tree(tmp_path):
+    src = tmp_path / "src"
+    _write_sources(src)
+    before = _snapshot(src)
+
+    Converter(str(src), dst_folder=str(tmp_path / "dst"), chunker_config=CONFIG).convert()
+
+    assert _snapshot(src) == before
+    outputs = _tree(tmp_path / "dst")
+    assert outputs
+    # Only chunk files, in the same directories as their sources
+    assert all(name.endswith(".md") for name in outputs)
+    assert {os.path.dirname(name) for name in outputs} == {"", os.path.join("reports", "2024")}
+    assert os.path.join("reports", "2024", "b.txt_1.md") in outputs
+
+
+def test_copy_source_writes_the_same_outputs(tmp_path):
+    src = tmp_path / "src"
+    _write_sources(src)
+    before = _snapshot(src)
+
+    Converter(str(src), dst_folder=str(tmp_path / "in_place"), chunker_config=CONFIG).convert()
+    Converter(str(src), dst_folder=str(tmp_path / "copied"), chunker_config=CONFIG, copy_source=True).convert()
+
+    assert _snapshot(src) == before
+    assert _tree(tmp_path / "copied") == _tree(tmp_path / "in_place")
+
+
+def test_copy_source_cannot_be_incremental(tmp_path):
+    with pytest.raises(ValueError, match="copy_source"):
+        Converter(str(tmp_path), dst_folder=str(tmp_path / "out"), copy_source=True, incremental=True)
@@ -0,0 +1,94 @@
+import json
+import random
+
+from benchmarks.corpus import make_paragraphs
+from officechunker.converter import Converter
+from officechunker.dedup import ChunkDeduplicator, DuplicateLog
+
+
+PARAGRAPHS = [
+    "Quarterly revenue grew in every region, led by strong demand for the new service plans.",
+    "The audit found no material issues, and the remaining action items are due next month.",
+    "Supplier contracts were renegotiated, lowering delivery costs for the coming budget year.",
+]
+
+
+def _records(*texts):
+    return [{"text": text} for text in texts]
+
+
+def test_exact_deduplication_ignores_whitespace():
+    dedup = ChunkDeduplicator("exact")
+    kept = dedup.filter(_records("a  b\nc", "a b c", "d"))
+    assert [r["text"] for r in kept] == ["a  b\nc", "d"]
+    assert dedup.filter(_records(" a b c ")) == []
+
+
+def test_near_deduplication_drops_similar_chunks():
+    dedup = ChunkDeduplicator("near", threshold=0.8)
+    first, second = make_paragraphs(2, random.Random(0))
+    words = first.split()
+    assert len(dedup.filter(_records(first))) == 1
+    assert dedup.filter(_records(" ".join(words[:-1] + ["changed."]))) == []
+    assert len(dedup.filter(_records(second))) == 1
+
+
+def test_state_is_carried_over_to_a_new_deduplicator():
+    paragraphs = make_paragraphs(3, random.Random(0))
+    dedup = ChunkDeduplicator("near", threshold=0.8)
+    dedup.filter(_records(*paragraphs), source="a.txt")
+    state = json.loads(json.dumps(dedup.pop_state("a.txt")))
+    assert dedup.pop_state("a.txt")["chunks"] == ""
+
+    restored = ChunkDeduplicator("near", threshold=0.8)
+    restored.load_state(state)
+    near_copy = " ".join(paragraphs[2].split()[:-1] + ["changed."])
+    assert restored.filter(_records(paragraphs[1], near_copy)) == []
+    exact = ChunkDeduplicator("exact")
+    exact.load_state(state)
+    assert exact.filter(_records(paragraphs[1])) == []
+
+
+def test_duplicate_log_restore_keeps_completed_sources(tmp_path):
+    log = DuplicateLog(str(tmp_path / "duplicates.jsonl"))
+    log.write("b.txt", "a.txt", "1")
+    log.write("c.txt", "a.txt", "1")
+    log.restore(lambda source: source == "b.txt")
+    lines = (tmp_path / "duplicates.jsonl").read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["source"] for line in lines] == ["b.txt"]
+
+
+def _convert(src, dst, **options):
+    Converter(
+        src_folder=str(src),
+        dst_folder=str(dst),
+        # One chunk per sentence
+        chunker_config={
+            ".txt": {"type": "sentence", "params": {"tokenizer_or_token_counter": "word", "chunk_size": 1, "chunk_overlap": 0}}
+        },
+        output_format="jsonl",
+        resume=True,
+        checkpoint_every=1,
+        **options,
+    ).convert()
+    # Resumable runs number their output files
+    return [json.loads(line) for path in sorted(dst.glob("chunks*.jsonl")) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_resumed_run_keeps_deduplicating_against_completed_files(tmp_path):
+    src = tmp_path / "src"
+    src.mkdir()
+    (src / "a.txt").write_text("\n\n".join(PARAGRAPHS), encoding="utf-8")
+    first = _convert(src, tmp_path / "dst", dedup_files=True, dedup_chunks="exact")
+    assert {r["source"] for r in first} == {"a.txt"}
+
+    # Added after the interruption: a copy of a.txt and a file repeating one of its paragraphs
+    (src / "b.txt").write_text("\n\n".join(PARAGRAPHS), encoding="utf-8")
+    (src / "c.txt").write_text(PARAGRAPHS[1] + "\n\nA new paragraph that was not converted before.", encoding="utf-8")
+    records = _convert(src, tmp_path / "dst", dedup_files=True, dedup_chunks="exact")
+
+    assert [r for r in records if r["source"] == "a.txt"] == first
+    assert not [r for r in records if r["source"] == "b.txt"]
+    assert [r["text"].strip() for r in records if r["source"] == "c.txt"] == ["A new paragraph that was not converted before."]
+    duplicates = (tmp_path / "dst" / "duplicates.jsonl").read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["duplicate_of"] for line in duplicates] == ["a.txt"]
@@ -0,0 +1,89 @@
+import threading
+
+import numpy as np
+import pytest
+
+from benchmarks.fake_embeddings import HashingEmbeddings
+from officechunker.chunkers import create_chunker
+from officechunker.embeddings import (
+    BatchedEmbeddings,
+    EmbeddingCache,
+    configure_embedding_batching,
+    get_model_namespace,
+    wrap_chunker_embeddings,
+)
+
+
+class CountingEmbeddings(HashingEmbeddings):
+    def __init__(self):
+        super().__init__()
+        self.batches = []
+
+    def embed_batch(self, texts):
+        self.batches.append(list(texts))
+        return super().embed_batch(texts)
+
+
+def test_concurrent_calls_share_batches():
+    model = CountingEmbeddings()
+    batched = BatchedEmbeddings(model, batch_size=8, max_wait=0.5)
+    texts = [[f"sentence {caller} {i}" for i in range(2)] for caller in range(4)]
+    results = [None] * len(texts)
+    barrier = threading.Barrier(len(texts))
+
+    def embed(caller):
+        barrier.wait()
+        results[caller] = batched.embed_batch(texts[caller])
+
+    threads = [threading.Thread(target=embed, args=(caller,)) for caller in range(len(texts))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # All four callers fit one batch of 8
+    assert len(model.batches) == 1
+    for caller, vectors in enumerate(results):
+        for text, vector in zip(texts[caller], vectors):
+            np.testing.assert_array_equal(vector, model.embed(text))
+
+
+def test_cache_is_shared_across_wrappers(tmp_path):
+    model = CountingEmbeddings()
+    first = BatchedEmbeddings(model, cache=EmbeddingCache(str(tmp_path)), cache_namespace="hashing")
+    vectors = first.embed_batch(["header", "body", "header"])
+    # Duplicates within a call are embedded once
+    assert model.batches == [["header", "body"]]
+
+    again = BatchedEmbeddings(model, cache=EmbeddingCache(str(tmp_path)), cache_namespace="hashing")
+    cached = again.embed_batch(["body", "header"])
+    assert len(model.batches) == 1
+    np.testing.assert_array_equal(cached[0], vectors[1])
+    np.testing.assert_array_equal(cached[1], vectors[0])
+
+    # Another namespace does not see these vectors
+    BatchedEmbeddings(model, cache=EmbeddingCache(str(tmp_path)), cache_namespace="other").embed_batch(["body"])
+    assert model.batches[-1] == ["body"]
+
+
+def test_cache_needs_a_namespace_for_unnamed_models(tmp_path):
+    model = HashingEmbeddings()
+    assert get_model_namespace(model) is None
+    with pytest.raises(ValueError, match="embedding_cache_namespace"):
+        BatchedEmbeddings(model, cache=EmbeddingCache(str(tmp_path)))
+
+    model.model_name_or_path = "hashing-64"
+    assert get_model_namespace(model).endswith(":hashing-64:64")
+
+
+def test_semantic_chunkers_are_wrapped_when_configured(tmp_path):
+    params = {"embedding_model": HashingEmbeddings(), "chunk_size": 64}
+    assert not isinstance(wrap_chunker_embeddings(create_chunker("semantic", **params)).embedding_model, BatchedEmbeddings)
+    configure_embedding_batching(batch_size=16, cache_dir=str(tmp_path), cache_namespace="hashing")
+    try:
+        chunker = wrap_chunker_embeddings(create_chunker("semantic", **params))
+        assert isinstance(chunker.embedding_model, BatchedEmbeddings)
+        assert chunker("One sentence here. Another sentence there. A third one follows.")
+        assert (tmp_path / EmbeddingCache.FILE_NAME).exists()
+    finally:
+        configure_embedding_batching()
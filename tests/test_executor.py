@@ -0,0 +1,62 @@
+import json
+import random
+
+import pytest
+
+from benchmarks.corpus import make_paragraphs, write_pdf
+from officechunker.chunkers import CHUNKER_REGISTRY
+from officechunker.converter import Converter
+from officechunker.workers import init_worker
+
+
+WORD_PARAMS = {"tokenizer_or_token_counter": "word", "chunk_size": 40, "chunk_overlap": 0}
+
+
+def _write_sources(src):
+    src.mkdir()
+    rng = random.Random(0)
+    for i in range(4):
+        (src / f"note_{i}.txt").write_text("\n\n".join(make_paragraphs(6, rng)), encoding="utf-8")
+    write_pdf(str(src / "report.pdf"), make_paragraphs(20, rng))
+
+
+def _convert(src, dst, executor):
+    Converter(
+        src_folder=str(src),
+        dst_folder=str(dst),
+        chunker_config={
+            ".txt": {"type": "word", "params": WORD_PARAMS},
+            ".pdf": {"type": "sentence", "params": WORD_PARAMS},
+        },
+        output_format="jsonl",
+        executor=executor,
+        max_workers=2,
+    ).convert()
+    records = [json.loads(line) for line in (dst / "chunks.jsonl").read_text(encoding="utf-8").splitlines()]
+    return sorted(records, key=lambda r: (r["source"], r["chunk_index"]))
+
+
+def test_process_executor_writes_the_same_chunks_as_threads(tmp_path):
+    src = tmp_path / "src"
+    _write_sources(src)
+    threads = _convert(src, tmp_path / "threads", "thread")
+    processes = _convert(src, tmp_path / "processes", "process")
+
+    assert {r["source"] for r in threads} == {"note_0.txt", "note_1.txt", "note_2.txt", "note_3.txt", "report.pdf"}
+    assert processes == threads
+
+
+def test_init_worker_builds_the_configured_chunkers():
+    CHUNKER_REGISTRY.clear()
+    try:
+        # Chunkers that fail to build are left to the files that need them
+        init_worker([("word", WORD_PARAMS), ("no-such-chunker", {})])
+        assert ("word", WORD_PARAMS) in CHUNKER_REGISTRY
+        assert len(CHUNKER_REGISTRY) == 1
+    finally:
+        CHUNKER_REGISTRY.clear()
+
+
+def test_unknown_executor_is_rejected(tmp_path):
+    with pytest.raises(ValueError, match="executor"):
+        Converter(str(tmp_path), dst_folder=str(tmp_path / "out"), executor="fiber")
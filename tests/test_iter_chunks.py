@@ -0,0 +1,67 @@
+import asyncio
+import io
+import random
+
+import pytest
+
+from benchmarks.corpus import make_paragraphs
+from officechunker.converter import Converter
+from officechunker.workers import chunk_markdown
+
+
+PARAMS = {"tokenizer_or_token_counter": "word", "chunk_size": 40, "chunk_overlap": 0}
+
+
+def _converter(tmp_path):
+    return Converter(
+        str(tmp_path), dst_folder=str(tmp_path / "out"), chunker_config={".txt": {"type": "word", "params": PARAMS}}
+    )
+
+
+def _texts(tmp_path):
+    rng = random.Random(0)
+    texts = ["\n\n".join(make_paragraphs(4, rng)) for _ in range(3)]
+    (tmp_path / "a.txt").write_text(texts[0], encoding="utf-8")
+    (tmp_path / "c.txt").write_bytes(texts[2].encode("utf-8"))
+    return texts
+
+
+def _by_source(chunks):
+    by_source = {}
+    for source, chunk_index, chunk in chunks:
+        by_source.setdefault(source, []).append((chunk_index, chunk))
+    return {source: [chunk for _, chunk in sorted(items, key=lambda item: item[0])] for source, items in by_source.items()}
+
+
+def test_paths_bytes_and_streams_are_chunked_in_memory(tmp_path):
+    texts = _texts(tmp_path)
+    with open(tmp_path / "c.txt", "rb") as stream:
+        chunks = list(_converter(tmp_path).iter_chunks([
+            str(tmp_path / "a.txt"),
+            ("b.txt", texts[1].encode("utf-8")),
+            # Named after the file it was opened from
+            stream,
+            ("d.txt", io.BytesIO(texts[1].encode("utf-8"))),
+        ]))
+
+    by_source = _by_source(chunks)
+    assert set(by_source) == {str(tmp_path / "a.txt"), "b.txt", str(tmp_path / "c.txt"), "d.txt"}
+    assert [r["text"] for r in by_source["b.txt"]] == [r["text"] for r in chunk_markdown(texts[1], "word", PARAMS)]
+    assert by_source["d.txt"] == by_source["b.txt"]
+    assert all(len(records) > 1 for records in by_source.values())
+    assert not (tmp_path / "out").exists()
+
+
+def test_aiter_chunks_yields_the_same_chunks(tmp_path):
+    _texts(tmp_path)
+    sources = [str(tmp_path / "a.txt"), str(tmp_path / "c.txt")]
+
+    async def collect():
+        return [chunk async for chunk in _converter(tmp_path).aiter_chunks(sources)]
+
+    assert _by_source(asyncio.run(collect())) == _by_source(_converter(tmp_path).iter_chunks(sources))
+
+
+def test_errors_name_the_source(tmp_path):
+    with pytest.raises(RuntimeError, match="missing.txt"):
+        list(_converter(tmp_path).iter_chunks([str(tmp_path / "missing.txt")]))
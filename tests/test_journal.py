@@ -0,0 +1,43 @@
+import json
+
+import pytest
+
+from officechunker.journal import CheckpointJournal
+
+
+def test_journal_records_checkpoints(tmp_path):
+    path = str(tmp_path / "journal.jsonl")
+    journal = CheckpointJournal.load(path)
+    journal.record(["a.txt", "b.txt"], {"shard": 0})
+    journal.record(["c.txt"], {"shard": 1})
+    journal.close()
+
+    loaded = CheckpointJournal.load(path)
+    assert loaded.completed == {"a.txt", "b.txt", "c.txt"}
+    assert "b.txt" in loaded and "d.txt" not in loaded
+    assert loaded.sink_state == {"shard": 1}
+
+
+def test_journal_ignores_and_truncates_a_torn_line(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    journal = CheckpointJournal.load(str(path))
+    journal.record(["a.txt"], {"shard": 0})
+    journal.close()
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"sources": ["b.t')
+
+    with pytest.warns(UserWarning):
+        journal = CheckpointJournal.load(str(path))
+    assert journal.completed == {"a.txt"}
+    journal.record(["c.txt"], {"shard": 1})
+    journal.close()
+    assert [json.loads(line)["sources"] for line in path.read_text(encoding="utf-8").splitlines()] == [["a.txt"], ["c.txt"]]
+
+
+def test_journal_reset(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    journal = CheckpointJournal.load(str(path))
+    journal.record(["a.txt"])
+    journal.reset()
+    assert not path.exists()
+    assert len(journal) == 0 and journal.sink_state is None
@@ -0,0 +1,54 @@
+import json
+import os
+
+import pytest
+
+from officechunker.converter import Converter
+from officechunker.manifest import Manifest, manifest_chunker_config
+
+
+def test_manifest_round_trip(tmp_path):
+    path = str(tmp_path / "manifest.json")
+    manifest = Manifest(path)
+    entry = {"hash": "abc", "size": 3, "mtime": 1.5, "chunker": manifest_chunker_config("token", {}), "outputs": ["a_1.md"]}
+    manifest.set("a.txt", entry)
+    manifest.save()
+
+    loaded = Manifest.load(path)
+    assert list(loaded) == ["a.txt"]
+    assert loaded.get("a.txt") == entry
+    assert loaded.remove("a.txt") == entry
+    assert "a.txt" not in loaded
+
+
+def test_manifest_chunker_config_includes_defaults():
+    config = manifest_chunker_config("token", {"chunk_size": 128})
+    assert config["type"] == "token"
+    assert config["params"]["chunk_size"] == 128
+    assert manifest_chunker_config("token", {}) != config
+
+
+@pytest.mark.parametrize("content", ["{not json", json.dumps({"version": 999, "files": {}})])
+def test_unreadable_manifest_is_ignored(tmp_path, content):
+    path = tmp_path / "manifest.json"
+    path.write_text(content, encoding="utf-8")
+    with pytest.warns(UserWarning):
+        manifest = Manifest.load(str(path))
+    assert len(manifest) == 0
+
+
+@pytest.mark.parametrize("incremental", [False, True])
+def test_outputs_of_sources_sharing_a_stem_do_not_collide(tmp_path, incremental):
+    src = tmp_path / "src"
+    src.mkdir()
+    (src / "doc.txt").write_text("A plain text note.", encoding="utf-8")
+    (src / "doc.md").write_text("A markdown note.", encoding="utf-8")
+    Converter(
+        src_folder=str(src),
+        dst_folder=str(tmp_path / "dst"),
+        chunker_config={ext: {"type": "word", "params": {"tokenizer_or_token_counter": "word", "chunk_size": 64, "chunk_overlap": 0}} for ext in (".txt", ".md")},
+        incremental=incremental,
+    ).convert()
+    outputs = sorted(name for name in os.listdir(tmp_path / "dst") if not name.startswith("."))
+    assert outputs == ["doc.md_1.md", "doc.txt_1.md"]
+    assert (tmp_path / "dst" / "doc.txt_1.md").read_text(encoding="utf-8") == "A plain text note."
@@ -0,0 +1,59 @@
+import json
+import random
+
+from benchmarks.corpus import make_paragraphs
+from officechunker.converter import Converter
+from officechunker.metrics import MetricsHook, percentile
+
+
+class RecordingHook(MetricsHook):
+    def __init__(self):
+        self.files = []
+        self.reports = []
+
+    def on_file(self, file_metrics):
+        self.files.append(file_metrics)
+
+    def on_run_end(self, report):
+        self.reports.append(report)
+
+
+def test_percentile_interpolates_between_ranks():
+    assert percentile([], 50) == 0.0
+    assert percentile([1.0, 2.0, 3.0, 4.0], 50) == 2.5
+    assert percentile([1.0, 2.0, 3.0, 4.0], 100) == 4.0
+    assert percentile([5.0], 99) == 5.0
+
+
+def test_report_and_hooks_see_every_file(tmp_path):
+    src = tmp_path / "src"
+    src.mkdir()
+    rng = random.Random(0)
+    for i in range(3):
+        (src / f"note_{i}.txt").write_text("\n\n".join(make_paragraphs(4, rng)), encoding="utf-8")
+    (src / "broken.pdf").write_bytes(b"not a pdf")
+    hook = RecordingHook()
+    report_path = tmp_path / "report.json"
+
+    Converter(
+        str(src),
+        dst_folder=str(tmp_path / "dst"),
+        chunker_config={
+            ".txt": {"type": "word", "params": {"tokenizer_or_token_counter": "word", "chunk_size": 40, "chunk_overlap": 0}}
+        },
+        report_path=str(report_path),
+        metrics_hooks=[hook],
+    ).convert()
+
+    assert sorted((m["source"], m["status"]) for m in hook.files) == [
+        ("broken.pdf", "error"), ("note_0.txt", "converted"), ("note_1.txt", "converted"), ("note_2.txt", "converted")
+    ]
+    assert len(hook.reports) == 1
+    report = json.loads(report_path.read_text(encoding="utf-8"))
+    assert report == json.loads(json.dumps(hook.reports[0]))
+    assert (report["files"], report["converted"], report["errors"]) == (4, 3, 1)
+    txt = report["by_extension"][".txt"]
+    assert txt["chunks"] == sum(m["chunks"] for m in hook.files if m["ext"] == ".txt") > 0
+    assert {"parse", "chunk", "chunk_write"} <= set(txt["stages"])
+    assert set(txt["stages"]["parse"]) == {"p50", "p90", "p99", "max", "total"}
+    assert report["by_extension"][".pdf"]["errors"] == 1
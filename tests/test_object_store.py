@@ -0,0 +1,165 @@
+import asyncio
+import hashlib
+import os
+import shutil
+
+import pytest
+
+from officechunker.converter import Converter
+from officechunker.file_handlers import BaseFileConnector, HttpFileConnector, LocalFileConnector
+from officechunker.object_store import ObjectStoreServer
+
+
+CHUNKER_CONFIG = {
+    ext: {"type": "word", "params": {"tokenizer_or_token_counter": "word", "chunk_size": 64}} for ext in (".txt", ".md")
+}
+
+
+@pytest.fixture
+def store(tmp_path):
+    root = tmp_path / "store"
+    (root / "bucket" / "docs").mkdir(parents=True)
+    for name in ("a", "b"):
+        (root / "bucket" / "docs" / f"{name}.txt").write_text(f"Notes {name}. " * 20, encoding="utf-8")
+    with ObjectStoreServer(str(root)) as server:
+        connector = HttpFileConnector(server.url, "bucket", page_size=1)
+        yield root / "bucket", connector
+        connector.close()
+
+
+def test_listing_pages_through_the_bucket(store):
+    _, connector = store
+    assert sorted(connector.iter_files("")) == ["docs/a.txt", "docs/b.txt"]
+    assert connector.get_file_size("docs/a.txt") == len("Notes a. " * 20)
+    assert connector.is_within("docs/a.txt", "docs")
+    assert not connector.is_within("docs2/a.txt", "docs")
+
+
+def test_uploaded_outputs_are_not_converted_again(store, tmp_path):
+    bucket, connector = store
+    uploads = []
+    # src_folder="" lists the whole bucket, including the outputs uploaded by the first run
+    for run in range(2):
+        Converter(
+            src_folder="",
+            dst_folder=str(tmp_path / f"dst{run}"),
+            file_handler=connector,
+            chunker_config=CHUNKER_CONFIG,
+            upload_folder="out",
+        ).convert()
+        uploads.append(sorted(
+            os.path.relpath(os.path.join(root, name), bucket / "out")
+            for root, _, names in os.walk(bucket / "out")
+            for name in names
+        ))
+    assert uploads[0] and all(path.startswith("docs" + os.sep) for path in uploads[0])
+    assert uploads[1] == uploads[0]
+
+
+def test_upload_folder_must_not_contain_the_sources(store, tmp_path):
+    _, connector = store
+    with pytest.raises(ValueError):
+        Converter(src_folder="docs", dst_folder=str(tmp_path / "dst"), file_handler=connector, upload_folder="")
+
+
+def test_async_listing_and_transfers(store, tmp_path):
+    bucket, connector = store
+
+    async def run():
+        keys = [key async for key in connector.aiter_files("docs")]
+        sizes = [await connector.aget_file_size(key) for key in keys]
+        await connector.adownload("docs/a.txt", str(tmp_path / "a.txt"))
+        await connector.aupload(str(tmp_path / "a.txt"), "copies/a.txt")
+        return keys, sizes, await connector.aget_file_hash("copies/a.txt")
+
+    keys, sizes, digest = asyncio.run(run())
+    assert sorted(keys) == ["docs/a.txt", "docs/b.txt"]
+    assert sizes == [len("Notes a. " * 20)] * 2
+    assert (bucket / "copies" / "a.txt").read_bytes() == (bucket / "docs" / "a.txt").read_bytes()
+    assert digest == hashlib.sha256((bucket / "docs" / "a.txt").read_bytes()).hexdigest()
+
+
+def test_local_connector_async_interface(tmp_path):
+    src = tmp_path / "src"
+    (src / "sub").mkdir(parents=True)
+    (src / "a.txt").write_text("a", encoding="utf-8")
+    (src / "sub" / "b.txt").write_text("bb", encoding="utf-8")
+    connector = LocalFileConnector()
+
+    async def run():
+        paths = [path async for path in connector.aiter_files(str(src))]
+        await connector.aupload(str(src / "sub" / "b.txt"), str(tmp_path / "out" / "b.txt"))
+        return sorted(paths), [await connector.aget_file_size(path) for path in sorted(paths)]
+
+    paths, sizes = asyncio.run(run())
+    connector.close()
+    assert paths == [str(src / "a.txt"), str(src / "sub" / "b.txt")]
+    assert sizes == [1, 2]
+    assert (tmp_path / "out" / "b.txt").read_text(encoding="utf-8") == "bb"
+
+
+class _RecordingConnector(HttpFileConnector):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.calls = []
+
+    async def aiter_files(self, folder_path):
+        self.calls.append("aiter_files")
+        async for key in super().aiter_files(folder_path):
+            yield key
+
+    async def adownload(self, file_path, local_path):
+        self.calls.append("adownload")
+        await super().adownload(file_path, local_path)
+
+    async def aupload(self, local_path, file_path):
+        self.calls.append("aupload")
+        await super().aupload(local_path, file_path)
+
+
+def test_converter_uses_the_async_interface(store, tmp_path):
+    bucket, connector = store
+    recording = _RecordingConnector(connector.endpoint_url, "bucket", page_size=1)
+    try:
+        Converter(
+            src_folder="docs",
+            dst_folder=str(tmp_path / "dst"),
+            file_handler=recording,
+            chunker_config=CHUNKER_CONFIG,
+            upload_folder="out",
+            prefetch=1,
+        ).convert()
+    finally:
+        recording.close()
+    assert recording.calls.count("aiter_files") == 1
+    assert recording.calls.count("adownload") == 2
+    assert recording.calls.count("aupload") == len([name for _, _, names in os.walk(bucket / "out") for name in names])
+
+
+class _MinimalConnector(BaseFileConnector):
+    # Implements only the methods that were abstract before sizes, hashes and folders were added
+    def copy_tree(self, src, dst):
+        shutil.copytree(src, dst)
+
+    def remove_tree(self, path):
+        shutil.rmtree(path)
+
+    def list_files(self, folder_path):
+        return [os.path.join(root, name) for root, _, names in os.walk(folder_path) for name in names]
+
+    def remove_file(self, file_path):
+        os.remove(file_path)
+
+
+def test_connectors_only_need_the_original_methods(tmp_path):
+    src = tmp_path / "src"
+    src.mkdir()
+    (src / "a.txt").write_text("Notes a. " * 20, encoding="utf-8")
+    connector = _MinimalConnector()
+    assert connector.get_file_size(str(src / "a.txt")) == len("Notes a. " * 20)
+    # Incremental runs use the default mtime and hash of local paths
+    for _ in range(2):
+        Converter(
+            src_folder=str(src), dst_folder=str(tmp_path / "dst"), file_handler=connector, chunker_config=CHUNKER_CONFIG, incremental=True
+        ).convert()
+    assert [name for name in os.listdir(tmp_path / "dst") if name.endswith(".md")]
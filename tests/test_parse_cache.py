@@ -0,0 +1,65 @@
+import random
+import sys
+import time
+
+import pytest
+
+import officechunker.cli
+from officechunker.parse_cache import ParseCache
+
+
+def _markdown(seed):
+    # Random hex barely compresses, so every entry takes about the same space
+    return random.Random(seed).randbytes(700).hex()
+
+
+def test_get_or_parse_caches_by_digest_and_variant(tmp_path):
+    cache = ParseCache(str(tmp_path))
+    calls = []
+
+    def parse():
+        calls.append(1)
+        return "# Title"
+
+    assert cache.get_or_parse("digest", ".pdf", parse) == ("# Title", False)
+    assert cache.get_or_parse("digest", ".pdf", parse) == ("# Title", True)
+    assert cache.get_or_parse("digest", ".pdf:0-10", parse) == ("# Title", False)
+    assert len(calls) == 2
+    # Shared with other instances on the same directory, e.g. worker processes
+    assert ParseCache(str(tmp_path)).get(cache.make_key("digest", ".pdf")) == "# Title"
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = ParseCache(str(tmp_path), max_size=3000)
+    for i in range(3):
+        cache.put(cache.make_key(str(i)), _markdown(i))
+        time.sleep(0.01)
+    # Reading entry 0 makes entry 1 the least recently used
+    assert cache.get(cache.make_key("0")) == _markdown(0)
+    time.sleep(0.01)
+    cache.put(cache.make_key("3"), _markdown(3))
+    present = [i for i in range(4) if cache.get(cache.make_key(str(i))) is not None]
+    assert present == [0, 2, 3]
+
+
+def test_entries_larger_than_the_cache_are_not_stored(tmp_path):
+    cache = ParseCache(str(tmp_path), max_size=500)
+    cache.put(cache.make_key("big"), _markdown(0))
+    assert cache.get(cache.make_key("big")) is None
+
+
+def test_invalid_settings(tmp_path):
+    with pytest.raises(ValueError):
+        ParseCache(str(tmp_path), max_size=0)
+    with pytest.raises(ValueError):
+        ParseCache(str(tmp_path), compression_level=10)
+
+
+@pytest.mark.parametrize("value", ["0", "-5", "big"])
+def test_cli_rejects_invalid_max_size(monkeypatch, capsys, value):
+    monkeypatch.setattr(officechunker.cli, "Converter", None)
+    monkeypatch.setattr(sys, "argv", ["officechunker", "docs", "--parse_cache", "cache", "--parse_cache_max_size", value])
+    with pytest.raises(SystemExit) as exit_info:
+        officechunker.cli.main()
+    assert exit_info.value.code == 2
+    assert "--parse_cache_max_size" in capsys.readouterr().err
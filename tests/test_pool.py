@@ -0,0 +1,79 @@
+import os
+import sys
+import time
+
+import pytest
+
+from officechunker.pool import SupervisedPool
+
+
+# Tasks are pickled by reference, so they are defined at module level for the spawned workers to import
+
+
+def _sleep_and_get_pid(seconds):
+    time.sleep(seconds)
+    return os.getpid()
+
+
+def _allocate(size):
+    data = bytearray(size)
+    # Touch every page so that the memory is resident, then stay running until the supervisor checks
+    for i in range(0, size, 4096):
+        data[i] = 1
+    time.sleep(5)
+    return len(data)
+
+
+@pytest.fixture
+def make_pool():
+    pools = []
+
+    def make(**options):
+        pool = SupervisedPool(poll_interval=0.05, **options)
+        pools.append(pool)
+        return pool
+
+    yield make
+    for pool in pools:
+        pool.shutdown(cancel_futures=True)
+
+
+def test_results_and_exceptions(make_pool):
+    pool = make_pool(max_workers=2)
+    assert pool.submit(int, "42").result(timeout=30) == 42
+    with pytest.raises(ValueError):
+        pool.submit(int, "x").result(timeout=30)
+    assert list(pool.map(abs, [-1, -2, 3], timeout=30)) == [1, 2, 3]
+
+
+def test_timeout_replaces_only_the_stuck_worker(make_pool):
+    pool = make_pool(max_workers=2, timeout=1)
+    stuck = pool.submit(time.sleep, 30)
+    quick = [pool.submit(_sleep_and_get_pid, 0.1) for _ in range(4)]
+    with pytest.raises(TimeoutError):
+        stuck.result(timeout=30)
+    assert all(isinstance(f.result(timeout=30), int) for f in quick)
+    # The pool keeps running with a fresh worker
+    assert pool.submit(int, "7").result(timeout=30) == 7
+
+
+def test_workers_are_recycled_after_max_tasks(make_pool):
+    pool = make_pool(max_workers=1, max_tasks_per_worker=2)
+    pids = [pool.submit(os.getpid).result(timeout=30) for _ in range(4)]
+    assert pids[0] == pids[1] and pids[2] == pids[3]
+    assert pids[0] != pids[2]
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="worker memory is read from /proc")
+def test_worker_over_max_memory_fails_its_task(make_pool):
+    pool = make_pool(max_workers=1, max_memory=300 * 1024 * 1024)
+    with pytest.raises(MemoryError):
+        pool.submit(_allocate, 400 * 1024 * 1024).result(timeout=30)
+    assert pool.submit(int, "7").result(timeout=30) == 7
+
+
+def test_invalid_settings():
+    with pytest.raises(ValueError):
+        SupervisedPool(max_workers=0)
+    with pytest.raises(ValueError):
+        SupervisedPool(timeout=0)
@@ -0,0 +1,108 @@
+import asyncio
+import json
+
+import pytest
+
+from officechunker.converter import Converter
+from officechunker.scheduler import ReadAhead, largest_first, run_bounded, shard_of
+
+
+def test_largest_first_orders_by_size():
+    sizes = {"a": 1, "b": 5, "c": 3, "d": 4}
+
+    async def size_of(path):
+        return sizes[path]
+
+    async def order(window=None):
+        return [path async for path in largest_first(sizes, size_of, window)]
+
+    assert asyncio.run(order()) == ["b", "d", "c", "a"]
+    # A window of 1 only reorders within the look-ahead
+    assert asyncio.run(order(window=1)) == ["b", "c", "d", "a"]
+
+
+def test_run_bounded_limits_work_in_flight():
+    running = []
+    peak = []
+
+    async def worker(item):
+        running.append(item)
+        peak.append(len(running))
+        await asyncio.sleep(0.01)
+        running.remove(item)
+        return item * 2
+
+    async def collect():
+        return [result async for result in run_bounded(range(20), worker, max_in_flight=3)]
+
+    assert sorted(asyncio.run(collect())) == [i * 2 for i in range(20)]
+    assert max(peak) == 3
+
+
+def test_run_bounded_rejects_an_empty_window():
+    async def collect():
+        return [result async for result in run_bounded([1], asyncio.sleep, max_in_flight=0)]
+
+    with pytest.raises(ValueError):
+        asyncio.run(collect())
+
+
+def test_shard_of_is_stable_and_covers_every_shard():
+    names = [f"folder/file-{i}.docx" for i in range(200)]
+    shards = [shard_of(name, 4) for name in names]
+    assert shards == [shard_of(name, 4) for name in names]
+    assert set(shards) == {0, 1, 2, 3}
+    assert all(shard_of(name, 1) == 0 for name in names)
+
+
+def test_shards_split_the_source_files(tmp_path):
+    src = tmp_path / "src"
+    src.mkdir()
+    names = {f"file-{i}.txt" for i in range(12)}
+    for name in names:
+        (src / name).write_text(f"Contents of {name}.", encoding="utf-8")
+
+    sources = []
+    for shard_index in range(3):
+        dst = tmp_path / f"dst-{shard_index}"
+        Converter(
+            src_folder=str(src),
+            dst_folder=str(dst),
+            chunker_config={".txt": {"type": "word", "params": {"tokenizer_or_token_counter": "word", "chunk_size": 64, "chunk_overlap": 0}}},
+            output_format="jsonl",
+            shard_index=shard_index,
+            shard_count=3,
+        ).convert()
+        records = [json.loads(line) for path in dst.glob("chunks*.jsonl") for line in path.read_text(encoding="utf-8").splitlines()]
+        shard_sources = {r["source"] for r in records}
+        assert shard_sources == {name for name in names if shard_of(name, 3) == shard_index}
+        sources.append(shard_sources)
+
+    assert set().union(*sources) == names
+    assert sum(map(len, sources)) == len(names)
+
+
+def test_read_ahead_prefetches_and_discards():
+    fetched = []
+    discarded = []
+
+    async def fetch(item):
+        fetched.append(item)
+        await asyncio.sleep(0)
+        return item * 10
+
+    async def run():
+        read_ahead = ReadAhead(range(5), fetch, discarded.append, depth=2)
+        first = await read_ahead.__anext__()
+        await asyncio.sleep(0.01)
+        # The next two items are fetched while the first one is processed
+        assert fetched == [0, 1, 2]
+        assert await read_ahead.get(first) == 0
+        read_ahead.release(first)
+        await read_ahead.__anext__()
+        await asyncio.sleep(0.01)
+        # Items fetched ahead are discarded too when the iteration stops early
+        await read_ahead.aclose()
+
+    asyncio.run(run())
+    assert sorted(discarded) == [0, 10, 20, 30]
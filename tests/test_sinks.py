@@ -0,0 +1,86 @@
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from officechunker.sinks import MarkdownChunkSink, create_sink
+
+
+def _records(*texts):
+    return [{"text": text, "token_count": len(text.split()), "start_index": None, "end_index": None} for text in texts]
+
+
+def _read(sink):
+    if sink.extension == ".jsonl":
+        return [json.loads(line) for path in sink.output_files() for line in Path(path).read_text(encoding="utf-8").splitlines()]
+    import pyarrow.parquet as pq
+
+    return [row for path in sink.output_files() for row in pq.read_table(path).to_pylist()]
+
+
+def _texts(records):
+    return [(r["source"], r["chunk_index"], r["text"]) for r in records]
+
+
+def test_markdown_sink_writes_one_file_per_chunk(tmp_path):
+    sink = MarkdownChunkSink(str(tmp_path))
+    first = sink.write("doc.pdf", _records("a", "b"), str(tmp_path), "doc.pdf")
+    # A source written in several calls continues its numbering
+    second = sink.write("doc.pdf", _records("c"), str(tmp_path), "doc.pdf", first_index=2)
+
+    assert [os.path.basename(p) for p in first + second] == ["doc.pdf_1.md", "doc.pdf_2.md", "doc.pdf_3.md"]
+    assert (tmp_path / "doc.pdf_3.md").read_text(encoding="utf-8") == "c"
+    assert sink.output_files() == []
+
+
+@pytest.mark.parametrize("output_format", ["jsonl", "parquet"])
+def test_consolidated_sinks_shard_records(tmp_path, output_format):
+    if output_format == "parquet":
+        pytest.importorskip("pyarrow")
+    sink = create_sink(output_format, str(tmp_path), batch_size=2, shard_size=3)
+    sink.write("a.pdf", _records("a0", "a1"), str(tmp_path), "a.pdf")
+    paths = sink.write("b.pdf", _records("b0", "b1", "b2"), str(tmp_path), "b.pdf")
+    sink.close()
+
+    assert len(sink.output_files()) == 2
+    assert paths == sink.output_files()
+    assert _texts(_read(sink)) == [
+        ("a.pdf", 0, "a0"), ("a.pdf", 1, "a1"), ("b.pdf", 0, "b0"), ("b.pdf", 1, "b1"), ("b.pdf", 2, "b2")
+    ]
+
+
+@pytest.mark.parametrize("output_format", ["jsonl", "parquet"])
+def test_restore_discards_records_written_after_the_checkpoint(tmp_path, output_format):
+    if output_format == "parquet":
+        pytest.importorskip("pyarrow")
+    sink = create_sink(output_format, str(tmp_path), batch_size=1)
+    sink.restore(None)
+    sink.write("a.pdf", _records("a0"), str(tmp_path), "a.pdf")
+    state = json.loads(json.dumps(sink.checkpoint()))
+    # In flight when the run stopped
+    sink.write("b.pdf", _records("b0"), str(tmp_path), "b.pdf")
+    sink.close()
+
+    resumed = create_sink(output_format, str(tmp_path), batch_size=1)
+    resumed.restore(state)
+    resumed.write("b.pdf", _records("b0"), str(tmp_path), "b.pdf")
+    resumed.close()
+
+    assert _texts(_read(resumed)) == [("a.pdf", 0, "a0"), ("b.pdf", 0, "b0")]
+
+
+def test_restore_without_state_removes_previous_outputs(tmp_path):
+    sink = create_sink("jsonl", str(tmp_path))
+    sink.write("a.pdf", _records("a0"), str(tmp_path), "a.pdf")
+    sink.close()
+    assert sink.output_files()
+
+    fresh = create_sink("jsonl", str(tmp_path))
+    fresh.restore(None)
+    assert fresh.output_files() == []
+
+
+def test_unknown_output_format(tmp_path):
+    with pytest.raises(ValueError):
+        create_sink("csv", str(tmp_path))
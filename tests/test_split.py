@@ -0,0 +1,62 @@
+import json
+import os
+import random
+
+import pytest
+
+from benchmarks.corpus import make_paragraphs, write_pdf, write_xlsx
+from officechunker import workers
+from officechunker.converter import Converter
+from officechunker.process import count_parts, join_parts, parse_part_to_md, parse_to_md
+
+
+@pytest.fixture
+def sources(tmp_path):
+    rng = random.Random(0)
+    paragraphs = make_paragraphs(120, rng)
+    src = tmp_path / "src"
+    src.mkdir()
+    write_pdf(str(src / "report.pdf"), paragraphs, lines_per_page=20)
+    write_xlsx(str(src / "sales.xlsx"), paragraphs, rng, rows_per_sheet=25)
+    return src
+
+
+@pytest.mark.parametrize("name", ["report.pdf", "sales.xlsx"])
+def test_joined_parts_match_whole_file(sources, name):
+    path = str(sources / name)
+    count = count_parts(path)
+    assert count > 2
+    parts = [parse_part_to_md(path, start, start + 2) for start in range(0, count, 2)]
+    assert join_parts(parts, os.path.splitext(name)[1]) == parse_to_md(path)
+
+
+def _convert(src, dst, **options):
+    Converter(
+        src_folder=str(src),
+        dst_folder=str(dst),
+        chunker_config={ext: {"type": "word", "params": {"tokenizer_or_token_counter": "word", "chunk_size": 64}} for ext in (".pdf", ".xlsx")},
+        output_format="jsonl",
+        **options,
+    ).convert()
+    records = {}
+    with open(os.path.join(dst, "chunks.jsonl"), encoding="utf-8") as f:
+        for line in f:
+            record = json.loads(line)
+            records.setdefault(os.path.basename(record["source"]), []).append(record)
+    return {name: [r["text"] for r in sorted(rs, key=lambda r: r["chunk_index"])] for name, rs in records.items()}
+
+
+def test_split_conversion_matches_unsplit(sources, tmp_path, monkeypatch):
+    unsplit = _convert(sources, tmp_path / "unsplit")
+    parts = []
+
+    def parse_part(file_path, start, end=None):
+        parts.append((os.path.basename(file_path), start))
+        return parse_part_to_md(file_path, start, end)
+
+    # The default thread executor runs the workers in this process
+    monkeypatch.setattr(workers, "parse_part_to_md", parse_part)
+    split = _convert(sources, tmp_path / "split", split_min_pages=2, split_part_size=2)
+    assert {name for name, _ in parts} == {"report.pdf", "sales.xlsx"}
+    assert set(unsplit) == {"report.pdf", "sales.xlsx"}
+    assert split == unsplit
@@ -0,0 +1,34 @@
+import os
+import subprocess
+import sys
+
+from benchmarks.import_time import HEAVY_MODULES
+from conftest import ROOT
+
+
+# Same startup as benchmarks/import_time.py: import the CLI and create a token-chunker Converter
+STARTUP_CODE = """
+import sys
+import officechunker.cli
+from officechunker.converter import Converter
+Converter(sys.argv[1], dst_folder=sys.argv[2], chunker_config="token")
+"""
+
+
+def test_startup_does_not_import_heavy_modules(tmp_path):
+    src = tmp_path / "src"
+    src.mkdir()
+    env = {**os.environ, "PYTHONPATH": os.path.join(ROOT, "src")}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", STARTUP_CODE, str(src), str(tmp_path / "out")],
+        check=True, capture_output=True, text=True, env=env,
+    )
+    # Lines of -X importtime look like "import time:   self [us] | cumulative | <indented module name>"
+    imported = {
+        line.rsplit("|", 1)[1].strip()
+        for line in result.stderr.splitlines()
+        if line.startswith("import time:") and line.count("|") == 2
+    }
+    assert "officechunker.converter" in imported
+    heavy = sorted(name for name in imported if name.split(".")[0] in HEAVY_MODULES)
+    assert heavy == []
@@ -0,0 +1,51 @@
+import random
+
+import pytest
+
+from benchmarks.corpus import make_paragraphs
+from officechunker.structural import StructuralChunker
+
+
+def _document():
+    rng = random.Random(0)
+    paragraphs = make_paragraphs(12, rng)
+    rows = "\n".join(f"| {i} | {rng.randrange(1000)} | {paragraphs[i % 12][:40]} |" for i in range(40))
+    return (
+        "# Report\n\n" + "\n\n".join(paragraphs[:4]) + "\n\n"
+        "## Figures\n\n| Id | Value | Note |\n| --- | --- | --- |\n" + rows + "\n\n"
+        "<!-- Slide number: 1 -->\n# Summary\n\n" + "\n\n".join(paragraphs[4:]) + "\n"
+    )
+
+
+@pytest.mark.parametrize("chunk_size", [20, 60, 200])
+@pytest.mark.parametrize("repeat_headers", [True, False])
+def test_chunks_fit_the_budget_and_cover_the_text(chunk_size, repeat_headers):
+    text = _document()
+    chunker = StructuralChunker("word", chunk_size=chunk_size, repeat_headers=repeat_headers)
+    chunks = chunker.chunk(text)
+
+    assert all(chunk.token_count <= chunk_size for chunk in chunks)
+    for chunk in chunks:
+        # Repeated headers come before the chunk's span of the text
+        assert chunk.text.endswith(text[chunk.start_index:chunk.end_index])
+        if not repeat_headers:
+            assert chunk.text == text[chunk.start_index:chunk.end_index]
+    # Spans are in order, do not overlap and leave out only whitespace
+    assert chunks[0].start_index == 0 and chunks[-1].end_index == len(text)
+    for previous, chunk in zip(chunks, chunks[1:]):
+        assert previous.end_index <= chunk.start_index
+        assert not text[previous.end_index:chunk.start_index].strip()
+
+
+def test_sections_are_not_merged():
+    text = "# One\n\nFirst section.\n\n# Two\n\nSecond section.\n"
+    chunks = StructuralChunker("word", chunk_size=100, max_heading_level=1).chunk(text)
+    assert [chunk.text for chunk in chunks] == ["# One\n\nFirst section.\n\n", "# Two\n\nSecond section.\n"]
+
+
+def test_continuation_chunks_repeat_the_table_header():
+    header = "| Id | Value |\n| --- | --- |\n"
+    text = "## Sheet\n\n" + header + "".join(f"| {i} | value {i} |\n" for i in range(30))
+    chunks = StructuralChunker("word", chunk_size=40).chunk(text)
+    assert len(chunks) > 1
+    assert all(chunk.text.startswith("## Sheet\n\n" + header) for chunk in chunks)
@@ -0,0 +1,67 @@
+import sys
+
+import pytest
+
+import officechunker.cli
+from officechunker.converter import Converter
+from officechunker.watcher import Debouncer
+
+
+def test_debouncer_waits_for_the_last_event():
+    debouncer = Debouncer(2.0)
+    debouncer.add(["a.docx", "b.docx"], now=0.0)
+    debouncer.add(["a.docx"], now=1.5)
+    assert debouncer.time_to_next(now=1.5) == 0.5
+
+    assert debouncer.pop_due(now=2.0) == {"b.docx"}
+    assert len(debouncer) == 1
+    assert debouncer.pop_due(now=3.0) == set()
+    assert debouncer.pop_due(now=3.5) == {"a.docx"}
+    assert debouncer.time_to_next(now=3.5) is None
+
+
+def test_zero_delay_releases_immediately():
+    debouncer = Debouncer(0)
+    debouncer.add(["a.docx"], now=10.0)
+    assert debouncer.pop_due(now=10.0) == {"a.docx"}
+
+
+def test_failed_watcher_leaves_no_executor(tmp_path, monkeypatch):
+    src = tmp_path / "src"
+    src.mkdir()
+    converter = Converter(str(src), dst_folder=str(tmp_path / "out"), incremental=True)
+    created = []
+    create_executor = converter._create_executor
+    monkeypatch.setattr(converter, "_create_executor", lambda: created.append(create_executor()) or created[-1])
+
+    with pytest.raises(ValueError, match="poll_interval"):
+        converter.watch(poll_interval=0, polling=True)
+    assert all(executor._shutdown for executor in created)
+    assert converter._executor is None
+
+
+class _RecordingConverter:
+    calls = []
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+
+    def convert(self):
+        self.calls.append(("convert", self.kwargs["src_folder"]))
+
+    def watch(self, **kwargs):
+        self.calls.append(("watch", self.kwargs["src_folder"]))
+
+
+@pytest.mark.parametrize("argv, expected", [
+    (["watch", "docs"], ("watch", "docs")),
+    (["docs"], ("convert", "docs")),
+    # A source folder named 'watch'
+    (["./watch"], ("convert", "./watch")),
+])
+def test_cli_watch_subcommand(monkeypatch, argv, expected):
+    monkeypatch.setattr(officechunker.cli, "Converter", _RecordingConverter)
+    monkeypatch.setattr(_RecordingConverter, "calls", [])
+    monkeypatch.setattr(sys, "argv", ["officechunker", *argv])
+    officechunker.cli.main()
+    assert _RecordingConverter.calls == [expected]
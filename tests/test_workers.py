@@ -0,0 +1,39 @@
+import random
+
+from benchmarks.corpus import make_paragraphs
+from officechunker.converter import Converter
+from officechunker.workers import chunk_markdown, convert_file, convert_markdown
+
+
+PARAMS = {"tokenizer_or_token_counter": "word", "chunk_size": 40, "chunk_overlap": 0}
+
+
+def test_convert_file_chunks_the_parsed_markdown_in_memory(tmp_path):
+    text = "\n\n".join(make_paragraphs(8, random.Random(0)))
+    source = tmp_path / "notes.txt"
+    source.write_text(text, encoding="utf-8")
+    md_file = tmp_path / "notes.txt.md"
+
+    records, stats = convert_file(str(source), "word", PARAMS, str(md_file))
+
+    markdown = md_file.read_text(encoding="utf-8")
+    assert records == chunk_markdown(markdown, "word", PARAMS)
+    assert stats["chars_out"] == len(markdown)
+    assert "md_write" in stats["stages"]
+    assert convert_markdown(markdown, "word", PARAMS)[0] == records
+
+
+def test_markdown_file_is_only_written_when_kept(tmp_path):
+    src = tmp_path / "src"
+    src.mkdir()
+    (src / "notes.txt").write_text("\n\n".join(make_paragraphs(8, random.Random(0))), encoding="utf-8")
+    config = {".txt": {"type": "word", "params": PARAMS}}
+
+    Converter(str(src), dst_folder=str(tmp_path / "deleted"), chunker_config=config).convert()
+    Converter(str(src), dst_folder=str(tmp_path / "kept"), chunker_config=config, delete_md_files=False).convert()
+
+    deleted = sorted(p.name for p in (tmp_path / "deleted").iterdir())
+    kept = sorted(p.name for p in (tmp_path / "kept").iterdir())
+    assert "notes.txt.md" not in deleted
+    assert sorted(deleted + ["notes.txt.md"]) == kept
+    assert (tmp_path / "kept" / "notes.txt.md").read_text(encoding="utf-8").strip()
@@ -0,0 +1,40 @@
+import json
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from benchmarks.corpus import make_paragraphs, write_xlsx
+from officechunker.workers import _batch_token_counter, convert_xlsx_streaming
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    rng = random.Random(1)
+    path = tmp_path / "book.xlsx"
+    write_xlsx(str(path), make_paragraphs(300, rng), rng, rows_per_sheet=100)
+    return str(path)
+
+
+# The sentence chunker splits below chunk_size, so batches sized by token counts alone come out as several chunks
+@pytest.mark.parametrize("chunker_type,chunk_size", [("sentence", 400), ("recursive", 200), ("word", 800)])
+def test_every_chunk_starts_with_the_sheet_header(workbook, tmp_path, chunker_type, chunk_size):
+    spool_path = tmp_path / "spool.jsonl"
+    md_path = tmp_path / "book.md"
+    params = {"tokenizer_or_token_counter": "word", "chunk_size": chunk_size}
+    count, stats = convert_xlsx_streaming(workbook, chunker_type, params, str(spool_path), str(md_path))
+
+    records = [json.loads(line) for line in spool_path.read_text(encoding="utf-8").splitlines()]
+    markdown = md_path.read_text(encoding="utf-8")
+    assert count == len(records) > 3
+    assert stats["chars_out"] == len(markdown)
+    for record in records:
+        assert record["text"].startswith("## Sheet")
+        assert "| id | region | amount | note |" in record["text"]
+        assert markdown[record["start_index"]:record["end_index"]] == record["text"]
+        assert record["token_count"] <= chunk_size
+
+
+def test_batches_are_sized_by_words_without_a_tokenizer():
+    count_tokens = _batch_token_counter(SimpleNamespace(chunk_size=100))
+    assert count_tokens("| 1 | north | 2.5 |") == 7